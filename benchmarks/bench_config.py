@@ -0,0 +1,47 @@
+"""Micro-benchmark for ConfigManager getters.
+
+Compares the cost of the cached getters against re-reading and parsing
+config.json on every call (the previous behaviour of load_config).
+
+Usage:
+    python benchmarks/bench_config.py [iterations]
+"""
+import json
+import os
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    with tempfile.TemporaryDirectory() as home:
+        # Keep the benchmark away from the real ~/.saythis directory
+        os.environ["HOME"] = home
+        os.environ["USERPROFILE"] = home
+        from config_manager import ConfigManager
+
+        config_manager = ConfigManager()
+
+        def read_from_disk():
+            with open(config_manager.config_filepath, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+            return config_manager._merge_with_defaults(config).get(config_manager.selected_service)
+
+        results = {
+            "file read + parse (old)": timeit.timeit(read_from_disk, number=iterations),
+            "get_service_config": timeit.timeit(config_manager.get_service_config, number=iterations),
+            "get_selected_service": timeit.timeit(config_manager.get_selected_service, number=iterations),
+        }
+
+    print(f"{'getter':<28}{'per call':>14}")
+    for name, total in results.items():
+        print(f"{name:<28}{total / iterations * 1e6:>11.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""Cold versus warm first-request latency of the Google Cloud service.
+
+Creates a new GoogleCloudService for every run and times its requests:
+
+    cold       First request with the warm-up disabled, which opens the
+               connection and signs the first access token itself
+    warm       First request once the background warm-up call has opened
+               the connection
+    steady     Second request on the same connection, for reference
+    warm-up    Time from creating the service until the warm-up finished
+
+By default the service talks to MockGoogleTTSServer over loopback with a
+throwaway service account key. A loopback connection has no TLS handshake
+and no network round trips, so the cold penalty is much smaller than with
+the real API. Pass --credentials to measure against Google Cloud instead;
+every run then sends one list_voices and two short synthesis requests.
+
+Usage:
+    python benchmarks/bench_connection.py [--runs N] [--latency S] [--credentials PATH]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from mock_servers import MockBehaviour, MockGoogleTTSServer
+
+TEXT = "Hello, this is a connection benchmark."
+
+
+def write_service_account(path):
+    """Write a service account key file with a freshly generated private key."""
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    path.write_text(json.dumps({
+        "type": "service_account",
+        "project_id": "benchmark",
+        "private_key_id": "benchmark",
+        "private_key": pem.decode("ascii"),
+        "client_email": "benchmark@benchmark.iam.gserviceaccount.com",
+        "client_id": "0",
+        "token_uri": "https://oauth2.googleapis.com/token",
+    }))
+
+
+def loopback_service_class(address):
+    """Get a GoogleCloudService whose channels connect to a local server."""
+    import grpc
+    from google.auth.transport.grpc import AuthMetadataPlugin
+    from google.auth.transport.requests import Request
+    from tts.services.google_cloud_service import GoogleCloudService
+
+    class LoopbackGoogleCloudService(GoogleCloudService):
+        def _create_channel(self, transport_class, host, options, **kwargs):
+            # Local credentials instead of TLS, with tokens attached as for the real API
+            channel_credentials = grpc.composite_channel_credentials(
+                grpc.local_channel_credentials(),
+                grpc.metadata_call_credentials(AuthMetadataPlugin(kwargs["credentials"], Request())),
+            )
+            channels = grpc.aio if "AsyncIO" in transport_class.__name__ else grpc
+            return channels.secure_channel(address, channel_credentials, options=options)
+
+    return LoopbackGoogleCloudService
+
+
+def set_warm_up(config_manager, credentials_path, enabled):
+    config = config_manager.load_config()
+    config["selected_service"] = "Google Cloud"
+    config["Google Cloud"]["service_account_json_path"] = str(credentials_path)
+    config["Google Cloud"]["connection"]["warm_up"] = enabled
+    config_manager.save_config(config)
+
+
+def run(service_class, config_manager, credentials_path, warm_up):
+    """Create a service and time its warm-up and first two requests, in seconds."""
+    set_warm_up(config_manager, credentials_path, warm_up)
+    start = time.perf_counter()
+    service = service_class(config_manager)
+    if not service.is_initialized():
+        raise RuntimeError("The Google Cloud client could not be initialized")
+    try:
+        service.wait_until_warm()
+        warm_up_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        service.synthesize_speech(TEXT)
+        first = time.perf_counter() - start
+
+        start = time.perf_counter()
+        service.synthesize_speech(TEXT)
+        second = time.perf_counter() - start
+    finally:
+        service.close()
+    return warm_up_time, first, second
+
+
+def row(name, samples):
+    samples = [sample * 1000 for sample in samples]
+    return f"{name:<10} {statistics.median(samples):8.1f} {max(samples):8.1f} {min(samples):8.1f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20, help="New services created per scenario")
+    parser.add_argument("--latency", type=float, default=0.02,
+                        help="Seconds the mock server takes to answer a request")
+    parser.add_argument("--credentials", type=Path,
+                        help="Service account JSON key to benchmark the real API with")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as home:
+        os.environ["HOME"] = home
+        os.environ["USERPROFILE"] = home
+        from config_manager import ConfigManager
+
+        config_manager = ConfigManager()
+        server = None
+        if args.credentials:
+            from tts.services.google_cloud_service import GoogleCloudService
+
+            service_class, credentials_path = GoogleCloudService, args.credentials
+        else:
+            server = MockGoogleTTSServer(MockBehaviour(latency=args.latency, realtime_factor=1000.0)).__enter__()
+            service_class = loopback_service_class(server.address)
+            credentials_path = Path(home) / "service_account.json"
+            write_service_account(credentials_path)
+
+        try:
+            cold = [run(service_class, config_manager, credentials_path, False) for _ in range(args.runs)]
+            warm = [run(service_class, config_manager, credentials_path, True) for _ in range(args.runs)]
+        finally:
+            if server is not None:
+                server.__exit__(None, None, None)
+
+    print(f"Google Cloud ({'real API' if args.credentials else 'loopback mock'}), {args.runs} runs")
+    print(f"{'scenario':<10} {'p50 ms':>8} {'max ms':>8} {'min ms':>8}")
+    print(row("cold", [first for _, first, _ in cold]))
+    print(row("warm", [first for _, first, _ in warm]))
+    print(row("steady", [second for _, _, second in cold + warm]))
+    print(row("warm-up", [warm_up_time for warm_up_time, _, _ in warm]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+"""End-to-end latency and throughput benchmark against local mock providers.
+
+Runs the whole synthesis path (Application, TextToSpeech, the service
+classes and the provider SDKs) against the stand-ins in mock_servers.py:
+a local HTTP server for ElevenLabs and a fake client for Google Cloud.
+No network access, API key or service account is needed. The synthesis
+cache is disabled so that every request reaches the provider.
+
+Scenarios:
+    single     Short prompts one after another through Application.generate_audio
+    streaming  Like single, with streaming playback (ElevenLabs only); the
+               time to first byte is when the first audio reaches the sink
+    chunked    Texts longer than the request limit, split into segments that
+               are synthesized in parallel and stitched
+    long       The chunked texts rendered by one long-running batch operation
+               each (Google Cloud only, through the long audio API stand-in)
+    batch      Many prompts enqueued at once into the persistent job queue and
+               drained by its workers on one event loop, as done by the
+               "batch" command. The latency of a job counts from when the
+               whole batch was enqueued.
+
+For every scenario the benchmark prints the p50/p95/p99 latency, the p50
+time to first byte, requests per second and the number of failed requests.
+Without streaming the first byte is only available with the complete file,
+so the time to first byte equals the latency. Failed requests are retried
+by the request scheduler, so errors only count requests that failed after
+all retries. The scheduler's retry and queueing metrics follow each table,
+and for ElevenLabs the number of connections the mock server accepted.
+With --metrics, the per-stage latencies and per-service counters recorded
+by the application's metrics over all scenarios are printed as well.
+
+Usage:
+    python benchmarks/bench_e2e.py [--service NAME] [--requests N] [--concurrency N]
+                                   [--latency S] [--realtime-factor X]
+                                   [--chunk-size BYTES] [--error-rate R]
+                                   [--provider-concurrency N] [--max-concurrency N]
+                                   [--metrics]
+"""
+import argparse
+import copy
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from mock_servers import (
+    FakeCloudStorage,
+    FakeGoogleLongAudioClient,
+    FakeGoogleTTSAsyncClient,
+    FakeGoogleTTSClient,
+    MockBehaviour,
+    MockElevenLabsServer,
+)
+
+SHORT_TEXT = "Hello there, this is request number {index}."
+LONG_TEXT = " ".join(["This is sentence {index} of a long text that needs to be split."] * 60)
+
+
+class FirstByteSink:
+    """Audio sink recording when the first audio arrives."""
+
+    def __init__(self):
+        self.first_byte_time = None
+
+    def start(self, sample_rate, channels):
+        pass
+
+    def write(self, pcm_bytes):
+        if self.first_byte_time is None:
+            self.first_byte_time = time.perf_counter()
+
+    def finish(self):
+        pass
+
+
+def percentile(values, fraction):
+    """Get a percentile of a list of values with the nearest-rank method."""
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    rank = max(1, -(-int(fraction * 100) * len(ordered) // 100))
+    return ordered[rank - 1]
+
+
+class Results:
+    """Latencies, first-byte times and failures of one scenario."""
+
+    def __init__(self):
+        self.latencies = []
+        self.first_bytes = []
+        self.failures = 0
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, latency, first_byte):
+        with self._lock:
+            self.latencies.append(latency)
+            self.first_bytes.append(first_byte)
+
+    def fail(self):
+        with self._lock:
+            self.failures += 1
+
+    def row(self, name):
+        requests = len(self.latencies) + self.failures
+        rps = requests / self.elapsed if self.elapsed else 0.0
+        return (
+            f"{name:<11}{requests:>6}"
+            f"{percentile(self.latencies, 0.50) * 1000:>9.0f}"
+            f"{percentile(self.latencies, 0.95) * 1000:>9.0f}"
+            f"{percentile(self.latencies, 0.99) * 1000:>9.0f}"
+            f"{percentile(self.first_bytes, 0.50) * 1000:>9.0f}"
+            f"{rps:>8.1f}{self.failures:>7}"
+        )
+
+
+def run_generate(app, texts, streaming):
+    """Run requests one after another through Application.generate_audio."""
+    results = Results()
+    start = time.perf_counter()
+    for text in texts:
+        sink = FirstByteSink() if streaming else None
+        request_start = time.perf_counter()
+        try:
+            app.generate_audio(text, sink).result()
+        except Exception:
+            results.fail()
+            continue
+        done = time.perf_counter()
+        first_byte = sink.first_byte_time if sink is not None and sink.first_byte_time else done
+        results.add(done - request_start, first_byte - request_start)
+    results.elapsed = time.perf_counter() - start
+    return results
+
+
+def run_batch(app, texts, concurrency, out_dir):
+    """Run requests through the job queue with concurrent workers, the way the batch command does."""
+    results = Results()
+    extension = app.get_service_config().get("file_extension", ".mp3")
+    # Long texts of the chunked scenario already started the workers with the default concurrency
+    app.tts_engine.stop_job_workers()
+    app.tts_engine.job_workers.concurrency = concurrency
+    app.tts_engine.start_job_workers()
+
+    start = time.perf_counter()
+    finish_times = {}
+    futures = []
+    for index, text in enumerate(texts):
+        future = app.enqueue_job(text, Path(out_dir) / f"{index}{extension}")
+        future.add_done_callback(lambda f: finish_times.setdefault(f, time.perf_counter()))
+        futures.append(future)
+    for future in futures:
+        try:
+            future.result()
+        except Exception:
+            results.fail()
+            continue
+        latency = finish_times.get(future, time.perf_counter()) - start
+        results.add(latency, latency)
+    results.elapsed = time.perf_counter() - start
+    app.tts_engine.stop_job_workers()
+    return results
+
+
+def configure(service, behaviour, server, rate_limits, metrics_enabled=False):
+    """Create an Application using the mock provider for a service."""
+    from config_manager import ConfigManager
+    from main import Application
+
+    config_manager = ConfigManager()
+    config = config_manager.load_config()
+    config["selected_service"] = service
+    config["synthesis_cache"]["enabled"] = False
+    config["request_scheduler"]["rate_limits"] = {service: rate_limits}
+    config["metrics"]["enabled"] = metrics_enabled
+    if service == "ElevenLabs":
+        config[service].update({"api_key": "benchmark", "base_url": server.base_url})
+    config_manager.save_config(config)
+
+    app = Application()
+    if service == "Google Cloud":
+        app.tts_engine.initialize_service()
+        service = app.tts_engine.service_instance
+        service.client = FakeGoogleTTSClient(behaviour)
+        service._create_async_client = lambda: FakeGoogleTTSAsyncClient(behaviour)
+        storage = FakeCloudStorage()
+        service._create_long_audio_client = lambda: FakeGoogleLongAudioClient(behaviour, storage)
+        service._download_gcs_object = storage.download
+        service._get_project_id = lambda: "benchmark"
+    return app
+
+
+def set_streaming(app, enabled):
+    config = dict(app.get_service_config())
+    config["streaming"] = enabled
+    app.set_service_config(config)
+
+
+def set_long_audio(app, enabled):
+    """Route the chunked texts to the long audio API, which only renders WAV audio."""
+    config = copy.deepcopy(app.get_service_config())
+    if enabled:
+        config.update(audio_encoding="LINEAR16", file_extension=".wav")
+        config["long_audio"].update(
+            enabled=True, output_gcs_uri="gs://benchmark/long-audio", threshold_bytes=1000, poll_interval=0.05
+        )
+    else:
+        config.update(audio_encoding="MP3", file_extension=".mp3")
+        config["long_audio"]["enabled"] = False
+    app.set_service_config(config)
+
+
+def benchmark_service(service, args, behaviour, server):
+    rate_limits = {}
+    if args.max_concurrency is not None:
+        rate_limits["max_concurrency"] = args.max_concurrency or None
+    app = configure(service, behaviour, server, rate_limits, args.metrics)
+    short_texts = [SHORT_TEXT.format(index=i) for i in range(args.requests)]
+    long_texts = [LONG_TEXT.format(index=i) for i in range(max(1, args.requests // 10))]
+
+    # Warm up connections and lazy imports so they don't count towards the first request
+    app.generate_audio("Warm up.").result()
+    if args.metrics:
+        from tts.metrics import metrics
+
+        metrics.reset()
+
+    print(f"\n{service}")
+    print(f"{'scenario':<11}{'reqs':>6}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'ttfb ms':>9}{'req/s':>8}{'errors':>7}")
+    print(run_generate(app, short_texts, streaming=False).row("single"))
+    if app.tts_engine.get_capabilities()["streaming"]:
+        set_streaming(app, True)
+        print(run_generate(app, short_texts, streaming=True).row("streaming"))
+        set_streaming(app, False)
+    print(run_generate(app, long_texts, streaming=False).row("chunked"))
+    if app.tts_engine.get_capabilities()["batch"]:
+        set_long_audio(app, True)
+        print(run_generate(app, long_texts, streaming=False).row("long"))
+        set_long_audio(app, False)
+    with tempfile.TemporaryDirectory() as out_dir:
+        print(run_batch(app, short_texts, args.concurrency, out_dir).row("batch"))
+
+    stats = app.get_scheduler_stats()[service]
+    print(
+        f"scheduler: {stats['retries']} retries ({stats['throttled']} rate limited), "
+        f"average wait {stats['average_wait'] * 1000:.0f} ms, max queue depth {stats['max_queue_depth']}"
+    )
+    if service == "ElevenLabs":
+        print(f"connections: {server.connection_count} opened for {server.request_count} requests")
+    if args.metrics:
+        print_metrics(app.get_metrics())
+    app.shutdown()
+
+
+def print_metrics(snapshot):
+    print(f"{'stage':<46}{'count':>7}{'mean ms':>9}{'total s':>9}")
+    for stage in snapshot["stages"]:
+        labels = ", ".join(f"{key}={value}" for key, value in stage.items()
+                           if key not in ("stage", "count", "total_seconds", "mean_seconds"))
+        name = f"{stage['stage']} ({labels})" if labels else stage["stage"]
+        print(f"{name:<46}{stage['count']:>7}{stage['mean_seconds'] * 1000:>9.1f}{stage['total_seconds']:>9.2f}")
+    print(", ".join(f"{counter['counter']} {counter['value']:,}" for counter in snapshot["counters"]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--service", choices=["ElevenLabs", "Google Cloud"], action="append",
+                        help="Service to benchmark (default: all)")
+    parser.add_argument("--requests", type=int, default=50, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=32, help="Parallel jobs in the batch scenario")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds until the first byte")
+    parser.add_argument("--realtime-factor", type=float, default=50.0,
+                        help="Seconds of audio generated per second of wall time")
+    parser.add_argument("--chunk-size", type=int, default=4096, help="Bytes per response chunk")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of failing requests")
+    parser.add_argument("--provider-concurrency", type=int,
+                        help="Concurrent requests the ElevenLabs mock accepts before answering 429")
+    parser.add_argument("--max-concurrency", type=int,
+                        help="Override the client's concurrency cap per service (0 for unlimited)")
+    parser.add_argument("--metrics", action="store_true", help="Record and print per-stage latencies")
+    args = parser.parse_args()
+
+    behaviour = MockBehaviour(args.latency, args.realtime_factor, args.chunk_size, args.error_rate, seed=0)
+    with tempfile.TemporaryDirectory() as home, MockElevenLabsServer(behaviour, max_concurrency=args.provider_concurrency) as server:
+        os.environ["HOME"] = home
+        os.environ["USERPROFILE"] = home
+        for service in args.service or ["ElevenLabs", "Google Cloud"]:
+            benchmark_service(service, args, behaviour, server)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Startup-time benchmark based on `python -X importtime`.
+
+Starts a fresh interpreter for each scenario, parses the import time report
+and prints the slowest top-level modules by cumulative import time.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs N] [--top N]
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+SCENARIOS = {
+    "engine only": "import main",
+    "ElevenLabs selected": "import main; main.Application()",
+    "Google Cloud selected": (
+        "import config_manager; config_manager.ConfigManager().set_selected_service('Google Cloud'); "
+        "import main; main.Application()"
+    ),
+    "GUI modules": "import main; main.Application(); import ui",
+}
+
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+
+
+def parse_importtime(stderr):
+    """Parse `-X importtime` output.
+    
+    Args:
+        stderr (str): The stderr of the interpreter
+    
+    Returns:
+        tuple: (total microseconds, {top-level module: cumulative microseconds})
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match is None:
+            continue
+        _, cumulative, indent, name = match.groups()
+        # Nesting is shown by two extra spaces per level; only count top-level imports
+        if len(indent) == 1:
+            modules[name] = modules.get(name, 0) + int(cumulative)
+    return sum(modules.values()), modules
+
+
+def run_scenario(code, home):
+    """Run code in a fresh interpreter and return its parsed import times."""
+    env = dict(os.environ, HOME=home, USERPROFILE=home, PYGAME_HIDE_SUPPORT_PROMPT="1")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=SRC_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return parse_importtime(result.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3, help="Runs per scenario; the fastest is reported")
+    parser.add_argument("--top", type=int, default=5, help="Number of modules listed per scenario")
+    args = parser.parse_args()
+
+    for name, code in SCENARIOS.items():
+        totals = []
+        best_modules = defaultdict(lambda: float("inf"))
+        for _ in range(args.runs):
+            # Every run gets a fresh config so scenarios don't affect each other
+            with tempfile.TemporaryDirectory() as home:
+                total, modules = run_scenario(code, home)
+            totals.append(total)
+            for module, cumulative in modules.items():
+                best_modules[module] = min(best_modules[module], cumulative)
+
+        print(f"{name}: {min(totals) / 1000:.1f} ms total import time")
+        slowest = sorted(best_modules.items(), key=lambda item: item[1], reverse=True)[:args.top]
+        for module, cumulative in slowest:
+            print(f"    {module:<40}{cumulative / 1000:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
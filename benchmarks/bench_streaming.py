@@ -0,0 +1,106 @@
+"""Time-to-first-sound benchmark for ElevenLabs streaming playback.
+
+Compares the time until audio can start playing when the whole clip is
+downloaded first (the default behaviour) against streaming playback, where
+the first chunks are handed to the player while the rest is downloading.
+
+The ElevenLabs API is replaced by a fake client that simulates a first-byte
+latency and a fixed synthesis speed, so no network access or API key is needed.
+
+Usage:
+    python benchmarks/bench_streaming.py
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+# Simulated service behaviour
+FIRST_BYTE_LATENCY = 0.25  # Seconds until the first chunk arrives
+REALTIME_FACTOR = 4.0  # Seconds of audio generated per second of wall time
+CHUNK_SECONDS = 0.1  # Seconds of audio per chunk
+CHARACTERS_PER_SECOND = 15  # Speaking rate used to estimate clip duration
+SAMPLE_RATE = 22050
+
+TEXTS = {
+    "short": "Hello there, how are you today?",
+    "long": " ".join(["This is a longer paragraph that takes a while to read out loud."] * 20),
+}
+
+
+class FakeTextToSpeech:
+    """Stand-in for client.text_to_speech that yields silent PCM chunks over time."""
+
+    def _chunks(self, text, **kwargs):
+        time.sleep(FIRST_BYTE_LATENCY)
+        duration = len(text) / CHARACTERS_PER_SECOND
+        chunk = bytes(int(SAMPLE_RATE * CHUNK_SECONDS) * 2)
+        for _ in range(max(1, int(duration / CHUNK_SECONDS))):
+            time.sleep(CHUNK_SECONDS / REALTIME_FACTOR)
+            yield chunk
+
+    convert = _chunks
+    stream = _chunks
+
+
+class FakeClient:
+    """Stand-in for the ElevenLabs client."""
+
+    def __init__(self):
+        self.text_to_speech = FakeTextToSpeech()
+
+
+def measure_download_first(service, text):
+    start = time.perf_counter()
+    service.synthesize_speech(text)
+    return time.perf_counter() - start
+
+
+def measure_streaming(service, text):
+    from ui.tts.components.stream_player import StreamPlayer
+
+    first_sound = threading.Event()
+    finished = threading.Event()
+    player = StreamPlayer(on_started=first_sound.set, on_finished=finished.set)
+
+    start = time.perf_counter()
+    worker = threading.Thread(target=service.stream_speech, args=(text, player))
+    worker.start()
+    first_sound.wait()
+    elapsed = time.perf_counter() - start
+
+    player.stop()
+    worker.join()
+    return elapsed
+
+
+def main():
+    # Use a silent audio device so the benchmark runs on headless machines
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+    with tempfile.TemporaryDirectory() as home:
+        os.environ["HOME"] = home
+        os.environ["USERPROFILE"] = home
+        from config_manager import ConfigManager
+        from tts.services.elevenlabs_service import ElevenLabsService
+
+        config_manager = ConfigManager()
+        config = config_manager.get_service_config()
+        config_manager.set_service_config({**config, "api_key": "benchmark"})
+
+        service = ElevenLabsService(config_manager)
+        service.client = FakeClient()
+
+        print(f"{'text':<8}{'chars':>7}{'download first':>17}{'streaming':>12}")
+        for name, text in TEXTS.items():
+            download_first = measure_download_first(service, text)
+            streaming = measure_streaming(service, text)
+            print(f"{name:<8}{len(text):>7}{download_first * 1000:>14.0f} ms{streaming * 1000:>9.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,481 @@
+"""Local stand-ins for the TTS providers, for benchmarks that need no network or account.
+
+MockElevenLabsServer is a real HTTP server implementing the ElevenLabs
+text-to-speech (convert and stream) and subscription endpoints, so requests
+go through the ElevenLabs SDK and its HTTP stack unchanged. Point the service
+at it with the "base_url" service setting.
+
+MockGoogleTTSServer is a gRPC server implementing the Google Cloud
+ListVoices and SynthesizeSpeech RPCs, for measuring connection setup.
+
+FakeGoogleTTSClient and FakeGoogleTTSAsyncClient replace the
+TextToSpeechClient and TextToSpeechAsyncClient of GoogleCloudService and
+answer synthesize_speech calls in-process. FakeGoogleLongAudioClient stands
+in for the long audio API, writing to a FakeCloudStorage bucket in memory.
+
+Both generate silent audio whose duration follows the text length, and
+simulate first-byte latency, synthesis speed, chunking and errors as
+configured by a MockBehaviour.
+"""
+import asyncio
+import io
+import json
+import random
+import re
+import threading
+import time
+import wave
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlparse
+
+# Speaking rate used to turn text length into audio duration
+CHARACTERS_PER_SECOND = 15
+
+# Silent MPEG-2 Layer III frame: 22050 Hz, 32 kbps, mono (104 bytes, 576 samples)
+MP3_FRAME = bytes([0xFF, 0xF3, 0x40, 0xC0]) + bytes(100)
+MP3_FRAME_SECONDS = 576 / 22050
+
+
+class MockBehaviour:
+    """Simulated service behaviour shared by the mock providers."""
+
+    def __init__(self, latency=0.1, realtime_factor=20.0, chunk_size=4096, error_rate=0.0, seed=None):
+        """Initialize the behaviour.
+
+        Args:
+            latency (float): Seconds until the first byte of audio is sent.
+            realtime_factor (float): Seconds of audio generated per second of wall time.
+            chunk_size (int): Bytes of audio per response chunk.
+            error_rate (float): Fraction of requests that fail, from 0.0 to 1.0.
+            seed (int, optional): Seed for the error sampling, for repeatable runs.
+        """
+        self.latency = latency
+        self.realtime_factor = realtime_factor
+        self.chunk_size = chunk_size
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def should_fail(self):
+        """Decide whether the next request fails."""
+        with self._lock:
+            return self._random.random() < self.error_rate
+
+    def iter_chunks(self, audio, duration):
+        """Yield audio in chunks, paced like a service generating it.
+
+        Args:
+            audio (bytes): The complete audio.
+            duration (float): The duration of the audio in seconds.
+        """
+        time.sleep(self.latency)
+        chunk_count = max(1, -(-len(audio) // self.chunk_size))
+        delay = duration / self.realtime_factor / chunk_count
+        for start in range(0, len(audio), self.chunk_size):
+            yield audio[start:start + self.chunk_size]
+            time.sleep(delay)
+
+
+def speech_duration(text):
+    """Get the simulated duration of speech for a text, in seconds."""
+    return max(len(text), 1) / CHARACTERS_PER_SECOND
+
+
+def make_mp3(duration):
+    """Make a silent MP3 clip of about the given duration."""
+    return MP3_FRAME * max(1, round(duration / MP3_FRAME_SECONDS))
+
+
+def make_pcm(duration, sample_rate):
+    """Make silent signed 16-bit mono PCM of the given duration."""
+    return bytes(int(duration * sample_rate) * 2)
+
+
+def make_wav(duration, sample_rate):
+    """Make a silent 16-bit mono WAV clip of the given duration."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(make_pcm(duration, sample_rate))
+    return buffer.getvalue()
+
+
+class _ElevenLabsHandler(BaseHTTPRequestHandler):
+    """Request handler implementing the ElevenLabs endpoints used by the app."""
+
+    protocol_version = "HTTP/1.1"
+    TEXT_TO_SPEECH_PATH = re.compile(r"^/v1/text-to-speech/[^/]+(/stream)?$")
+
+    def log_message(self, format, *args):
+        """Keep benchmark output free of request logs."""
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self):
+        self._send_json(500, {"detail": {"status": "mock_error", "message": "Simulated server error"}})
+
+    def do_GET(self):
+        if urlparse(self.path).path != "/v1/user/subscription":
+            self._send_json(404, {"detail": {"status": "not_found", "message": "Not found"}})
+            return
+        if self.server.behaviour.should_fail():
+            self._send_error()
+            return
+        with self.server.lock:
+            character_count = self.server.character_count
+        self._send_json(200, {
+            "tier": "mock",
+            "character_count": character_count,
+            "character_limit": self.server.character_limit,
+            "max_credit_limit_extension": 0,
+            "can_extend_character_limit": False,
+            "allowed_to_extend_character_limit": False,
+            "voice_slots_used": 0,
+            "professional_voice_slots_used": 0,
+            "professional_voice_slots_used_in_workspace": 0,
+            "voice_limit": 10,
+            "voice_add_edit_counter": 0,
+            "professional_voice_limit": 0,
+            "can_extend_voice_limit": False,
+            "can_use_instant_voice_cloning": False,
+            "can_use_professional_voice_cloning": False,
+            "current_overage": {"amount": 0},
+            "status": "active",
+            "open_invoices": [],
+            "has_open_invoices": False,
+        })
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if not self.TEXT_TO_SPEECH_PATH.match(url.path):
+            self._send_json(404, {"detail": {"status": "not_found", "message": "Not found"}})
+            return
+        if self.server.behaviour.should_fail():
+            self._send_error()
+            return
+
+        # Like ElevenLabs, reject requests beyond the concurrency limit of the plan
+        with self.server.lock:
+            throttled = self.server.max_concurrency is not None and self.server.active >= self.server.max_concurrency
+            if throttled:
+                self.server.throttled_count += 1
+            else:
+                self.server.active += 1
+        if throttled:
+            body = json.dumps({"detail": {"status": "too_many_concurrent_requests",
+                                          "message": "Too many concurrent requests"}}).encode("utf-8")
+            self.send_response(429)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Retry-After", "1")
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        try:
+            self._send_audio(url, body)
+        finally:
+            with self.server.lock:
+                self.server.active -= 1
+
+    def _send_audio(self, url, body):
+        text = body.get("text", "")
+        with self.server.lock:
+            self.server.character_count += len(text)
+            self.server.request_count += 1
+
+        output_format = parse_qs(url.query).get("output_format", ["mp3_22050_32"])[0]
+        duration = speech_duration(text)
+        if output_format.startswith("pcm_"):
+            audio = make_pcm(duration, int(output_format.split("_")[1]))
+        else:
+            audio = make_mp3(duration)
+
+        self.send_response(200)
+        self.send_header("Content-Type", "audio/mpeg")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for chunk in self.server.behaviour.iter_chunks(audio, duration):
+            self.wfile.write(f"{len(chunk):X}\r\n".encode("ascii") + chunk + b"\r\n")
+            self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+
+class MockElevenLabsServer(ThreadingHTTPServer):
+    """HTTP server mimicking the ElevenLabs API on a local port."""
+
+    daemon_threads = True
+    # Accept bursts of concurrent connections from batch runs
+    request_queue_size = 256
+
+    def __init__(self, behaviour=None, character_limit=1_000_000, max_concurrency=None, port=0):
+        """Initialize the server.
+
+        Args:
+            behaviour (MockBehaviour, optional): The simulated service behaviour.
+            character_limit (int): The character limit reported by the subscription endpoint.
+            max_concurrency (int, optional): Concurrent synthesis requests allowed before
+                                             answering 429 with a Retry-After header.
+            port (int): The port to listen on; 0 picks a free port.
+        """
+        super().__init__(("127.0.0.1", port), _ElevenLabsHandler)
+        self.behaviour = behaviour or MockBehaviour()
+        self.character_limit = character_limit
+        self.character_count = 0
+        self.request_count = 0
+        # TCP connections accepted, to see how well clients reuse them
+        self.connection_count = 0
+        self.max_concurrency = max_concurrency
+        self.active = 0
+        self.throttled_count = 0
+        self.lock = threading.Lock()
+        self._thread = None
+
+    def process_request(self, request, client_address):
+        with self.lock:
+            self.connection_count += 1
+        super().process_request(request, client_address)
+
+    @property
+    def base_url(self):
+        """The URL to use as the ElevenLabs base_url."""
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
+
+
+def _make_google_audio(text, audio_config):
+    """Make the silent audio a Google Cloud request returns, and its duration."""
+    from google.cloud import texttospeech
+
+    duration = speech_duration(text)
+    if audio_config.audio_encoding == texttospeech.AudioEncoding.LINEAR16:
+        return make_wav(duration, 24000), duration
+    return make_mp3(duration), duration
+
+
+class FakeGoogleTTSClient:
+    """In-process stand-in for google.cloud.texttospeech.TextToSpeechClient."""
+
+    def __init__(self, behaviour=None):
+        """Initialize the client.
+
+        Args:
+            behaviour (MockBehaviour, optional): The simulated service behaviour.
+        """
+        self.behaviour = behaviour or MockBehaviour()
+        self.request_count = 0
+        self._lock = threading.Lock()
+
+    def synthesize_speech(self, input, voice, audio_config, **kwargs):
+        """Return silent audio after the simulated latency and synthesis time."""
+        from google.api_core.exceptions import ServiceUnavailable
+
+        if self.behaviour.should_fail():
+            time.sleep(self.behaviour.latency)
+            raise ServiceUnavailable("Simulated server error")
+
+        with self._lock:
+            self.request_count += 1
+
+        audio, duration = _make_google_audio(input.text, audio_config)
+
+        # The unary RPC returns the whole clip once it is generated
+        audio_content = b"".join(self.behaviour.iter_chunks(audio, duration))
+        return SimpleNamespace(audio_content=audio_content)
+
+
+class MockGoogleTTSServer:
+    """gRPC server implementing the Google Cloud TTS ListVoices and SynthesizeSpeech RPCs.
+
+    Requests go through the client library and its gRPC stack unchanged,
+    over a loopback connection with gRPC local credentials, so connection
+    setup and access token signing are paid as with the real API (except
+    for the TLS handshake). Point a channel at address.
+    """
+
+    SERVICE_NAME = "google.cloud.texttospeech.v1.TextToSpeech"
+
+    def __init__(self, behaviour=None, port=0):
+        """Initialize the server.
+
+        Args:
+            behaviour (MockBehaviour, optional): The simulated service behaviour.
+            port (int): The port to listen on; 0 picks a free port.
+        """
+        import grpc
+        from concurrent.futures import ThreadPoolExecutor
+        from google.cloud import texttospeech
+
+        self.behaviour = behaviour or MockBehaviour()
+        self.request_count = 0
+        self._lock = threading.Lock()
+        self._server = grpc.server(ThreadPoolExecutor(max_workers=16))
+        handlers = {
+            "ListVoices": grpc.unary_unary_rpc_method_handler(
+                self._list_voices,
+                request_deserializer=texttospeech.ListVoicesRequest.deserialize,
+                response_serializer=texttospeech.ListVoicesResponse.serialize,
+            ),
+            "SynthesizeSpeech": grpc.unary_unary_rpc_method_handler(
+                self._synthesize_speech,
+                request_deserializer=texttospeech.SynthesizeSpeechRequest.deserialize,
+                response_serializer=texttospeech.SynthesizeSpeechResponse.serialize,
+            ),
+        }
+        self._server.add_generic_rpc_handlers((grpc.method_handlers_generic_handler(self.SERVICE_NAME, handlers),))
+        self.port = self._server.add_secure_port(f"127.0.0.1:{port}", grpc.local_server_credentials())
+
+    @property
+    def address(self):
+        """The host and port to point a channel at."""
+        return f"127.0.0.1:{self.port}"
+
+    def _list_voices(self, request, context):
+        """Return a single voice for the requested language."""
+        from google.cloud import texttospeech
+
+        language_code = request.language_code or "en-US"
+        voice = texttospeech.Voice(
+            name=f"{language_code}-Mock-A",
+            language_codes=[language_code],
+            ssml_gender=texttospeech.SsmlVoiceGender.NEUTRAL,
+            natural_sample_rate_hertz=24000,
+        )
+        return texttospeech.ListVoicesResponse(voices=[voice])
+
+    def _synthesize_speech(self, request, context):
+        """Return silent audio after the simulated latency and synthesis time."""
+        import grpc
+        from google.cloud import texttospeech
+
+        if self.behaviour.should_fail():
+            time.sleep(self.behaviour.latency)
+            context.abort(grpc.StatusCode.UNAVAILABLE, "Simulated server error")
+
+        with self._lock:
+            self.request_count += 1
+
+        audio, duration = _make_google_audio(request.input.text, request.audio_config)
+        audio_content = b"".join(self.behaviour.iter_chunks(audio, duration))
+        return texttospeech.SynthesizeSpeechResponse(audio_content=audio_content)
+
+    def __enter__(self):
+        self._server.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.stop(None)
+
+
+class FakeGoogleTTSAsyncClient(FakeGoogleTTSClient):
+    """In-process stand-in for google.cloud.texttospeech.TextToSpeechAsyncClient."""
+
+    async def synthesize_speech(self, input, voice, audio_config, **kwargs):
+        """Return silent audio after the simulated latency and synthesis time."""
+        from google.api_core.exceptions import ServiceUnavailable
+
+        await asyncio.sleep(self.behaviour.latency)
+        if self.behaviour.should_fail():
+            raise ServiceUnavailable("Simulated server error")
+
+        with self._lock:
+            self.request_count += 1
+
+        audio, duration = _make_google_audio(input.text, audio_config)
+        await asyncio.sleep(duration / self.behaviour.realtime_factor)
+        return SimpleNamespace(audio_content=audio)
+
+
+class FakeCloudStorage:
+    """In-memory stand-in for the Cloud Storage bucket the long audio API writes to."""
+
+    def __init__(self):
+        self.objects = {}
+        self._lock = threading.Lock()
+
+    def upload(self, gcs_uri, data):
+        with self._lock:
+            self.objects[gcs_uri] = data
+
+    def download(self, gcs_uri, output_file, chunk_size=1024 * 1024):
+        """Write an object to a file in chunks and delete it, like GoogleCloudService._download_gcs_object."""
+        with self._lock:
+            data = self.objects.pop(gcs_uri)
+        with open(output_file, "wb") as f:
+            for start in range(0, len(data), chunk_size):
+                f.write(data[start:start + chunk_size])
+
+
+class _FakeLongAudioOperation:
+    """Long-running operation that finishes once its simulated synthesis time has passed."""
+
+    def __init__(self, storage, gcs_uri, audio, finish_time):
+        self.storage = storage
+        self.gcs_uri = gcs_uri
+        self.audio = audio
+        self.finish_time = finish_time
+
+    async def done(self):
+        if time.monotonic() < self.finish_time:
+            return False
+        if self.audio is not None:
+            self.storage.upload(self.gcs_uri, self.audio)
+            self.audio = None
+        return True
+
+    async def result(self):
+        while not await self.done():
+            await asyncio.sleep(0.01)
+        return SimpleNamespace()
+
+
+class FakeGoogleLongAudioClient:
+    """In-process stand-in for google.cloud.texttospeech.TextToSpeechLongAudioSynthesizeAsyncClient.
+
+    Operations write silent audio to a FakeCloudStorage instead of a bucket.
+    """
+
+    def __init__(self, behaviour=None, storage=None):
+        """Initialize the client.
+
+        Args:
+            behaviour (MockBehaviour, optional): The simulated service behaviour.
+            storage (FakeCloudStorage, optional): Where finished operations write their audio.
+        """
+        self.behaviour = behaviour or MockBehaviour()
+        self.storage = storage or FakeCloudStorage()
+        self.request_count = 0
+        self._lock = threading.Lock()
+
+    async def synthesize_long_audio(self, request, **kwargs):
+        """Start an operation that renders the whole text at the simulated synthesis speed."""
+        from google.api_core.exceptions import ServiceUnavailable
+
+        await asyncio.sleep(self.behaviour.latency)
+        if self.behaviour.should_fail():
+            raise ServiceUnavailable("Simulated server error")
+
+        with self._lock:
+            self.request_count += 1
+
+        audio, duration = _make_google_audio(request.input.text, request.audio_config)
+        finish_time = time.monotonic() + duration / self.behaviour.realtime_factor
+        return _FakeLongAudioOperation(self.storage, request.output_gcs_uri, audio, finish_time)
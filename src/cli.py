@@ -0,0 +1,367 @@
+"""Headless command-line interface for SayThis.
+
+This module must not import tkinter or pygame, so that it can run on
+machines without a display or audio device.
+"""
+import argparse
+import csv
+import json
+import re
+import sys
+import time
+from concurrent.futures import as_completed
+from pathlib import Path
+
+
+def parse_value(value):
+    """Parse a command-line or CSV value as JSON, falling back to a plain string.
+    
+    Args:
+        value (str): The raw value
+    
+    Returns:
+        The parsed value
+    """
+    try:
+        return json.loads(value)
+    except json.JSONDecodeError:
+        return value
+
+
+def build_overrides(items):
+    """Build a nested overrides dictionary from dotted key/value pairs.
+    
+    Args:
+        items (iterable): (key, value) pairs such as ("voice_settings.speed", 1.1)
+    
+    Returns:
+        dict: The nested overrides
+    """
+    overrides = {}
+    for key, value in items:
+        target = overrides
+        *parents, leaf = key.split(".")
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        target[leaf] = value
+    return overrides
+
+
+def parse_voice_options(options):
+    """Parse repeated --voice KEY=VALUE options.
+    
+    Args:
+        options (list): The raw option strings
+    
+    Returns:
+        dict: The nested overrides
+    """
+    items = []
+    for option in options or []:
+        key, separator, value = option.partition("=")
+        if not separator or not key:
+            raise argparse.ArgumentTypeError(f"Invalid voice override '{option}', expected KEY=VALUE")
+        items.append((key, parse_value(value)))
+    return build_overrides(items)
+
+
+def read_manifest(manifest_path):
+    """Read batch rows from a JSONL or CSV manifest.
+    
+    JSONL rows are objects with "id", "text" and an optional "voice" object.
+    CSV files need "id" and "text" columns; every other non-empty column is
+    treated as a voice override, with dotted names for nested settings.
+    
+    Args:
+        manifest_path (Path): The manifest file
+    
+    Returns:
+        list: (row_id, text, overrides) tuples
+    """
+    manifest_path = Path(manifest_path)
+    rows = []
+    
+    if manifest_path.suffix.lower() == ".csv":
+        with open(manifest_path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                overrides = build_overrides(
+                    (key, parse_value(value)) for key, value in row.items()
+                    if key not in ("id", "text") and value not in (None, "")
+                )
+                rows.append((row["id"], row["text"], overrides))
+    else:
+        with open(manifest_path, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"{manifest_path}:{line_number}: {e}")
+                rows.append((str(row["id"]), row["text"], row.get("voice") or {}))
+    
+    return rows
+
+
+def safe_file_stem(row_id):
+    """Turn a manifest row id into a safe file name stem.
+    
+    Args:
+        row_id (str): The row id
+    
+    Returns:
+        str: The id with path separators and other unsafe characters replaced
+    """
+    return re.sub(r"[^\w.-]", "_", str(row_id)).lstrip(".") or "_"
+
+
+def synthesize_to_file(tts_engine, text, output_file, overrides=None):
+    """Synthesize text into output_file.
+    
+    The file is replaced atomically, so an interrupted run never leaves a
+    partial file that a resumed batch would mistake for a finished row.
+    
+    Args:
+        tts_engine (TextToSpeech): The TTS engine
+        text (str): The text to convert to speech
+        output_file (Path): Destination of the audio file
+        overrides (dict, optional): Voice overrides for this request
+    
+    Returns:
+        Path: The output file
+    """
+    output_file = Path(output_file)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    return tts_engine.synthesize_speech(text, output_file=output_file, overrides=overrides)
+
+
+async def synthesize_to_file_async(tts_engine, text, output_file, overrides=None):
+    """Synthesize text into output_file without blocking the event loop.
+    
+    Args:
+        tts_engine (TextToSpeech): The TTS engine
+        text (str): The text to convert to speech
+        output_file (Path): Destination of the audio file
+        overrides (dict, optional): Voice overrides for this request
+    
+    Returns:
+        Path: The output file
+    """
+    output_file = Path(output_file)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    return await tts_engine.synthesize_speech_async(text, output_file=output_file, overrides=overrides)
+
+
+def describe_savings(tts_engine, output_file):
+    """Describe how much of a request was served from the synthesis cache.
+    
+    Args:
+        tts_engine (TextToSpeech): The TTS engine
+        output_file (Path): The audio file of the request
+    
+    Returns:
+        str: E.g. "120 of 300 characters from cache", or "" if nothing was reused
+    """
+    report = tts_engine.get_synthesis_report(output_file)
+    if report is None or not report["cached_characters"]:
+        return ""
+    return f"{report['cached_characters']} of {report['characters']} characters from cache"
+
+
+def run_say(app, args):
+    """Synthesize a single message from an argument, a file or stdin."""
+    if args.file:
+        text = Path(args.file).read_text(encoding="utf-8")
+    elif args.text and args.text != "-":
+        text = args.text
+    else:
+        text = sys.stdin.read()
+    
+    if not text.strip():
+        print("Error: no text to convert to speech.", file=sys.stderr)
+        return 1
+    
+    tts_engine = app.tts_engine
+    overrides = parse_voice_options(args.voice)
+    output_file = Path(args.output or f"saythis{tts_engine.get_file_extension(text, overrides)}")
+    
+    synthesize_to_file(tts_engine, text, output_file, overrides)
+    savings = describe_savings(tts_engine, output_file)
+    if savings:
+        print(f"Reused {savings}", file=sys.stderr)
+    print(output_file)
+    return 0
+
+
+def run_batch(app, args):
+    """Synthesize every row of a manifest into its own file."""
+    tts_engine = app.tts_engine
+    rows = read_manifest(args.manifest)
+    out_dir = Path(args.out_dir)
+    common_overrides = parse_voice_options(args.voice)
+    
+    jobs = []
+    skipped = 0
+    for row_id, text, row_overrides in rows:
+        overrides = app.config_manager.deep_merge(common_overrides, row_overrides)
+        file_extension = tts_engine.get_file_extension(text, overrides)
+        output_file = out_dir / f"{safe_file_stem(row_id)}{file_extension}"
+        
+        # Resume support: rows whose output already exists are done
+        if output_file.exists():
+            skipped += 1
+            continue
+        jobs.append((row_id, text, output_file, overrides))
+    
+    print(f"{len(jobs)} to synthesize, {skipped} already done", file=sys.stderr)
+    
+    # Check the whole batch against the character limit before sending anything.
+    # Rows served from the synthesis cache are counted too, so this errs on the safe side.
+    try:
+        warning = tts_engine.check_character_quota(sum(len(job[1]) for job in jobs), wait_for_usage=True)
+    except RuntimeError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    if warning:
+        print(f"Warning: {warning}", file=sys.stderr)
+    
+    # Rows go through the persistent job queue, so an interrupted batch resumes
+    # after its last finished segment when it is run again. The workers are
+    # created when the pool starts, so the concurrency is set before the first job.
+    tts_engine.job_workers.concurrency = max(1, args.concurrency)
+    futures = {}
+    for row_id, text, output_file, overrides in jobs:
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        future = app.enqueue_job(text, output_file, overrides)
+        futures[future] = (row_id, output_file)
+    tts_engine.start_job_workers()
+    
+    failed = 0
+    for future in as_completed(futures):
+        row_id, output_file = futures[future]
+        try:
+            future.result()
+        except Exception as e:
+            failed += 1
+            print(f"failed  {row_id}: {e}", file=sys.stderr)
+            continue
+        savings = describe_savings(tts_engine, output_file)
+        print(f"ok      {row_id} -> {output_file}" + (f" ({savings})" if savings else ""), file=sys.stderr)
+    
+    print(f"{len(jobs) - failed} synthesized, {skipped} skipped, {failed} failed", file=sys.stderr)
+    
+    stats = tts_engine.get_scheduler_stats().get(app.get_selected_service())
+    if stats:
+        print(
+            f"{stats['retries']} retries ({stats['throttled']} rate limited), "
+            f"average wait {stats['average_wait']:.2f}s, max queue depth {stats['max_queue_depth']}",
+            file=sys.stderr,
+        )
+    return 1 if failed else 0
+
+
+def run_queue(app, args):
+    """List, run, retry or clear the jobs in the persistent job queue."""
+    tts_engine = app.tts_engine
+    if args.action == "retry":
+        print(f"{tts_engine.retry_failed_jobs()} failed jobs queued again", file=sys.stderr)
+        return 0
+    if args.action == "clear":
+        print(f"{tts_engine.clear_jobs()} finished jobs removed", file=sys.stderr)
+        return 0
+    
+    if args.action == "run":
+        if not app.is_service_initialized():
+            print(f"Error: {app.get_selected_service()} is not configured. Set it up in the Settings tab first.", file=sys.stderr)
+            return 1
+        # Jobs are claimed per service; jobs of other services wait until they are selected
+        service = app.get_selected_service()
+        tts_engine.start_job_workers()
+        while any(job["service"] == service for status in ("pending", "running") for job in tts_engine.list_jobs(status)):
+            time.sleep(0.5)
+        tts_engine.stop_job_workers()
+    
+    jobs = tts_engine.list_jobs()
+    for job in jobs:
+        progress = f"{job['segments_done']}/{job['segment_count']}" if job["segment_count"] > 1 else ""
+        line = f"{job['id']:>6}  {job['status']:<8}{progress:>8}  {job['service']:<13} {job['output_file']}"
+        if job["error"]:
+            line += f"  ({job['error']})"
+        print(line)
+    counts = tts_engine.job_queue.get_counts()
+    print(", ".join(f"{count} {status}" for status, count in counts.items()), file=sys.stderr)
+    return 1 if args.action == "run" and counts["failed"] else 0
+
+
+def run_cache(app, args):
+    """Show or clear the synthesis cache."""
+    if args.action == "clear":
+        app.clear_cache()
+    print(json.dumps(app.get_cache_stats(), indent=4))
+    return 0
+
+
+def build_parser():
+    """Build the command-line argument parser.
+    
+    Returns:
+        argparse.ArgumentParser: The parser
+    """
+    parser = argparse.ArgumentParser(
+        prog="saythis",
+        description="Generate audio from text with the configured TTS service.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    voice_help = "Override a voice setting for this run, e.g. voice_id=abc or voice_settings.speed=1.1"
+    
+    say_parser = subparsers.add_parser("say", help="Synthesize a single message")
+    say_parser.add_argument("text", nargs="?", help="Text to synthesize ('-' or omitted reads stdin)")
+    say_parser.add_argument("-f", "--file", help="Read the text from a file")
+    say_parser.add_argument("-o", "--output", help="Output audio file")
+    say_parser.add_argument("--voice", action="append", metavar="KEY=VALUE", help=voice_help)
+    say_parser.set_defaults(handler=run_say)
+    
+    batch_parser = subparsers.add_parser("batch", help="Synthesize every row of a JSONL or CSV manifest")
+    batch_parser.add_argument("manifest", help="Manifest file (.jsonl or .csv) with id and text fields")
+    batch_parser.add_argument("-d", "--out-dir", default="saythis_output", help="Directory for the audio files")
+    batch_parser.add_argument("-j", "--concurrency", type=int, default=4, help="Number of rows synthesized at once")
+    batch_parser.add_argument("--voice", action="append", metavar="KEY=VALUE", help=voice_help)
+    batch_parser.set_defaults(handler=run_batch)
+    
+    queue_parser = subparsers.add_parser("queue", help="Inspect or drain the persistent job queue")
+    queue_parser.add_argument(
+        "action",
+        choices=["list", "run", "retry", "clear"],
+        help="list jobs, run pending and interrupted jobs, queue failed jobs again, or remove finished jobs",
+    )
+    queue_parser.set_defaults(handler=run_queue)
+    
+    cache_parser = subparsers.add_parser("cache", help="Inspect or clear the synthesis cache")
+    cache_parser.add_argument("action", choices=["stats", "clear"])
+    cache_parser.set_defaults(handler=run_cache)
+    
+    return parser
+
+
+def run_cli(app, argv):
+    """Run the command-line interface.
+    
+    Args:
+        app (Application): The application instance
+        argv (list): Command-line arguments, excluding the program name
+    
+    Returns:
+        int: The process exit code
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    
+    try:
+        if args.command in ("say", "batch") and not app.is_service_initialized():
+            print(f"Error: {app.get_selected_service()} is not configured. Set it up in the Settings tab first.", file=sys.stderr)
+            return 1
+        return args.handler(app, args)
+    except (RuntimeError, ValueError, OSError, argparse.ArgumentTypeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
@@ -1,9 +1,18 @@
+import copy
 import json
+import os
+import threading
+import time
 from pathlib import Path
 
+from tts.services.registry import service_registry
+
 
 class ConfigManager:
     """Manages application configuration, including API key storage."""
+
+    # Minimum number of seconds between checks of the config file for external edits
+    STAT_CHECK_INTERVAL = 1.0
     
     def __init__(self):
         """Initialize the configuration manager."""
@@ -15,81 +24,139 @@ class ConfigManager:
         
         # Default configuration
         self.default_config = {
-            "selected_service": "ElevenLabs",
-            "ElevenLabs": {
-                "api_key": "",
-                "voice_id": "yj30vwTGJxSHezdAGsv9",
-                "model_id": "eleven_turbo_v2_5",
-                "output_format": "mp3_22050_32",
-                "file_extension": ".mp3",
-                "voice_settings": {
-                    "stability": 0.5,
-                    "similarity_boost": 0.75,
-                    "style": 0.0,
-                    "use_speaker_boost": True,
-                    "speed": 1.0
-                }
+            "selected_service": service_registry.names()[0],
+            **service_registry.get_default_configs(),
+            "segmentation": {
+                "max_segment_size": 2500,
+                "max_workers": 4
+            },
+            "output_store": {
+                "max_files": 50,
+                "max_age_days": 7,
+                "max_bytes": 500 * 1024 * 1024,
+                # Generated audio up to this size is kept in memory until a file is needed
+                "max_memory_bytes": 16 * 1024 * 1024
+            },
+            "synthesis_cache": {
+                "enabled": True,
+                # Reuse cached sentences in longer messages; the other sentences are then
+                # synthesized one request each, without intonation across sentences
+                "sentence_level": False,
+                "max_bytes": 200 * 1024 * 1024,
+                "max_entries": 500
+            },
+            "character_usage": {
+                "ttl_seconds": 300,
+                "warning_ratio": 0.9,
+                "block_over_limit": True
+            },
+            "request_scheduler": {
+                "max_retries": 4,
+                "base_delay": 0.5,
+                "max_delay": 30.0,
+                # Per-service overrides of the rate limits declared by the services
+                "rate_limits": {}
+            },
+            "http_client": {
+                # Connections shared by all requests to HTTP-based services
+                "max_connections": 20,
+                "max_keepalive_connections": 20,
+                # Idle connections are kept open this long for the next request
+                "keepalive_expiry_seconds": 60,
+                # Needs the h2 package; falls back to HTTP/1.1 without it
+                "http2": False,
+                "timeout_seconds": 240
             },
-            "Google Cloud": {
-                "service_account_json_path": "",
-                "language_code": "en-US",
-                "voice_name": "en-US-Wavenet-D",
-                "voice_gender": "NEUTRAL",
-                "audio_encoding": "MP3",
-                "speaking_rate": 1.0,
-                "pitch": 0.0,
-                "volume_gain_db": 0.0,
-                "file_extension": ".mp3"
+            "voice_catalogue": {
+                # How long a fetched voice list is used before it is fetched again
+                "ttl_seconds": 24 * 60 * 60
+            },
+            "job_queue": {
+                "concurrency": 2,
+                "poll_interval": 2.0,
+                "lease_seconds": 15.0
+            },
+            "speculative_synthesis": {
+                "enabled": False,
+                # Pause in typing before completed sentences are synthesized
+                "debounce_ms": 800,
+                # Characters synthesized ahead of time between two Generate requests
+                "max_characters": 1000,
+                "max_workers": 2
+            },
+            "metrics": {
+                # Record per-stage latencies and per-service counters
+                "enabled": False,
+                # Serve the metrics as Prometheus text on this port of 127.0.0.1, null for none
+                "prometheus_port": None,
+                # Append each observation to this JSON lines file, null for none
+                "json_log_path": None
             }
         }
         self.selected_service = self.default_config["selected_service"]
 
+        # In-memory copy of the configuration, kept in sync with the config file
+        self._lock = threading.RLock()
+        self._config = None
+        self._file_signature = None
+        self._next_stat_check = 0.0
+
         self.load_config()
 
-    def _merge_with_defaults(self, loaded_config):
-        """Merge loaded config with default config for backwards compatibility.
+    @staticmethod
+    def deep_merge(default, loaded):
+        """Recursively merge two dictionaries.
         
         Args:
-            loaded_config (dict): The configuration loaded from file
+            default (dict): The base dictionary
+            loaded (dict): The dictionary whose values take precedence
             
         Returns:
-            dict: Merged configuration with defaults filled in
+            dict: A new merged dictionary
         """
-        def deep_merge(default, loaded):
-            """Recursively merge two dictionaries."""
-            merged = default.copy()
-            
-            for key, value in loaded.items():
-                if key in merged and isinstance(merged[key], dict) and isinstance(value, dict):
-                    # Recursively merge nested dictionaries
-                    merged[key] = deep_merge(merged[key], value)
-                else:
-                    # Use loaded value for non-dict values or new keys
-                    merged[key] = value
-            
-            return merged
+        merged = copy.deepcopy(default)
+        
+        for key, value in loaded.items():
+            if key in merged and isinstance(merged[key], dict) and isinstance(value, dict):
+                # Recursively merge nested dictionaries
+                merged[key] = ConfigManager.deep_merge(merged[key], value)
+            else:
+                # Use loaded value for non-dict values or new keys
+                merged[key] = value
         
-        return deep_merge(self.default_config, loaded_config)
+        return merged
 
-    def get_data_dir(self):
-        """Get the data directory path.
+    def _merge_with_defaults(self, loaded_config):
+        """Merge loaded config with default config for backwards compatibility.
         
+        Args:
+            loaded_config (dict): The configuration loaded from file
+            
         Returns:
-            Path: The data directory path
+            dict: Merged configuration with defaults filled in
         """
-        return self.data_dir
-    
-    def load_config(self):
-        """Load configuration from file.
+        return self.deep_merge(self.default_config, loaded_config)
+
+    def _get_file_signature(self):
+        """Get a signature of the config file used to detect external edits.
         
         Returns:
-            dict: Configuration dictionary
+            tuple: (inode, size, mtime in nanoseconds), or None if the file does not exist
         """
-        if not self.config_filepath.exists():
+        try:
+            stat = os.stat(self.config_filepath)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    def _read_config_file(self):
+        """Read the config file from disk and refresh the in-memory configuration."""
+        signature = self._get_file_signature()
+
+        if signature is None:
             # Create default config if file doesn't exist
-            self.save_config(self.default_config)
-            self.selected_service = self.default_config["selected_service"]
-            return self.default_config
+            self._write_config_file(copy.deepcopy(self.default_config))
+            return
         
         try:
             with open(self.config_filepath, 'r', encoding='utf-8') as f:
@@ -100,25 +167,172 @@ class ConfigManager:
             
             # Save the merged config if it was updated
             if merged_config != config:
-                self.save_config(merged_config)
-
-            self.selected_service = merged_config["selected_service"]
-            return merged_config
+                self._write_config_file(merged_config)
+            else:
+                self._config = merged_config
+                self._file_signature = signature
             
         except (json.JSONDecodeError, FileNotFoundError) as e:
-            # If config file is corrupted, return defaults
+            # If config file is corrupted, use defaults until the file is fixed
             print(f"Warning: Could not load config file ({e}). Using defaults.")
-            self.selected_service = self.default_config["selected_service"]
-            return self.default_config
+            self._config = copy.deepcopy(self.default_config)
+            self._file_signature = signature
+
+        self.selected_service = self._config["selected_service"]
+
+    def _write_config_file(self, config):
+        """Atomically write the configuration to disk and make it the in-memory copy.
+        
+        Args:
+            config (dict): Configuration dictionary to write
+        """
+        temp_filepath = self.config_filepath.with_suffix(".json.tmp")
+        with open(temp_filepath, 'w', encoding='utf-8') as f:
+            json.dump(config, f, indent=4)
+        os.replace(temp_filepath, self.config_filepath)
+
+        self._config = config
+        self._file_signature = self._get_file_signature()
+        self.selected_service = config["selected_service"]
+
+    def _get_config(self):
+        """Get the in-memory configuration, reloading it if the file changed on disk.
+        
+        The config file is only checked at most once per STAT_CHECK_INTERVAL seconds,
+        so repeated getter calls cost a dictionary lookup rather than file I/O.
+        
+        Returns:
+            dict: The cached configuration dictionary (must not be mutated)
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._config is None:
+                self._read_config_file()
+            elif now >= self._next_stat_check and self._get_file_signature() != self._file_signature:
+                self._read_config_file()
+            if now >= self._next_stat_check:
+                self._next_stat_check = now + self.STAT_CHECK_INTERVAL
+            return self._config
+
+    def get_data_dir(self):
+        """Get the data directory path.
+        
+        Returns:
+            Path: The data directory path
+        """
+        return self.data_dir
+    
+    def get_cache_config(self):
+        """Get the synthesis cache configuration.
+        
+        Returns:
+            dict: The synthesis cache configuration
+        """
+        return self._get_config()["synthesis_cache"]
+    
+    def get_usage_config(self):
+        """Get the configuration for caching and enforcing character usage.
+        
+        Returns:
+            dict: The character usage configuration
+        """
+        return self._get_config()["character_usage"]
+    
+    def get_http_client_config(self):
+        """Get the connection pool and timeout configuration of the shared HTTP client.
+        
+        Returns:
+            dict: The HTTP client configuration
+        """
+        return self._get_config()["http_client"]
+    
+    def get_metrics_config(self):
+        """Get the configuration of latency and usage metrics.
+        
+        Returns:
+            dict: The metrics configuration
+        """
+        return self._get_config()["metrics"]
+    
+    def get_voice_catalogue_config(self):
+        """Get the configuration of the cached voice lists.
+        
+        Returns:
+            dict: The voice catalogue configuration
+        """
+        return self._get_config()["voice_catalogue"]
+    
+    def get_scheduler_config(self):
+        """Get the retry and rate limit configuration of the request scheduler.
+        
+        Returns:
+            dict: The request scheduler configuration
+        """
+        return self._get_config()["request_scheduler"]
+    
+    def get_job_queue_config(self):
+        """Get the configuration of the persistent job queue workers.
+        
+        Returns:
+            dict: The job queue configuration
+        """
+        return self._get_config()["job_queue"]
+    
+    def get_speculation_config(self):
+        """Get the configuration of speculative synthesis while typing.
+        
+        Returns:
+            dict: The speculative synthesis configuration
+        """
+        return self._get_config()["speculative_synthesis"]
+    
+    def set_speculation_enabled(self, enabled):
+        """Turn speculative synthesis while typing on or off.
+        
+        Args:
+            enabled (bool): Whether completed sentences are synthesized while typing
+        """
+        with self._lock:
+            config = copy.deepcopy(self._get_config())
+            config["speculative_synthesis"]["enabled"] = bool(enabled)
+            self.save_config(config)
+    
+    def get_output_config(self):
+        """Get the configuration for retention of generated audio files.
+        
+        Returns:
+            dict: The output store configuration
+        """
+        return self._get_config()["output_store"]
+    
+    def get_segmentation_config(self):
+        """Get the long-text segmentation configuration.
+        
+        Returns:
+            dict: The segmentation configuration
+        """
+        return self._get_config()["segmentation"]
+    
+    def load_config(self):
+        """Load configuration, re-reading the file only if it changed on disk.
+        
+        Returns:
+            dict: A copy of the configuration dictionary
+        """
+        with self._lock:
+            self._next_stat_check = 0.0
+            return copy.deepcopy(self._get_config())
     
     def save_config(self, config):
-        """Save configuration to file.
+        """Save configuration to file if it differs from the current configuration.
         
         Args:
             config (dict): Configuration dictionary to save
         """
-        with open(self.config_filepath, 'w', encoding='utf-8') as f:
-            json.dump(config, f, indent=4)
+        with self._lock:
+            if config == self._config and self._get_file_signature() == self._file_signature:
+                return
+            self._write_config_file(copy.deepcopy(config))
     
     def get_selected_service(self):
         """Get the currently selected TTS service.
@@ -126,27 +340,31 @@ class ConfigManager:
         Returns:
             str: The name of the selected service
         """
+        self._get_config()
         return self.selected_service
     
     def set_selected_service(self, service):
         """Set the selected TTS service.
         
         Args:
-            service (str): The service name to select ("ElevenLabs" or "Google Cloud")
+            service (str): The service name to select, as registered in the service registry
         """
-        config = self.load_config()
-        config["selected_service"] = service
-        self.selected_service = service
-        self.save_config(config)
+        with self._lock:
+            config = copy.deepcopy(self._get_config())
+            config["selected_service"] = service
+            self.save_config(config)
 
     def get_service_config(self):
         """Get configuration for the currently selected service.
+        
+        The returned dictionary is a copy, so callers can edit it and pass it
+        to set_service_config.
             
         Returns:
             dict: The service configuration
         """
-        config = self.load_config()
-        return config.get(self.selected_service)
+        with self._lock:
+            return copy.deepcopy(self._get_config().get(self.selected_service))
     
     def set_service_config(self, service_config):
         """Set configuration for the selected service.
@@ -154,6 +372,7 @@ class ConfigManager:
         Args:
             service_config (dict): Configuration to set
         """
-        config = self.load_config()
-        config[self.selected_service] = service_config
-        self.save_config(config)
+        with self._lock:
+            config = copy.deepcopy(self._get_config())
+            config[self.selected_service] = service_config
+            self.save_config(config)
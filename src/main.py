@@ -1,5 +1,8 @@
-from tts import TextToSpeech
-from ui import UI
+import multiprocessing
+import sys
+
+from tts import TextToSpeech, SynthesisExecutor
+from tts.metrics import metrics
 from config_manager import ConfigManager
 
 
@@ -9,34 +12,284 @@ class Application:
     def __init__(self):
         """Initialize the application with configuration manager and TTS engine."""
         self.config_manager = ConfigManager()
+        metrics_config = self.config_manager.get_metrics_config()
+        metrics.configure(
+            metrics_config["enabled"],
+            prometheus_port=metrics_config["prometheus_port"],
+            json_log_path=metrics_config["json_log_path"],
+        )
         self.tts_engine = TextToSpeech(self, self.config_manager)
+        self.synthesis_executor = SynthesisExecutor()
+        # Future of the queued job started by the last generate_audio call, if any
+        self._job_future = None
     
     def run(self):
         """Run the application with GUI."""
+        # Imported here so the command-line mode never loads tkinter or pygame
+        from ui import UI
+        
         ui = UI(self)
-        ui.run()
+        # Resume jobs that were interrupted when the application last stopped
+        self.tts_engine.start_job_workers()
+        try:
+            ui.run()
+        finally:
+            self.shutdown()
+    
+    def shutdown(self):
+        """Release background resources held by the application."""
+        self.synthesis_executor.shutdown()
+        self.tts_engine.stop_job_workers()
+        self.tts_engine.speculative_synthesizer.shutdown()
+        self.tts_engine.close_services()
+        metrics.close()
+    
+    def generate_audio(self, message, audio_sink=None):
+        """Convert the provided message to speech in the background and save to a file.
+        
+        Submitting a new message cancels any request that is still in flight.
+        Messages too long for one request go through the persistent job queue,
+        so a long synthesis interrupted by a crash resumes on the next start
+        without paying for the finished segments again.
+        
+        Args:
+            message (str): The text message to convert to speech
+            audio_sink (optional): Receives PCM audio as it arrives when streaming is enabled
+            
+        Returns:
+            Future: A future resolved with the path to the saved audio file.
+        """
+        self.cancel_generation()
+        if self.is_service_initialized() and self.tts_engine.needs_segmentation(message):
+            self._job_future = self.enqueue_job(message)
+            return self._job_future
+        if self.tts_engine.speculative_synthesizer.is_enabled():
+            # Reuse the sentences synthesized while the message was typed
+            return self.synthesis_executor.submit(self.tts_engine.speculative_synthesizer.synthesize, message, audio_sink)
+        return self.synthesis_executor.submit(self.tts_engine.synthesize_speech, message, audio_sink)
     
-    def generate_audio(self, message):
-        """Convert the provided message to speech and save to a file.
+    def enqueue_job(self, message, output_file=None, overrides=None):
+        """Add a message to the persistent job queue and start the queue workers.
         
         Args:
             message (str): The text message to convert to speech
+            output_file (Path, optional): Where to save the audio
+            overrides (dict, optional): Voice settings that take precedence over the configuration
             
         Returns:
-            Path: The path to the saved audio file.
+            Future: A future resolved with the path to the saved audio file.
+                    Cancelling it cancels the job.
+        """
+        job_id = self.tts_engine.enqueue_job(message, output_file, overrides)
+        self.tts_engine.start_job_workers()
+        return self.tts_engine.wait_for_job(job_id)
+    
+    def speculate(self, message):
+        """Synthesize the completed sentences of a message that is being typed.
+        
+        Does nothing unless speculative synthesis is enabled.
+        
+        Args:
+            message (str): The message as typed so far
+        """
+        self.tts_engine.speculative_synthesizer.update(message)
+    
+    def get_speculation_config(self):
+        """Get the configuration of speculative synthesis while typing.
+        
+        Returns:
+            dict: The enabled flag, debounce delay, character budget and worker count
+        """
+        return self.config_manager.get_speculation_config()
+    
+    def set_speculation_enabled(self, enabled):
+        """Turn speculative synthesis while typing on or off.
+        
+        Args:
+            enabled (bool): Whether completed sentences are synthesized while typing
+        """
+        self.config_manager.set_speculation_enabled(enabled)
+    
+    def is_streaming_enabled(self):
+        """Check if generated audio is streamed to the player while it is synthesized.
+        
+        Returns:
+            bool: True if streaming playback is enabled for the current service
         """
-        return self.tts_engine.synthesize_speech(message)
+        return self.tts_engine.is_streaming_enabled()
     
-    def get_character_usage(self):
+    def cancel_generation(self, keep_queued=False):
+        """Cancel the in-flight audio generation request, if any.
+        
+        Args:
+            keep_queued (bool): Leave a request that went through the job queue in
+                                the queue, so that it resumes on the next start
+        """
+        self.synthesis_executor.cancel_current()
+        job_future, self._job_future = self._job_future, None
+        if job_future is not None and not keep_queued:
+            job_future.cancel()
+    
+    def get_character_usage(self, refresh=False):
         """Get character usage information from the TTS engine.
         
+        Args:
+            refresh (bool): Fetch the usage from the service even if it is cached
+            
         Returns:
             tuple: A tuple containing (character_count, character_limit).
             
         Raises:
             RuntimeError: If there's an error retrieving usage information.
         """
-        return self.tts_engine.get_character_usage()
+        return self.tts_engine.get_character_usage(refresh)
+    
+    def get_cached_character_usage(self):
+        """Get the known character usage without calling the TTS service.
+        
+        Returns:
+            tuple: (character_count, character_limit), or None if not known yet.
+        """
+        return self.tts_engine.get_cached_character_usage()
+    
+    def refresh_character_usage(self, callback=None, force=True):
+        """Fetch character usage from the TTS service in the background.
+        
+        Args:
+            callback (callable, optional): Called on a background thread with
+                                           (usage, error) once the usage is fetched
+            force (bool): Fetch even if the last fetch failed recently
+        """
+        self.tts_engine.refresh_character_usage(callback, force)
+    
+    def get_voices(self):
+        """Get the cached voices of the TTS service, refreshing them in the background when stale.
+        
+        Returns:
+            list: The voices sorted by name, or None if not available.
+        """
+        return self.tts_engine.get_voices()
+    
+    def refresh_voices(self, callback=None, force=True):
+        """Fetch the voices of the TTS service in the background.
+        
+        Args:
+            callback (callable, optional): Called on a background thread with
+                                           (voices, error) once the voices are fetched
+            force (bool): Fetch even if the last fetch failed recently
+        """
+        self.tts_engine.refresh_voices(callback, force)
+    
+    def search_voices(self, query):
+        """Search the cached voices of the TTS service.
+        
+        Args:
+            query (str): The search query
+            
+        Returns:
+            list: The matching voices sorted by name.
+        """
+        return self.tts_engine.search_voices(query)
+    
+    def find_voice(self, voice_id):
+        """Look up a voice of the TTS service in its cached voice list.
+        
+        Args:
+            voice_id (str): The voice id
+            
+        Returns:
+            dict: The voice, or None if it is unknown.
+        """
+        return self.tts_engine.find_voice(voice_id)
+    
+    def get_usage_config(self):
+        """Get the character usage configuration.
+        
+        Returns:
+            dict: The TTL, warning ratio and blocking settings for character usage
+        """
+        return self.config_manager.get_usage_config()
+    
+    def get_scheduler_stats(self):
+        """Get the queue depth, wait-time and retry metrics of provider requests.
+        
+        Returns:
+            dict: The request scheduler metrics of each service, keyed by service name.
+        """
+        return self.tts_engine.get_scheduler_stats()
+    
+    def get_audio_duration(self, audio):
+        """Get the playing time of generated audio.
+        
+        Args:
+            audio: Path to the audio file, or an AudioResult.
+        
+        Returns:
+            float: The duration in seconds, or None if it cannot be determined.
+        """
+        return self.tts_engine.get_audio_duration(audio)
+    
+    def trace(self, stage, **labels):
+        """Time a stage of work for the latency metrics.
+        
+        Args:
+            stage (str): The stage name, e.g. "playback.load".
+            **labels: Labels of the observation.
+        
+        Returns:
+            A context manager timing the block; it records nothing while metrics are disabled.
+        """
+        return metrics.span(stage, **labels)
+    
+    def get_metrics(self):
+        """Get the recorded stage latencies and per-service counters.
+        
+        Returns:
+            dict: "stages" and "counters" lists, empty while metrics are disabled.
+        """
+        return metrics.get_snapshot()
+    
+    def get_cache_stats(self):
+        """Get statistics about the synthesis cache.
+        
+        Returns:
+            dict: Entry count, total size, limits, hit/miss counters and characters saved.
+        """
+        return self.tts_engine.get_cache_stats()
+    
+    def get_synthesis_report(self, audio):
+        """Get how much of a recent request was served from the synthesis cache.
+        
+        Args:
+            audio: The audio file returned for the request
+            
+        Returns:
+            dict: The "characters" and "cached_characters" of the request, or None if unknown.
+        """
+        return self.tts_engine.get_synthesis_report(audio)
+    
+    def clear_cache(self):
+        """Remove all cached audio from the synthesis cache."""
+        self.tts_engine.clear_cache()
+    
+    def get_available_services(self):
+        """Get the names of all available TTS services.
+        
+        Returns:
+            list: The service names, in display order
+        """
+        return self.tts_engine.get_available_services()
+    
+    def get_settings_panel_class(self, service):
+        """Get the settings panel class declared by a TTS service.
+        
+        Args:
+            service (str): The service name
+            
+        Returns:
+            type: The settings panel class, or None if the service has no settings
+        """
+        return self.tts_engine.registry.get(service).load_settings_panel()
     
     def get_selected_service(self):
         """Get the currently selected TTS service.
@@ -82,10 +335,24 @@ class Application:
 
 
 def main():
-    """Main entry point of the application."""
+    """Main entry point of the application.
+    
+    Runs the GUI when started without arguments, otherwise the command-line interface.
+    """
     app = Application()
+    if len(sys.argv) > 1:
+        from cli import run_cli
+        
+        try:
+            exit_code = run_cli(app, sys.argv[1:])
+        finally:
+            app.shutdown()
+        sys.exit(exit_code)
     app.run()
 
 
 if __name__ == "__main__":
+    # Lets the frozen executable run the worker processes of the local service
+    # instead of starting the application again in each of them
+    multiprocessing.freeze_support()
     main()
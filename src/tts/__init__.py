@@ -1,3 +1,4 @@
 from .text_to_speech import TextToSpeech
+from .synthesis_executor import SynthesisExecutor
 
-__all__ = ['TextToSpeech']
+__all__ = ['TextToSpeech', 'SynthesisExecutor']
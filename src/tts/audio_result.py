@@ -0,0 +1,149 @@
+import io
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+from .output_store import OutputStore
+
+
+class AudioResult:
+    """Synthesized audio kept in memory and written to disk only when a file is needed.
+    
+    Services write generated audio into an AudioResult instead of a file, and
+    playback reads it straight from memory. The audio is written to its path
+    in the output store ("spilled") only when something needs a file: saving
+    it elsewhere, or a caller using it as a path. Audio larger than
+    max_memory_bytes is spilled as soon as it is written.
+    
+    AudioResult is path-like, so code that expects the path of an audio file
+    keeps working and spills the audio on first use.
+    """
+    
+    def __init__(self, path, max_memory_bytes):
+        """Initialize an empty audio result.
+        
+        Args:
+            path (Path): Where the audio is written when it is spilled to disk.
+            max_memory_bytes (int): Audio larger than this is spilled right away.
+        """
+        self.path = Path(path)
+        self.max_memory_bytes = max_memory_bytes
+        self._data = None
+        self._spilled = False
+        self._lock = threading.Lock()
+    
+    @property
+    def name(self):
+        """The file name of the audio."""
+        return self.path.name
+    
+    @property
+    def suffix(self):
+        """The file extension of the audio, e.g. ".mp3"."""
+        return self.path.suffix
+    
+    @contextmanager
+    def open_writer(self):
+        """Open an in-memory file for the service to write the audio to.
+        
+        The audio becomes available only if writing completes without an error.
+        
+        Yields:
+            io.BytesIO: The buffer to write to.
+        """
+        buffer = io.BytesIO()
+        yield buffer
+        data = buffer.getvalue()
+        with self._lock:
+            if len(data) > self.max_memory_bytes:
+                self._write_file(self.path, data)
+                self._spilled = True
+            else:
+                self._data = data
+    
+    @staticmethod
+    def _write_file(path, data):
+        with OutputStore.atomic_write(path) as f:
+            f.write(data)
+    
+    def is_in_memory(self):
+        """Check if the audio can be read without touching the disk.
+        
+        Returns:
+            bool: True if the audio is held in memory.
+        """
+        return self._data is not None
+    
+    def exists(self):
+        """Check if the audio is available, in memory or on disk.
+        
+        Returns:
+            bool: True if the audio can be read.
+        """
+        return self._data is not None or (self._spilled and self.path.exists())
+    
+    def get_size(self):
+        """Get the size of the audio.
+        
+        Returns:
+            int: The number of bytes of encoded audio.
+        """
+        if self._data is not None:
+            return len(self._data)
+        return self.path.stat().st_size
+    
+    def get_buffer(self):
+        """Get the audio without copying it.
+        
+        Returns:
+            memoryview: The encoded audio, read from disk if it was too large to keep in memory.
+        """
+        if self._data is not None:
+            return memoryview(self._data)
+        return memoryview(self.path.read_bytes())
+    
+    def open(self):
+        """Open the audio for reading.
+        
+        Returns:
+            file: A binary file object, backed by memory while the audio is held there.
+        """
+        if self._data is not None:
+            return io.BytesIO(self._data)
+        return open(self.path, "rb")
+    
+    def spill(self):
+        """Write the audio to its path in the output store, if it is not there yet.
+        
+        The audio stays in memory for playback.
+        
+        Returns:
+            Path: The path of the audio file.
+        """
+        with self._lock:
+            if not self._spilled:
+                if self._data is None:
+                    raise RuntimeError("No audio has been written yet")
+                self._write_file(self.path, self._data)
+                self._spilled = True
+        return self.path
+    
+    def save(self, destination):
+        """Save a copy of the audio to a file, without spilling it to the output store.
+        
+        Args:
+            destination (Path): The file to write.
+        """
+        if self._data is not None:
+            self._write_file(destination, self._data)
+        else:
+            shutil.copyfile(self.path, destination)
+    
+    def __fspath__(self):
+        return os.fspath(self.spill())
+    
+    def __repr__(self):
+        location = "memory" if self._data is not None else "disk"
+        return f"AudioResult({str(self.path)!r}, in {location})"
@@ -0,0 +1,178 @@
+import io
+import shutil
+import wave
+from pathlib import Path
+
+from .output_store import OutputStore
+
+
+class AudioStitcher:
+    """Concatenates audio files of the same format into a single file."""
+    
+    # Layer III bitrates in kbps, indexed by the bitrate bits of the frame header
+    _MPEG1_BITRATES = [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320]
+    _MPEG2_BITRATES = [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160]
+    
+    # Sample rates in Hz, indexed by the version bits and then the sample rate bits
+    _SAMPLE_RATES = {
+        3: [44100, 48000, 32000],  # MPEG 1
+        2: [22050, 24000, 16000],  # MPEG 2
+        0: [11025, 12000, 8000],  # MPEG 2.5
+    }
+    
+    @classmethod
+    def concatenate(cls, input_files, output_file):
+        """Concatenate audio files in order into one output file.
+        
+        WAV files are merged into a single RIFF container, so their parts join
+        without gaps. MP3 files are joined frame by frame without their tags,
+        so the result plays as one file, but each join keeps the encoder delay
+        and padding of the parts, a silence of a few dozen milliseconds.
+        Trimming it would need re-encoding, so segmented synthesis requests
+        WAV where it can (see BaseTTSService.get_gapless_params). Other
+        formats are joined byte by byte.
+        
+        Args:
+            input_files (list): Paths of the audio files, in playback order.
+            output_file (Path): Path of the merged audio file.
+        
+        Returns:
+            Path: The path of the merged audio file.
+        
+        Raises:
+            ValueError: If the WAV files have different audio parameters.
+        """
+        output_file = Path(output_file)
+        suffix = output_file.suffix.lower()
+        
+        with OutputStore.atomic_write(output_file) as out:
+            if suffix == ".wav":
+                cls._concatenate_wav(input_files, out)
+            elif suffix == ".mp3":
+                cls._concatenate_mp3(input_files, out)
+            else:
+                for input_file in input_files:
+                    with open(input_file, "rb") as f:
+                        shutil.copyfileobj(f, out)
+        
+        return output_file
+    
+    @staticmethod
+    def _concatenate_wav(input_files, output):
+        """Merge the PCM frames of WAV files into one WAV file."""
+        params = None
+        with wave.open(output, "wb") as out:
+            for input_file in input_files:
+                with wave.open(str(input_file), "rb") as f:
+                    file_params = (f.getnchannels(), f.getsampwidth(), f.getframerate())
+                    if params is None:
+                        params = file_params
+                        out.setnchannels(params[0])
+                        out.setsampwidth(params[1])
+                        out.setframerate(params[2])
+                    elif file_params != params:
+                        raise ValueError(f"Cannot join WAV files with different formats: {params} and {file_params}")
+                    out.writeframes(f.readframes(f.getnframes()))
+    
+    @classmethod
+    def _concatenate_mp3(cls, input_files, output):
+        """Join the MPEG audio frames of MP3 files into one MP3 file.
+        
+        The encoder delay and padding recorded in the LAME header of each part
+        can't be trimmed without decoding, so they remain as short silences.
+        """
+        for input_file in input_files:
+            data = Path(input_file).read_bytes()
+            output.write(cls._strip_mp3_metadata(data))
+    
+    @classmethod
+    def _strip_mp3_metadata(cls, data):
+        """Remove ID3 tags and the Xing/Info header frame from MP3 data.
+        
+        The Xing/Info frame stores the frame count of the original file, which
+        would make players stop or seek incorrectly in the merged file.
+        """
+        if data[:3] == b"ID3" and len(data) >= 10:
+            # The tag size is stored as a 28-bit synchsafe integer
+            size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+            footer = 10 if data[5] & 0x10 else 0
+            data = data[10 + size + footer:]
+        
+        if len(data) >= 128 and data[-128:-125] == b"TAG":
+            data = data[:-128]
+        
+        frame_length = cls._get_frame_length(data)
+        if frame_length and (b"Xing" in data[:frame_length] or b"Info" in data[:frame_length]):
+            data = data[frame_length:]
+        
+        return data
+    
+    @classmethod
+    def get_duration(cls, data, suffix):
+        """Get the playing time of encoded audio.
+        
+        WAV durations come from the header and MP3 durations from counting
+        the MPEG audio frames.
+        
+        Args:
+            data (bytes): The encoded audio.
+            suffix (str): The file extension of the audio, e.g. ".mp3".
+        
+        Returns:
+            float: The duration in seconds, or None if the format is not supported
+                   or no MPEG audio frame was found.
+        """
+        suffix = suffix.lower()
+        if suffix == ".wav":
+            with wave.open(io.BytesIO(data), "rb") as f:
+                return f.getnframes() / f.getframerate()
+        if suffix != ".mp3":
+            return None
+        
+        data = cls._strip_mp3_metadata(bytes(data))
+        position = 0
+        duration = None
+        while True:
+            frame = cls._get_frame_info(data[position:position + 4])
+            if frame is None:
+                break
+            length, sample_rate, samples = frame
+            duration = (duration or 0.0) + samples / sample_rate
+            position += length
+        return duration
+    
+    @classmethod
+    def _get_frame_length(cls, data):
+        """Get the length of the MPEG Layer III frame at the start of data.
+        
+        Returns:
+            int: The frame length in bytes, or 0 if data does not start with a valid frame.
+        """
+        frame = cls._get_frame_info(data)
+        return frame[0] if frame is not None else 0
+    
+    @classmethod
+    def _get_frame_info(cls, data):
+        """Parse the header of the MPEG Layer III frame at the start of data.
+        
+        Returns:
+            tuple: (length in bytes, sample rate, samples per frame), or None
+                   if data does not start with a valid frame.
+        """
+        if len(data) < 4 or data[0] != 0xFF or data[1] & 0xE0 != 0xE0:
+            return None
+        
+        version = (data[1] >> 3) & 0x03
+        layer = (data[1] >> 1) & 0x03
+        bitrate_index = data[2] >> 4
+        sample_rate_index = (data[2] >> 2) & 0x03
+        padding = (data[2] >> 1) & 0x01
+        
+        # Only Layer III frames with a valid bitrate and sample rate are handled
+        if layer != 1 or version not in cls._SAMPLE_RATES or bitrate_index in (0, 15) or sample_rate_index == 3:
+            return None
+        
+        sample_rate = cls._SAMPLE_RATES[version][sample_rate_index]
+        if version == 3:
+            return 144 * cls._MPEG1_BITRATES[bitrate_index] * 1000 // sample_rate + padding, sample_rate, 1152
+        return 72 * cls._MPEG2_BITRATES[bitrate_index] * 1000 // sample_rate + padding, sample_rate, 576
@@ -0,0 +1,93 @@
+import threading
+import time
+
+
+class BackgroundRefresher:
+    """Runs the refreshes of cached per-account data on background threads.
+    
+    Only one refresh per key runs at a time; requests made while one is
+    running wait for its result instead of starting another. A failed
+    refresh is remembered, and refreshes that aren't forced are skipped for
+    retry_seconds after it. Code that refreshes stale data whenever it is
+    read, such as the UI on every tab switch, then doesn't call a failing
+    service again and again.
+    """
+    
+    def __init__(self, retry_seconds=60.0):
+        """Initialize the refresher.
+        
+        Args:
+            retry_seconds (float): How long to wait after a failed refresh
+                                   before refreshing again unless forced.
+        """
+        self.retry_seconds = retry_seconds
+        self._lock = threading.Lock()
+        # Callbacks waiting for the refresh in progress, keyed by key
+        self._refreshing = {}
+        # (time, error) of the last failed refresh, keyed by key
+        self._failures = {}
+    
+    def get_failure(self, key):
+        """Get the error of a recent failed refresh.
+        
+        Args:
+            key: The key of the refreshed data.
+        
+        Returns:
+            Exception: The error, or None if the last refresh succeeded or
+                       failed more than retry_seconds ago.
+        """
+        with self._lock:
+            failure = self._failures.get(key)
+        if failure is None or time.monotonic() - failure[0] >= self.retry_seconds:
+            return None
+        return failure[1]
+    
+    def run(self, key, refresh, callback=None, force=True):
+        """Call refresh on a background thread.
+        
+        Args:
+            key: The key of the refreshed data.
+            refresh (callable): Fetches and stores the data, returning it.
+            callback (callable, optional): Called on the background thread with
+                                           (result, error) once the refresh ends.
+                                           If the refresh is skipped after a
+                                           recent failure, it is called right
+                                           away with (None, that error).
+            force (bool): Refresh even if the last refresh failed recently.
+        
+        Returns:
+            bool: True if a refresh was started, False if one was already
+                  running or it was skipped after a recent failure.
+        """
+        error = None if force else self.get_failure(key)
+        if error is not None:
+            if callback is not None:
+                callback(None, error)
+            return False
+        
+        with self._lock:
+            callbacks = self._refreshing.get(key)
+            if callbacks is not None:
+                if callback is not None:
+                    callbacks.append(callback)
+                return False
+            self._refreshing[key] = [callback] if callback is not None else []
+        
+        def run():
+            result, error = None, None
+            try:
+                result = refresh()
+            except Exception as e:
+                error = e
+            with self._lock:
+                callbacks = self._refreshing.pop(key)
+                if error is None:
+                    self._failures.pop(key, None)
+                else:
+                    self._failures[key] = (time.monotonic(), error)
+            for waiting_callback in callbacks:
+                waiting_callback(result, error)
+        
+        threading.Thread(target=run, daemon=True).start()
+        return True
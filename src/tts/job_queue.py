@@ -0,0 +1,337 @@
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+
+class JobQueue:
+    """Persistent queue of synthesis jobs, stored in an SQLite database.
+    
+    Jobs move from pending to running to done or failed. A long job is split
+    into segments when it first runs, and every segment is marked done as soon
+    as its audio is saved, so a job interrupted by a crash or restart resumes
+    after its last finished segment instead of paying for the text again.
+    
+    A running job holds a lease that its worker renews while it works on it.
+    Jobs whose lease has expired, e.g. because the process running them died,
+    are claimed again by the next worker. Several processes (the UI and the
+    command line) can share one queue.
+    """
+    
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            service TEXT NOT NULL,
+            text TEXT NOT NULL,
+            params TEXT NOT NULL,
+            output_file TEXT NOT NULL,
+            status TEXT NOT NULL,
+            error TEXT,
+            lease_expires REAL,
+            created_at REAL NOT NULL,
+            updated_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS jobs_by_status ON jobs (status, service, id);
+        CREATE TABLE IF NOT EXISTS segments (
+            job_id INTEGER NOT NULL REFERENCES jobs (id) ON DELETE CASCADE,
+            position INTEGER NOT NULL,
+            text TEXT NOT NULL,
+            done INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (job_id, position)
+        );
+    """
+    
+    def __init__(self, db_path):
+        """Initialize the job queue, creating the database if needed.
+        
+        Args:
+            db_path (Path): The SQLite database file.
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._connection.row_factory = sqlite3.Row
+        with self._lock:
+            # WAL lets a process read the queue while another one writes to it
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA foreign_keys=ON")
+            self._connection.executescript(self._SCHEMA)
+    
+    @contextmanager
+    def _transaction(self):
+        """Run statements in one write transaction, committed if no error is raised."""
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._connection
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+    
+    @staticmethod
+    def _to_job(row):
+        """Convert a jobs row to a job dictionary."""
+        if row is None:
+            return None
+        job = dict(row)
+        job["params"] = json.loads(job["params"])
+        return job
+    
+    def enqueue(self, service, text, params, output_file):
+        """Add a job to the queue.
+        
+        A pending or running job for the same output file is not added twice,
+        so enqueueing a batch again after an interruption doesn't duplicate it.
+        
+        Args:
+            service (str): The service that synthesizes the job.
+            text (str): The text to convert to speech.
+            params (dict): The synthesis parameters, without credentials.
+            output_file (Path): Where to save the audio.
+        
+        Returns:
+            int: The id of the job.
+        """
+        output_file = str(Path(output_file).resolve())
+        now = time.time()
+        with self._transaction() as db:
+            row = db.execute(
+                "SELECT id FROM jobs WHERE output_file = ? AND status IN (?, ?)",
+                (output_file, self.PENDING, self.RUNNING),
+            ).fetchone()
+            if row is not None:
+                return row["id"]
+            cursor = db.execute(
+                "INSERT INTO jobs (service, text, params, output_file, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (service, text, json.dumps(params), output_file, self.PENDING, now, now),
+            )
+            return cursor.lastrowid
+    
+    def claim(self, service, lease_seconds):
+        """Take the oldest job of a service that is waiting to run.
+        
+        Args:
+            service (str): Only jobs of this service are claimed.
+            lease_seconds (float): How long the job stays claimed without a renewal.
+        
+        Returns:
+            dict: The claimed job, or None if there is nothing to run.
+        """
+        now = time.time()
+        with self._transaction() as db:
+            row = db.execute(
+                "SELECT * FROM jobs WHERE service = ? AND "
+                "(status = ? OR (status = ? AND lease_expires < ?)) ORDER BY id LIMIT 1",
+                (service, self.PENDING, self.RUNNING, now),
+            ).fetchone()
+            if row is None:
+                return None
+            db.execute(
+                "UPDATE jobs SET status = ?, error = NULL, lease_expires = ?, updated_at = ? WHERE id = ?",
+                (self.RUNNING, now + lease_seconds, now, row["id"]),
+            )
+        return self._to_job(row)
+    
+    def renew_lease(self, job_ids, lease_seconds):
+        """Extend the lease of running jobs.
+        
+        Args:
+            job_ids (iterable): The ids of the jobs.
+            lease_seconds (float): The new lease duration, from now.
+        """
+        expires = time.time() + lease_seconds
+        with self._transaction() as db:
+            db.executemany(
+                "UPDATE jobs SET lease_expires = ? WHERE id = ? AND status = ?",
+                [(expires, job_id, self.RUNNING) for job_id in job_ids],
+            )
+    
+    def release(self, job_id):
+        """Return a running job to the queue, e.g. when its worker shuts down.
+        
+        Args:
+            job_id (int): The id of the job.
+        """
+        self._set_status(job_id, self.PENDING, from_statuses=(self.RUNNING,))
+    
+    def complete(self, job_id):
+        """Mark a job as done.
+        
+        Args:
+            job_id (int): The id of the job.
+        """
+        self._set_status(job_id, self.DONE, from_statuses=(self.RUNNING,))
+    
+    def fail(self, job_id, error):
+        """Mark a job as failed.
+        
+        Args:
+            job_id (int): The id of the job.
+            error (str): The reason it failed.
+        """
+        self._set_status(job_id, self.FAILED, error, from_statuses=(self.PENDING, self.RUNNING))
+    
+    def _set_status(self, job_id, status, error=None, from_statuses=None):
+        """Change the status of a job if it is in one of from_statuses.
+        
+        Returns:
+            bool: True if the job was changed.
+        """
+        with self._transaction() as db:
+            cursor = db.execute(
+                f"UPDATE jobs SET status = ?, error = ?, lease_expires = NULL, updated_at = ? "
+                f"WHERE id = ? AND status IN ({', '.join('?' * len(from_statuses))})",
+                (status, error, time.time(), job_id, *from_statuses),
+            )
+            return cursor.rowcount > 0
+    
+    def cancel(self, job_id):
+        """Cancel a job that has not finished yet.
+        
+        Args:
+            job_id (int): The id of the job.
+        
+        Returns:
+            bool: True if the job was cancelled.
+        """
+        return self._set_status(job_id, self.FAILED, "Cancelled", from_statuses=(self.PENDING, self.RUNNING))
+    
+    def retry_failed(self):
+        """Queue all failed jobs again. Their finished segments are kept.
+        
+        Returns:
+            int: The number of jobs queued again.
+        """
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE jobs SET status = ?, error = NULL, updated_at = ? WHERE status = ?",
+                (self.PENDING, time.time(), self.FAILED),
+            )
+            return cursor.rowcount
+    
+    def clear(self, statuses=(DONE, FAILED)):
+        """Delete finished jobs.
+        
+        Args:
+            statuses (tuple): The statuses of the jobs to delete.
+        
+        Returns:
+            list: The ids of the deleted jobs.
+        """
+        placeholders = ", ".join("?" * len(statuses))
+        with self._transaction() as db:
+            job_ids = [
+                row["id"] for row in db.execute(f"SELECT id FROM jobs WHERE status IN ({placeholders})", statuses)
+            ]
+            db.execute(f"DELETE FROM jobs WHERE status IN ({placeholders})", statuses)
+        return job_ids
+    
+    def get(self, job_id):
+        """Get a job.
+        
+        Args:
+            job_id (int): The id of the job.
+        
+        Returns:
+            dict: The job, or None if it doesn't exist.
+        """
+        with self._lock:
+            row = self._connection.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_job(row)
+    
+    def list(self, status=None, limit=None):
+        """List jobs, oldest first.
+        
+        Args:
+            status (str, optional): Only list jobs with this status.
+            limit (int, optional): Maximum number of jobs to return.
+        
+        Returns:
+            list: The jobs, each with the number of segments and finished segments.
+        """
+        query = (
+            "SELECT jobs.*, COUNT(segments.position) AS segment_count, "
+            "COALESCE(SUM(segments.done), 0) AS segments_done "
+            "FROM jobs LEFT JOIN segments ON segments.job_id = jobs.id"
+        )
+        args = []
+        if status is not None:
+            query += " WHERE jobs.status = ?"
+            args.append(status)
+        query += " GROUP BY jobs.id ORDER BY jobs.id"
+        if limit is not None:
+            query += " LIMIT ?"
+            args.append(limit)
+        with self._lock:
+            rows = self._connection.execute(query, args).fetchall()
+        return [self._to_job(row) for row in rows]
+    
+    def get_counts(self):
+        """Count jobs by status.
+        
+        Returns:
+            dict: The number of jobs for each status.
+        """
+        with self._lock:
+            rows = self._connection.execute("SELECT status, COUNT(*) AS count FROM jobs GROUP BY status").fetchall()
+        counts = dict.fromkeys((self.PENDING, self.RUNNING, self.DONE, self.FAILED), 0)
+        counts.update({row["status"]: row["count"] for row in rows})
+        return counts
+    
+    def get_segments(self, job_id):
+        """Get the segments of a job.
+        
+        Args:
+            job_id (int): The id of the job.
+        
+        Returns:
+            list: (position, text, done) tuples in order, empty if the job hasn't been split yet.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT position, text, done FROM segments WHERE job_id = ? ORDER BY position", (job_id,)
+            ).fetchall()
+        return [(row["position"], row["text"], bool(row["done"])) for row in rows]
+    
+    def set_segments(self, job_id, segments):
+        """Store how a job is split, unless it already has segments.
+        
+        Args:
+            job_id (int): The id of the job.
+            segments (list): The segment texts in order.
+        
+        Returns:
+            list: The job's segments, see get_segments.
+        """
+        with self._transaction() as db:
+            if db.execute("SELECT 1 FROM segments WHERE job_id = ? LIMIT 1", (job_id,)).fetchone() is None:
+                db.executemany(
+                    "INSERT INTO segments (job_id, position, text) VALUES (?, ?, ?)",
+                    [(job_id, position, text) for position, text in enumerate(segments)],
+                )
+        return self.get_segments(job_id)
+    
+    def complete_segment(self, job_id, position):
+        """Mark a segment as synthesized.
+        
+        Args:
+            job_id (int): The id of the job.
+            position (int): The position of the segment in the job.
+        """
+        with self._transaction() as db:
+            db.execute("UPDATE segments SET done = 1 WHERE job_id = ? AND position = ?", (job_id, position))
+    
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,282 @@
+import asyncio
+import shutil
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+
+from .audio_stitcher import AudioStitcher
+
+
+class JobWorkerPool:
+    """Drains a JobQueue with the TTS engine on a background event loop.
+    
+    Workers claim jobs of the currently selected service, one job per worker
+    at a time. The segments of a job are synthesized concurrently into a work
+    directory that outlives the process, so a resumed job only synthesizes
+    the segments that were not finished before it was interrupted.
+    """
+    
+    def __init__(self, tts_engine, job_queue, work_dir, concurrency=2, poll_interval=2.0, lease_seconds=15.0):
+        """Initialize the worker pool.
+        
+        Args:
+            tts_engine (TextToSpeech): The engine that synthesizes the segments.
+            job_queue (JobQueue): The queue to drain.
+            work_dir (Path): Directory for the segment files of running jobs.
+            concurrency (int): Number of jobs worked on at once.
+            poll_interval (float): Seconds between checks for jobs added by other processes.
+            lease_seconds (float): How long a claimed job stays reserved without a renewal.
+        """
+        self.tts_engine = tts_engine
+        self.job_queue = job_queue
+        self.work_dir = Path(work_dir)
+        self.concurrency = max(1, concurrency)
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self._lock = threading.Lock()
+        self._thread = None
+        self._loop = None
+        self._wake = None
+        self._stop_event = None
+        self._stopping = False
+        # Futures of callers waiting for a job, keyed by job id
+        self._futures = {}
+        # Tasks of the jobs being worked on, keyed by job id
+        self._tasks = {}
+    
+    def start(self):
+        """Start the workers on a background thread, if they aren't running yet."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stopping = False
+            self._loop = asyncio.new_event_loop()
+            self._wake = asyncio.Event()
+            self._stop_event = asyncio.Event()
+            self._thread = threading.Thread(target=self._loop.run_until_complete, args=(self._run(),), daemon=True)
+            self._thread.start()
+    
+    def stop(self):
+        """Stop the workers. Jobs they were working on go back to the queue."""
+        with self._lock:
+            thread, loop = self._thread, self._loop
+            self._thread = None
+        if thread is None:
+            return
+        self._stopping = True
+        loop.call_soon_threadsafe(self._stop_event.set)
+        thread.join()
+        # Also stops the threads of asyncio.to_thread calls
+        loop.run_until_complete(loop.shutdown_default_executor())
+        loop.close()
+    
+    def notify(self):
+        """Wake idle workers, e.g. after a job was added."""
+        with self._lock:
+            loop = self._loop if self._thread is not None else None
+        if loop is not None:
+            try:
+                loop.call_soon_threadsafe(self._wake.set)
+            except RuntimeError:
+                # The loop has just been closed by stop()
+                pass
+    
+    def get_job_dir(self, job_id):
+        """Get the directory holding the segment files of a job.
+        
+        Args:
+            job_id (int): The id of the job.
+        
+        Returns:
+            Path: The job's work directory.
+        """
+        return self.work_dir / str(job_id)
+    
+    def remove_job_files(self, job_ids):
+        """Delete the segment files of jobs.
+        
+        Args:
+            job_ids (iterable): The ids of the jobs.
+        """
+        for job_id in job_ids:
+            shutil.rmtree(self.get_job_dir(job_id), ignore_errors=True)
+    
+    def wait_for(self, job_id):
+        """Get a future resolved when a job finishes in this process.
+        
+        Args:
+            job_id (int): The id of the job.
+        
+        Returns:
+            Future: Resolved with the path of the audio file, or with the error
+                    of the job. Cancelling the future cancels the job.
+        """
+        future = Future()
+        future.add_done_callback(lambda f: f.cancelled() and self.cancel(job_id))
+        with self._lock:
+            self._futures.setdefault(job_id, []).append(future)
+        
+        # The job may have finished before the future was registered
+        if not self._resolve_if_finished(job_id):
+            self.notify()
+        return future
+    
+    def _resolve_if_finished(self, job_id):
+        """Resolve the futures waiting for a job if it has finished, in any process.
+        
+        Returns:
+            bool: True if the job has finished.
+        """
+        job = self.job_queue.get(job_id)
+        if job is None:
+            self._resolve(job_id, error=ValueError(f"No job with id {job_id}"))
+        elif job["status"] == self.job_queue.DONE:
+            self._resolve(job_id, result=Path(job["output_file"]))
+        elif job["status"] == self.job_queue.FAILED:
+            self._resolve(job_id, error=RuntimeError(job["error"]))
+        else:
+            return False
+        return True
+    
+    def cancel(self, job_id):
+        """Cancel a job, stopping it if a worker of this pool is running it.
+        
+        Args:
+            job_id (int): The id of the job.
+        """
+        self.job_queue.cancel(job_id)
+        with self._lock:
+            task = self._tasks.get(job_id)
+            loop = self._loop
+        if task is not None:
+            loop.call_soon_threadsafe(task.cancel)
+    
+    def _resolve(self, job_id, result=None, error=None):
+        """Resolve the futures waiting for a job."""
+        with self._lock:
+            futures = self._futures.pop(job_id, [])
+        for future in futures:
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+    
+    async def _run(self):
+        """Run the workers and the lease renewal until the pool is stopped."""
+        workers = [asyncio.create_task(self._work()) for _ in range(self.concurrency)]
+        heartbeat = asyncio.create_task(self._renew_leases())
+        await self._stop_event.wait()
+        for task in (*workers, heartbeat):
+            task.cancel()
+        await asyncio.gather(*workers, heartbeat, return_exceptions=True)
+    
+    async def _work(self):
+        """Claim and run jobs one after another."""
+        while True:
+            self._wake.clear()
+            job = self.job_queue.claim(self.tts_engine.config_manager.get_selected_service(), self.lease_seconds)
+            if job is None:
+                # Jobs added by other processes are only seen by polling
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                # Jobs waited for here may have been run by another process
+                with self._lock:
+                    waiting = [job_id for job_id in self._futures if job_id not in self._tasks]
+                for job_id in waiting:
+                    self._resolve_if_finished(job_id)
+                continue
+            await self._run_job(job)
+    
+    async def _run_job(self, job):
+        """Run a claimed job and record its outcome."""
+        job_id = job["id"]
+        task = asyncio.ensure_future(self._synthesize_job(job))
+        with self._lock:
+            self._tasks[job_id] = task
+        try:
+            output_file = await task
+        except asyncio.CancelledError:
+            if self._stopping:
+                self.job_queue.release(job_id)
+                raise
+            # Cancelled through cancel(), which has already marked the job failed.
+            # Its finished segments are in the synthesis cache, if it is enabled.
+            self.remove_job_files([job_id])
+            self._resolve(job_id, error=RuntimeError("Cancelled"))
+        except Exception as e:
+            self.job_queue.fail(job_id, str(e))
+            self._resolve(job_id, error=e)
+        else:
+            self.job_queue.complete(job_id)
+            self.remove_job_files([job_id])
+            self._resolve(job_id, result=output_file)
+        finally:
+            with self._lock:
+                self._tasks.pop(job_id, None)
+    
+    async def _renew_leases(self):
+        """Keep the leases of running jobs from expiring."""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            with self._lock:
+                job_ids = list(self._tasks)
+            if job_ids:
+                self.job_queue.renew_lease(job_ids, self.lease_seconds)
+    
+    async def _synthesize_job(self, job):
+        """Synthesize the segments of a job that are not done yet and stitch them.
+        
+        Returns:
+            Path: The path of the audio file.
+        """
+        job_id = job["id"]
+        tts_engine = self.tts_engine
+        params = job["params"]
+        output_file = Path(job["output_file"])
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        
+        # A repeated text is served from the synthesis cache as a whole
+        tts_params = tts_engine.get_tts_params(params)
+        if tts_engine.get_cached_audio(job["text"], tts_params, output_file) is not None:
+            return output_file
+        
+        # The service renders very large texts in one batch operation of its own
+        if tts_engine.uses_batch(job["text"], params):
+            return await tts_engine.synthesize_speech_async(job["text"], output_file, params)
+        
+        segments = self.job_queue.get_segments(job_id)
+        if not segments:
+            segments = self.job_queue.set_segments(job_id, tts_engine.split_text(job["text"], params))
+        if len(segments) == 1:
+            return await tts_engine.synthesize_speech_async(job["text"], output_file, params)
+        
+        job_dir = self.get_job_dir(job_id)
+        job_dir.mkdir(parents=True, exist_ok=True)
+        segment_files = [job_dir / f"{position:05d}{output_file.suffix}" for position, _, _ in segments]
+        semaphore = asyncio.Semaphore(tts_engine.config_manager.get_segmentation_config()["max_workers"])
+        
+        async def synthesize_segment(position, text):
+            async with semaphore:
+                await tts_engine.synthesize_speech_async(text, segment_files[position], params)
+            self.job_queue.complete_segment(job_id, position)
+        
+        # Segments finished before an interruption are not synthesized again
+        tasks = [
+            asyncio.ensure_future(synthesize_segment(position, text))
+            for position, text, done in segments
+            if not done or not segment_files[position].exists()
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        
+        await asyncio.to_thread(AudioStitcher.concatenate, segment_files, output_file)
+        tts_engine.cache_audio(job["text"], tts_params, output_file)
+        return output_file
@@ -0,0 +1,372 @@
+import bisect
+import json
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+
+class _NoSpan:
+    """The span handed out while metrics are disabled; it records nothing."""
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+class _Span:
+    """Times the block it wraps and records it as one observation of a stage."""
+    
+    def __init__(self, metrics, stage, labels):
+        self.metrics = metrics
+        self.stage = stage
+        self.labels = labels
+        self.start = None
+    
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.metrics.observe(self.stage, time.perf_counter() - self.start, error=exc_type is not None, **self.labels)
+        return False
+
+
+class _TimedFile:
+    """Wraps an output file to add up the time spent writing to it."""
+    
+    def __init__(self, file):
+        self.file = file
+        self.seconds = 0.0
+    
+    def write(self, data):
+        start = time.perf_counter()
+        written = self.file.write(data)
+        self.seconds += time.perf_counter() - start
+        return written
+    
+    def __getattr__(self, name):
+        return getattr(self.file, name)
+
+
+class Metrics:
+    """Per-stage latency histograms and per-service counters.
+    
+    Code is instrumented with spans around each stage of a request (loading
+    the configuration, creating a client, waiting for the first byte,
+    downloading the audio, writing files, loading the mixer) and with
+    counters of requests, characters, bytes and errors per service.
+    
+    Recorded values can be scraped as Prometheus text from a local HTTP
+    endpoint, and each observation can be appended to a JSON lines log.
+    Metrics are disabled by default: span returns a shared object that does
+    nothing and the other methods return right away, so instrumented code
+    pays for one attribute check.
+    """
+    
+    # Upper bounds of the latency histogram buckets, in seconds
+    BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+    
+    # Descriptions of the counters, exported as saythis_<name>_total
+    COUNTERS = {
+        "requests": "Provider requests sent, including retries.",
+        "errors": "Provider requests that failed.",
+        "characters": "Characters sent to the provider for synthesis.",
+        "bytes": "Bytes of audio received from the provider.",
+    }
+    
+    def __init__(self):
+        """Initialize disabled metrics."""
+        self.enabled = False
+        self._lock = threading.Lock()
+        # Bucket counts, count and sum of each stage, keyed by (stage, labels)
+        self._histograms = {}
+        # Counter values keyed by (name, labels)
+        self._counters = {}
+        self._log_file = None
+        self._server = None
+    
+    def configure(self, enabled, prometheus_port=None, json_log_path=None):
+        """Turn metrics on or off and start the configured exporters.
+        
+        Args:
+            enabled (bool): Whether spans and counters are recorded.
+            prometheus_port (int, optional): Serve Prometheus text on this port of 127.0.0.1.
+            json_log_path (Path, optional): Append each observation to this JSON lines file.
+        """
+        self.close()
+        if not enabled:
+            return
+        if json_log_path:
+            self._log_file = open(Path(json_log_path).expanduser(), "a", encoding="utf-8", buffering=1)
+        if prometheus_port:
+            try:
+                self._server = ThreadingHTTPServer(("127.0.0.1", prometheus_port), self._get_handler_class())
+            except OSError as e:
+                print(f"Warning: Could not start the metrics endpoint on port {prometheus_port} ({e}).")
+            else:
+                self._server.daemon_threads = True
+                threading.Thread(target=self._server.serve_forever, name="metrics-endpoint", daemon=True).start()
+        self.enabled = True
+    
+    def close(self):
+        """Stop recording, stop the Prometheus endpoint and close the JSON log."""
+        self.enabled = False
+        server, self._server = self._server, None
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+        with self._lock:
+            log_file, self._log_file = self._log_file, None
+        if log_file is not None:
+            log_file.close()
+    
+    def reset(self):
+        """Forget all recorded values."""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+    
+    @property
+    def endpoint(self):
+        """The URL of the Prometheus endpoint, or None if it is not running."""
+        if self._server is None:
+            return None
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+    
+    def span(self, stage, **labels):
+        """Time a block of code as one observation of a stage.
+        
+        Args:
+            stage (str): The stage name, e.g. "network.first_byte".
+            **labels: Labels of the observation, e.g. service="ElevenLabs".
+        
+        Returns:
+            A context manager timing the block.
+        """
+        if not self.enabled:
+            return _NO_SPAN
+        return _Span(self, stage, labels)
+    
+    def observe(self, stage, seconds, error=False, **labels):
+        """Record the duration of a stage.
+        
+        Args:
+            stage (str): The stage name.
+            seconds (float): How long the stage took.
+            error (bool): Whether the stage ended with an error; only written to the JSON log.
+            **labels: Labels of the observation.
+        """
+        if not self.enabled:
+            return
+        key = (stage, tuple(sorted(labels.items())))
+        bucket = bisect.bisect_left(self.BUCKETS, seconds)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = {"buckets": [0] * len(self.BUCKETS), "count": 0, "sum": 0.0}
+            if bucket < len(self.BUCKETS):
+                histogram["buckets"][bucket] += 1
+            histogram["count"] += 1
+            histogram["sum"] += seconds
+            self._log({"stage": stage, "seconds": round(seconds, 6), "error": error, **labels})
+    
+    def count(self, name, value=1, **labels):
+        """Add to a counter.
+        
+        Args:
+            name (str): The counter name, e.g. "requests".
+            value (int): The amount to add.
+            **labels: Labels of the counter, e.g. service="ElevenLabs".
+        """
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+            self._log({"counter": name, "value": value, **labels})
+    
+    def _log(self, record):
+        """Append a record to the JSON log. Must be called with the lock held."""
+        if self._log_file is not None:
+            self._log_file.write(json.dumps({"time": round(time.time(), 3), **record}) + "\n")
+    
+    def trace_stream(self, chunks, **labels):
+        """Time the first byte and the download of a streamed response.
+        
+        The response is expected to be requested when the first chunk is
+        read, as with the lazy streams returned by HTTP clients.
+        
+        Args:
+            chunks (iterable): The chunks of the response.
+            **labels: Labels of the observations.
+        
+        Returns:
+            iterable: The same chunks.
+        """
+        if not self.enabled:
+            return chunks
+        return self._trace_stream(chunks, labels)
+    
+    def _trace_stream(self, chunks, labels):
+        start = time.perf_counter()
+        first_chunk_at = None
+        for chunk in chunks:
+            if first_chunk_at is None:
+                first_chunk_at = time.perf_counter()
+                self.observe("network.first_byte", first_chunk_at - start, **labels)
+            yield chunk
+        if first_chunk_at is not None:
+            self.observe("network.download", time.perf_counter() - first_chunk_at, **labels)
+    
+    def trace_stream_async(self, chunks, **labels):
+        """Time the first byte and the download of a streamed async response.
+        
+        Args:
+            chunks (async iterable): The chunks of the response.
+            **labels: Labels of the observations.
+        
+        Returns:
+            async iterable: The same chunks.
+        """
+        if not self.enabled:
+            return chunks
+        return self._trace_stream_async(chunks, labels)
+    
+    async def _trace_stream_async(self, chunks, labels):
+        start = time.perf_counter()
+        first_chunk_at = None
+        async for chunk in chunks:
+            if first_chunk_at is None:
+                first_chunk_at = time.perf_counter()
+                self.observe("network.first_byte", first_chunk_at - start, **labels)
+            yield chunk
+        if first_chunk_at is not None:
+            self.observe("network.download", time.perf_counter() - first_chunk_at, **labels)
+    
+    def trace_writes(self, writer):
+        """Time the writes to an output file.
+        
+        The "file.write" stage adds up the time spent in write calls and
+        in closing the file, not the time spent waiting for data between
+        writes.
+        
+        Args:
+            writer: A context manager yielding a binary file.
+        
+        Returns:
+            A context manager yielding the file.
+        """
+        if not self.enabled:
+            return writer
+        return self._trace_writes(writer)
+    
+    @contextmanager
+    def _trace_writes(self, writer):
+        with writer as file:
+            timed_file = _TimedFile(file)
+            yield timed_file
+            closing_at = time.perf_counter()
+        self.observe("file.write", timed_file.seconds + time.perf_counter() - closing_at)
+    
+    def get_snapshot(self):
+        """Get the recorded values.
+        
+        Returns:
+            dict: "stages" with the count, total and mean seconds of each stage,
+                  and "counters" with each counter value, both as lists of
+                  dictionaries that include the labels.
+        """
+        with self._lock:
+            stages = [
+                {
+                    "stage": stage,
+                    **dict(labels),
+                    "count": histogram["count"],
+                    "total_seconds": histogram["sum"],
+                    "mean_seconds": histogram["sum"] / histogram["count"],
+                }
+                for (stage, labels), histogram in sorted(self._histograms.items())
+            ]
+            counters = [
+                {"counter": name, **dict(labels), "value": value}
+                for (name, labels), value in sorted(self._counters.items())
+            ]
+        return {"stages": stages, "counters": counters}
+    
+    @staticmethod
+    def _format_labels(labels):
+        """Format labels for the Prometheus text format."""
+        if not labels:
+            return ""
+        escaped = (
+            (name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+            for name, value in labels
+        )
+        return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+    
+    def render_prometheus(self):
+        """Render the recorded values in the Prometheus text format.
+        
+        Returns:
+            str: The exposition text.
+        """
+        with self._lock:
+            histograms = {key: {**value, "buckets": list(value["buckets"])} for key, value in self._histograms.items()}
+            counters = dict(self._counters)
+        
+        lines = [
+            "# HELP saythis_stage_seconds Time spent in each stage of a request.",
+            "# TYPE saythis_stage_seconds histogram",
+        ]
+        for (stage, labels), histogram in sorted(histograms.items()):
+            labels = (("stage", stage),) + labels
+            cumulative = 0
+            for bound, bucket_count in zip(self.BUCKETS, histogram["buckets"]):
+                cumulative += bucket_count
+                lines.append(f"saythis_stage_seconds_bucket{self._format_labels(labels + (('le', bound),))} {cumulative}")
+            lines.append(f"saythis_stage_seconds_bucket{self._format_labels(labels + (('le', '+Inf'),))} {histogram['count']}")
+            lines.append(f"saythis_stage_seconds_sum{self._format_labels(labels)} {histogram['sum']}")
+            lines.append(f"saythis_stage_seconds_count{self._format_labels(labels)} {histogram['count']}")
+        
+        names = sorted({name for name, _ in counters} | set(self.COUNTERS))
+        for name in names:
+            lines.append(f"# HELP saythis_{name}_total {self.COUNTERS.get(name, name)}")
+            lines.append(f"# TYPE saythis_{name}_total counter")
+            for (counter, labels), value in sorted(counters.items()):
+                if counter == name:
+                    lines.append(f"saythis_{name}_total{self._format_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+    
+    def _get_handler_class(self):
+        """Get the request handler serving the Prometheus text of these metrics."""
+        metrics = self
+        
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = metrics.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                # Scrapes would otherwise be printed to stderr
+                pass
+        
+        return MetricsHandler
+
+
+# The metrics recorded by the whole application
+metrics = Metrics()
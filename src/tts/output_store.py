@@ -0,0 +1,110 @@
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+
+class OutputStore:
+    """Hands out a unique audio file per request and bounds how many are kept on disk."""
+    
+    def __init__(self, output_dir, max_files, max_age_seconds, max_bytes, max_memory_bytes=0):
+        """Initialize the output store.
+        
+        Args:
+            output_dir (Path): Directory where generated audio files are stored.
+            max_files (int): Maximum number of files to keep.
+            max_age_seconds (float): Files older than this are deleted.
+            max_bytes (int): Maximum total size of the kept files in bytes.
+            max_memory_bytes (int): Largest audio kept in memory instead of on disk.
+        """
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.max_files = max(1, max_files)
+        self.max_age_seconds = max_age_seconds
+        self.max_bytes = max_bytes
+        self.max_memory_bytes = max_memory_bytes
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def from_config(cls, config_manager):
+        """Create an output store from the application configuration.
+        
+        Args:
+            config_manager (ConfigManager): The configuration manager instance.
+        
+        Returns:
+            OutputStore: The output store.
+        """
+        output_config = config_manager.get_output_config()
+        return cls(
+            config_manager.get_data_dir() / "output",
+            max_files=output_config["max_files"],
+            max_age_seconds=output_config["max_age_days"] * 24 * 60 * 60,
+            max_bytes=output_config["max_bytes"],
+            max_memory_bytes=output_config["max_memory_bytes"],
+        )
+    
+    def new_path(self, file_extension):
+        """Get a new, unique path for an audio file, pruning old files first.
+        
+        Args:
+            file_extension (str): The file extension including the dot, e.g. ".mp3".
+        
+        Returns:
+            Path: A path that no other request will use.
+        """
+        self.prune()
+        timestamp = time.strftime("%Y%m%d-%H%M%S")
+        return self.output_dir / f"audio-{timestamp}-{uuid.uuid4().hex[:8]}{file_extension}"
+    
+    @staticmethod
+    @contextmanager
+    def atomic_write(path, mode="wb"):
+        """Open a temporary file that replaces path only if writing succeeds.
+        
+        Readers never see a partially written file, and a failed write leaves
+        any previous file at path untouched.
+        
+        Args:
+            path (Path): The final path of the file.
+            mode (str): The file mode to open the temporary file with.
+        
+        Yields:
+            file: The open temporary file.
+        """
+        path = Path(path)
+        temp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+        try:
+            with open(temp_path, mode) as f:
+                yield f
+            os.replace(temp_path, path)
+        finally:
+            temp_path.unlink(missing_ok=True)
+    
+    def prune(self):
+        """Delete the oldest audio files until the store is within its limits."""
+        with self._lock:
+            files = []
+            for path in self.output_dir.iterdir():
+                if path.name.startswith(".") or not path.is_file():
+                    continue
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+            
+            # Newest first, so everything past the limits is the oldest
+            files.sort(key=lambda entry: entry[0], reverse=True)
+            cutoff = time.time() - self.max_age_seconds
+            total_bytes = 0
+            for index, (mtime, size, path) in enumerate(files):
+                total_bytes += size
+                if index >= self.max_files or mtime < cutoff or (index > 0 and total_bytes > self.max_bytes):
+                    try:
+                        path.unlink()
+                    except OSError:
+                        # The file may still be open for playback; it is retried on the next prune
+                        pass
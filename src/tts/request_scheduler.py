@@ -0,0 +1,516 @@
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+from .audio_result import AudioResult
+from .metrics import metrics
+from .services.base_service import TTSServiceError
+
+
+class ProviderLimiter:
+    """Token bucket rate limit and concurrency cap for the requests to one provider.
+    
+    Works for blocking callers on any thread and for coroutines on any event
+    loop at the same time. Waiting coroutines don't hold a thread.
+    """
+    
+    def __init__(self, requests_per_second=None, burst=1, max_concurrency=None):
+        """Initialize the limiter.
+        
+        Args:
+            requests_per_second (float, optional): Sustained request rate. None means unlimited.
+            burst (int): Number of requests that may start at once after an idle period.
+            max_concurrency (int, optional): Maximum requests in flight. None means unlimited.
+        """
+        self.requests_per_second = requests_per_second
+        self.burst = max(1, burst)
+        self.max_concurrency = max_concurrency
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._last_refill = time.monotonic()
+        self._active = 0
+        self._waiters = deque()
+        
+        # Metrics
+        self._queued = 0
+        self._max_queued = 0
+        self._requests = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._retries = 0
+        self._throttled = 0
+        self._failures = 0
+    
+    def _reserve_token(self):
+        """Take a token from the bucket, going into debt if it is empty.
+        
+        Returns:
+            float: Seconds to wait until the reserved token is available.
+        """
+        if not self.requests_per_second:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.requests_per_second)
+            self._last_refill = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.requests_per_second)
+    
+    def _try_enter(self, waiter):
+        """Take a concurrency slot, or queue the waiter for one.
+        
+        Args:
+            waiter (callable): Called with no arguments when the slot is handed
+                               over; returns False if it can no longer take it.
+        
+        Returns:
+            bool: True if a slot was taken immediately.
+        """
+        with self._lock:
+            if self.max_concurrency is None or (self._active < self.max_concurrency and not self._waiters):
+                self._active += 1
+                return True
+            self._waiters.append(waiter)
+            return False
+    
+    def _release(self):
+        """Free a concurrency slot, handing it to the next waiter if there is one."""
+        with self._lock:
+            while self._waiters:
+                waiter = self._waiters.popleft()
+                if waiter():
+                    return
+            self._active -= 1
+    
+    def _enter_queue(self):
+        with self._lock:
+            self._queued += 1
+            self._max_queued = max(self._max_queued, self._queued)
+    
+    def _leave_queue(self, wait):
+        with self._lock:
+            self._queued -= 1
+            self._requests += 1
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+    
+    def acquire(self):
+        """Wait for a concurrency slot and a rate limit token on the calling thread."""
+        start = time.monotonic()
+        self._enter_queue()
+        try:
+            event = threading.Event()
+            if not self._try_enter(lambda: event.set() or True):
+                event.wait()
+            time.sleep(self._reserve_token())
+        finally:
+            self._leave_queue(time.monotonic() - start)
+    
+    async def acquire_async(self):
+        """Wait for a concurrency slot and a rate limit token without blocking the event loop."""
+        start = time.monotonic()
+        self._enter_queue()
+        try:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            
+            def grant():
+                # Runs on the loop; a waiter cancelled in the meantime gives the slot back
+                if future.cancelled():
+                    self._release()
+                else:
+                    future.set_result(None)
+            
+            def waiter():
+                try:
+                    loop.call_soon_threadsafe(grant)
+                    return True
+                except RuntimeError:
+                    # The event loop is closed
+                    return False
+            
+            if not self._try_enter(waiter):
+                try:
+                    await future
+                except asyncio.CancelledError:
+                    with self._lock:
+                        queued = waiter in self._waiters
+                        if queued:
+                            self._waiters.remove(waiter)
+                    if not queued and future.done() and not future.cancelled():
+                        self._release()
+                    raise
+            
+            try:
+                await asyncio.sleep(self._reserve_token())
+            except asyncio.CancelledError:
+                self._release()
+                raise
+        finally:
+            self._leave_queue(time.monotonic() - start)
+    
+    def release(self):
+        """Free the concurrency slot taken by acquire or acquire_async."""
+        self._release()
+    
+    def record_retry(self, error):
+        """Count a retried request.
+        
+        Args:
+            error (TTSServiceError): The error that caused the retry.
+        """
+        with self._lock:
+            self._retries += 1
+            if error.status_code == 429:
+                self._throttled += 1
+    
+    def record_failure(self):
+        """Count a request that failed after all retries."""
+        with self._lock:
+            self._failures += 1
+    
+    def get_stats(self):
+        """Get the queue depth and wait-time metrics.
+        
+        Returns:
+            dict: Current and peak queue depth, requests in flight, request,
+                  retry, throttle and failure counts, and average and maximum
+                  wait times in seconds.
+        """
+        with self._lock:
+            return {
+                "queue_depth": self._queued,
+                "max_queue_depth": self._max_queued,
+                "in_flight": self._active,
+                "requests": self._requests,
+                "retries": self._retries,
+                "throttled": self._throttled,
+                "failures": self._failures,
+                "average_wait": self._total_wait / self._requests if self._requests else 0.0,
+                "max_wait": self._max_wait,
+            }
+
+
+class RequestScheduler:
+    """Schedules provider requests under per-provider limits, retrying transient errors.
+    
+    Retries use exponential backoff with full jitter. A Retry-After delay sent
+    by the provider is used as the minimum delay.
+    """
+    
+    def __init__(self, limits, max_retries=4, base_delay=0.5, max_delay=30.0):
+        """Initialize the scheduler.
+        
+        Args:
+            limits (callable): Returns the limits of a provider, given its name, as a
+                               dict with requests_per_second, burst and max_concurrency.
+            max_retries (int): Retries of a failed request before giving up.
+            base_delay (float): Backoff delay of the first retry in seconds.
+            max_delay (float): Upper bound of the backoff delay in seconds.
+        """
+        self._get_limits = limits
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._limiters = {}
+        self._lock = threading.Lock()
+    
+    def get_limiter(self, provider):
+        """Get the limiter of a provider, creating it on first use.
+        
+        Args:
+            provider (str): The service name.
+        
+        Returns:
+            ProviderLimiter: The provider's limiter.
+        """
+        with self._lock:
+            if provider not in self._limiters:
+                self._limiters[provider] = ProviderLimiter(**self._get_limits(provider))
+            return self._limiters[provider]
+    
+    def get_retry_delay(self, attempt, error):
+        """Get the delay before retrying a failed request.
+        
+        Args:
+            attempt (int): The number of the retry, starting at 0.
+            error (TTSServiceError): The error of the failed request.
+        
+        Returns:
+            float: Seconds to wait before the retry.
+        """
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        if error.retry_after is not None:
+            delay = max(delay, min(error.retry_after, self.max_delay))
+        return delay
+    
+    def _should_retry(self, limiter, attempt, error, can_retry):
+        if not error.retryable or attempt >= self.max_retries or (can_retry is not None and not can_retry()):
+            limiter.record_failure()
+            return False
+        limiter.record_retry(error)
+        return True
+    
+    def call(self, provider, function, *args, can_retry=None, **kwargs):
+        """Call a blocking provider function under the provider's limits.
+        
+        Args:
+            provider (str): The service name.
+            function (callable): The function making the request.
+            *args: Positional arguments for the function.
+            can_retry (callable, optional): Returns False if the request must not
+                                            be retried, e.g. after audio was played.
+            **kwargs: Keyword arguments for the function.
+        
+        Returns:
+            The result of the function.
+        
+        Raises:
+            TTSServiceError: If the request still fails after the allowed retries.
+        """
+        limiter = self.get_limiter(provider)
+        attempt = 0
+        while True:
+            limiter.acquire()
+            metrics.count("requests", service=provider)
+            try:
+                return function(*args, **kwargs)
+            except TTSServiceError as e:
+                metrics.count("errors", service=provider)
+                if not self._should_retry(limiter, attempt, e, can_retry):
+                    raise
+                delay = self.get_retry_delay(attempt, e)
+            finally:
+                limiter.release()
+            time.sleep(delay)
+            attempt += 1
+    
+    async def call_async(self, provider, function, *args, can_retry=None, **kwargs):
+        """Await a provider coroutine function under the provider's limits.
+        
+        Args:
+            provider (str): The service name.
+            function (callable): The coroutine function making the request.
+            *args: Positional arguments for the function.
+            can_retry (callable, optional): Returns False if the request must not be retried.
+            **kwargs: Keyword arguments for the function.
+        
+        Returns:
+            The result of the coroutine.
+        
+        Raises:
+            TTSServiceError: If the request still fails after the allowed retries.
+        """
+        limiter = self.get_limiter(provider)
+        attempt = 0
+        while True:
+            await limiter.acquire_async()
+            metrics.count("requests", service=provider)
+            try:
+                return await function(*args, **kwargs)
+            except TTSServiceError as e:
+                metrics.count("errors", service=provider)
+                if not self._should_retry(limiter, attempt, e, can_retry):
+                    raise
+                delay = self.get_retry_delay(attempt, e)
+            finally:
+                limiter.release()
+            await asyncio.sleep(delay)
+            attempt += 1
+    
+    def get_stats(self):
+        """Get the metrics of every provider that has been used.
+        
+        Returns:
+            dict: ProviderLimiter.get_stats() results keyed by service name.
+        """
+        with self._lock:
+            limiters = dict(self._limiters)
+        return {provider: limiter.get_stats() for provider, limiter in limiters.items()}
+
+
+class _StreamOnceSink:
+    """Audio sink wrapper that lets a stream be retried until audio has been played.
+    
+    The wrapped sink is started by the first attempt and finished by close(),
+    once no attempt is left, so a retry keeps playing into the same stream.
+    """
+    
+    def __init__(self, audio_sink):
+        """Initialize the wrapper.
+        
+        Args:
+            audio_sink: The sink receiving the PCM audio of the stream.
+        """
+        self.audio_sink = audio_sink
+        self.started = False
+        self.written = False
+    
+    def start(self, sample_rate, channels):
+        """Start the wrapped sink, unless an earlier attempt has started it.
+        
+        Args:
+            sample_rate (int): The sample rate of the audio in Hz.
+            channels (int): The number of audio channels.
+        """
+        if not self.started:
+            self.started = True
+            self.audio_sink.start(sample_rate, channels)
+    
+    def write(self, pcm_bytes):
+        """Pass a chunk of audio to the wrapped sink.
+        
+        Args:
+            pcm_bytes (bytes): Signed 16-bit little-endian PCM audio.
+        """
+        self.written = True
+        self.audio_sink.write(pcm_bytes)
+    
+    def finish(self):
+        """Ignore the end of an attempt; the stream is only finished by close()."""
+        pass
+    
+    def close(self):
+        """Finish the wrapped sink once no attempt is left, if it was started."""
+        if self.started:
+            self.audio_sink.finish()
+
+
+class ScheduledService:
+    """Wraps a TTS service so that its provider requests go through a RequestScheduler.
+    
+    Attributes other than the request methods are taken from the service.
+    """
+    
+    def __init__(self, service, scheduler, provider):
+        """Initialize the wrapper.
+        
+        Args:
+            service (BaseTTSService): The wrapped service.
+            scheduler (RequestScheduler): The scheduler to run requests through.
+            provider (str): The service name whose limits apply.
+        """
+        self.service = service
+        self.scheduler = scheduler
+        self.provider = provider
+    
+    def __getattr__(self, name):
+        """Get an attribute of the wrapped service."""
+        return getattr(self.service, name)
+    
+    def get_character_usage(self):
+        """Get the character usage of the account through the scheduler.
+        
+        Returns:
+            tuple: (character_count, character_limit), see BaseTTSService.get_character_usage.
+        """
+        return self.scheduler.call(self.provider, self.service.get_character_usage)
+    
+    async def get_character_usage_async(self):
+        """Get the character usage of the account through the scheduler, without blocking.
+        
+        Returns:
+            tuple: (character_count, character_limit).
+        """
+        return await self.scheduler.call_async(self.provider, self.service.get_character_usage_async)
+    
+    def list_voices(self, etag=None):
+        """List the voices of the service through the scheduler.
+        
+        Args:
+            etag (str, optional): The ETag of the previous response, if the service supports them.
+        
+        Returns:
+            tuple: (voices, etag), see BaseTTSService.list_voices.
+        """
+        return self.scheduler.call(self.provider, self.service.list_voices, etag)
+    
+    def _record_synthesis(self, text, result):
+        """Count the characters sent and the audio bytes received by a synthesis request."""
+        if not metrics.enabled:
+            return
+        metrics.count("characters", self.service.measure_text(text), service=self.provider)
+        size = result.get_size() if isinstance(result, AudioResult) else Path(result).stat().st_size
+        metrics.count("bytes", size, service=self.provider)
+    
+    def synthesize_speech(self, text, output_file=None, tts_params=None):
+        """Synthesize speech through the scheduler.
+        
+        Args:
+            text (str): The text to convert to speech.
+            output_file (Path, optional): Where to save the audio.
+            tts_params (dict, optional): Synthesis parameters to use.
+        
+        Returns:
+            Path or AudioResult: The saved audio.
+        """
+        with metrics.span("synthesis", service=self.provider):
+            result = self.scheduler.call(self.provider, self.service.synthesize_speech, text, output_file, tts_params)
+        self._record_synthesis(text, result)
+        return result
+    
+    async def synthesize_speech_async(self, text, output_file=None, tts_params=None):
+        """Synthesize speech through the scheduler, without blocking the event loop.
+        
+        Args:
+            text (str): The text to convert to speech.
+            output_file (Path, optional): Where to save the audio.
+            tts_params (dict, optional): Synthesis parameters to use.
+        
+        Returns:
+            Path or AudioResult: The saved audio.
+        """
+        with metrics.span("synthesis", service=self.provider):
+            result = await self.scheduler.call_async(
+                self.provider, self.service.synthesize_speech_async, text, output_file, tts_params
+            )
+        self._record_synthesis(text, result)
+        return result
+    
+    async def synthesize_batch_async(self, text, output_file, tts_params=None):
+        """Render a very large text with the batch API of the service, through the scheduler.
+        
+        Args:
+            text (str): The text to convert to speech.
+            output_file (Path): Where to save the audio.
+            tts_params (dict, optional): Synthesis parameters to use.
+        
+        Returns:
+            Path: The saved audio file.
+        """
+        with metrics.span("synthesis.batch", service=self.provider):
+            result = await self.scheduler.call_async(
+                self.provider, self.service.synthesize_batch_async, text, output_file, tts_params
+            )
+        self._record_synthesis(text, result)
+        return result
+    
+    def stream_speech(self, text, audio_sink, tts_params=None):
+        """Stream speech to an audio sink through the scheduler.
+        
+        A failed attempt is retried only until audio has reached the sink,
+        and the sink is finished exactly once, also when all attempts fail.
+        
+        Args:
+            text (str): The text to convert to speech.
+            audio_sink: The object receiving PCM audio as it arrives.
+            tts_params (dict, optional): Synthesis parameters to use.
+        
+        Returns:
+            AudioResult: The complete clip.
+        """
+        # Once audio has reached the player, a retry would play it twice
+        sink = _StreamOnceSink(audio_sink)
+        try:
+            with metrics.span("synthesis.stream", service=self.provider):
+                result = self.scheduler.call(
+                    self.provider, self.service.stream_speech, text, sink, tts_params,
+                    can_retry=lambda: not sink.written,
+                )
+        finally:
+            sink.close()
+        self._record_synthesis(text, result)
+        return result
@@ -0,0 +1,76 @@
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from .audio_stitcher import AudioStitcher
+from .text_segmenter import TextSegmenter
+
+
+class SegmentedSynthesizer:
+    """Synthesizes long text as parallel segment requests stitched into one file."""
+    
+    def __init__(self, service, max_segment_size, max_workers, work_dir):
+        """Initialize the segmented synthesizer.
+        
+        Args:
+            service (BaseTTSService): The service used to synthesize each segment.
+            max_segment_size (int): Maximum size of a segment, as measured by the service.
+            max_workers (int): Maximum number of segment requests in flight at once.
+            work_dir (Path): Directory for the temporary segment files.
+        """
+        self.service = service
+        self.segmenter = TextSegmenter(max_segment_size, measure=service.measure_text)
+        self.max_workers = max_workers
+        self.work_dir = Path(work_dir)
+    
+    def synthesize(self, text, output_file, tts_params=None):
+        """Synthesize text, splitting it into segments if it is too large for one request.
+        
+        Args:
+            text (str): The text to convert to speech.
+            output_file (Path): Path of the merged audio file.
+            tts_params (dict, optional): Synthesis parameters passed to the service.
+        
+        Returns:
+            Path: The path to the saved audio file.
+            
+        Raises:
+            RuntimeError: If any segment fails to synthesize.
+        """
+        output_file = Path(output_file)
+        segments = self.segmenter.split(text)
+        if len(segments) <= 1:
+            return self.service.synthesize_speech(text, output_file, tts_params)
+        
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+        segment_dir = Path(tempfile.mkdtemp(dir=self.work_dir))
+        try:
+            segment_files = self._synthesize_segments(segments, segment_dir, output_file.suffix, tts_params)
+            return AudioStitcher.concatenate(segment_files, output_file)
+        finally:
+            shutil.rmtree(segment_dir, ignore_errors=True)
+    
+    def _synthesize_segments(self, segments, segment_dir, file_extension, tts_params):
+        """Synthesize segments concurrently.
+        
+        Returns:
+            list: The segment audio files in the same order as the segments.
+        """
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(segments))) as pool:
+            futures = [
+                pool.submit(
+                    self.service.synthesize_speech,
+                    segment,
+                    segment_dir / f"{index:05d}{file_extension}",
+                    tts_params,
+                )
+                for index, segment in enumerate(segments)
+            ]
+            try:
+                return [future.result() for future in futures]
+            except BaseException:
+                # Don't start segments that are still queued once one has failed
+                for future in futures:
+                    future.cancel()
+                raise
@@ -1,4 +1,28 @@
-from .elevenlabs_service import ElevenLabsService
-from .google_cloud_service import GoogleCloudService
+import importlib
 
-__all__ = ['ElevenLabsService', 'GoogleCloudService']
+from .base_service import TTSServiceError
+from .registry import ServiceRegistry, ServiceSpec, register_service, service_registry
+
+# Service classes are imported on first access, since the provider SDKs are slow to import
+_SERVICE_MODULES = {
+    'ElevenLabsService': '.elevenlabs_service',
+    'GoogleCloudService': '.google_cloud_service',
+    'LocalService': '.local_service',
+}
+
+__all__ = [
+    'ServiceRegistry',
+    'ServiceSpec',
+    'register_service',
+    'service_registry',
+    'TTSServiceError',
+    *_SERVICE_MODULES,
+]
+
+
+def __getattr__(name):
+    """Import a service class the first time it is accessed."""
+    if name in _SERVICE_MODULES:
+        module = importlib.import_module(_SERVICE_MODULES[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,20 +1,120 @@
+import asyncio
+import hashlib
+import json
+import time
+import weakref
 from abc import ABC, abstractmethod
+from email.utils import parsedate_to_datetime
 from pathlib import Path
 
+from ..audio_result import AudioResult
+from ..metrics import metrics
+from ..output_store import OutputStore
+
+
+class TTSServiceError(RuntimeError):
+    """Error returned by a TTS service, with the details needed to retry it."""
+    
+    # HTTP status codes of errors that are worth retrying
+    RETRYABLE_STATUS_CODES = {408, 409, 425, 429, 500, 502, 503, 504}
+    
+    def __init__(self, message, status_code=None, retry_after=None, retryable=None):
+        """Initialize the error.
+        
+        Args:
+            message (str): The error message.
+            status_code (int, optional): The HTTP status code of the failed request.
+            retry_after (float, optional): Seconds the service asked to wait before retrying.
+            retryable (bool, optional): Whether retrying may succeed. If None, it is
+                                        derived from the status code.
+        """
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+        if retryable is None:
+            retryable = status_code in self.RETRYABLE_STATUS_CODES
+        self.retryable = retryable
+    
+    @staticmethod
+    def parse_retry_after(value):
+        """Parse a Retry-After header value.
+        
+        Args:
+            value (str): The header value, in seconds or as an HTTP date.
+        
+        Returns:
+            float: The number of seconds to wait, or None if the value is missing or invalid.
+        """
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_time = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, retry_time.timestamp() - time.time())
+
 
 class BaseTTSService(ABC):
     """Abstract base class for text-to-speech services."""
     
-    def __init__(self, config_manager):
+    # Service config fields used to build the client; changing them requires a new client
+    CREDENTIAL_FIELDS = ()
+    
+    # Service config fields that change the synthesized audio; only these go into the cache key.
+    # None means every field except the credentials and the streaming flag.
+    AUDIO_FIELDS = None
+    
+    def __init__(self, config_manager, output_store=None):
         """Initialize the TTS service.
         
         Args:
             config_manager (ConfigManager): The configuration manager instance.
+            output_store (OutputStore, optional): Where generated audio files are stored.
+                                                  If None, one is created from the configuration.
         """
         self.config_manager = config_manager
+        self.output_store = output_store or OutputStore.from_config(config_manager)
+        self.credential_fingerprint = None
         self.client = None
+        # Async clients keyed by the event loop they were created on
+        self._async_clients = weakref.WeakKeyDictionary()
         self._initialize_client()
     
+    @classmethod
+    def get_credential_fingerprint(cls, service_config):
+        """Get a fingerprint of the credentials in a service configuration.
+        
+        Args:
+            service_config (dict): The service configuration.
+        
+        Returns:
+            str: A digest that changes whenever a credential field changes.
+        """
+        credentials = [service_config.get(field) for field in cls.CREDENTIAL_FIELDS]
+        return hashlib.sha256(json.dumps(credentials).encode("utf-8")).hexdigest()
+    
+    @classmethod
+    def get_audio_fields(cls, service_config):
+        """Get the service config fields that change the synthesized audio.
+        
+        Args:
+            service_config (dict): The service configuration.
+        
+        Returns:
+            tuple: AUDIO_FIELDS if the service declares them, otherwise every field
+                   of the configuration except the credentials and "streaming".
+        """
+        if cls.AUDIO_FIELDS is not None:
+            return cls.AUDIO_FIELDS
+        return tuple(
+            field for field in service_config
+            if field not in cls.CREDENTIAL_FIELDS and field != "streaming"
+        )
+    
     @abstractmethod
     def _initialize_client(self):
         """Initialize the service client.
@@ -38,20 +138,226 @@ class BaseTTSService(ABC):
         pass
     
     @abstractmethod
-    def synthesize_speech(self, text):
+    def synthesize_speech(self, text, output_file=None, tts_params=None):
         """Synthesize speech using the TTS service.
         
         Args:
             text (str): The text to convert to speech.
+            output_file (Path, optional): Where to save the audio.
+                                          If None, the audio is kept in memory.
+            tts_params (dict, optional): Synthesis parameters to use.
+                                         If None, uses the service configuration.
         
         Returns:
-            Path: The path to the saved audio file.
+            Path or AudioResult: The saved audio file, or the audio in memory
+                                 if output_file was None.
             
         Raises:
             RuntimeError: If there's an error during synthesis.
         """
         pass
     
+    def _create_async_client(self):
+        """Create an async client for the current event loop.
+        
+        Services with an async SDK client override this to use it from the
+        async methods. The default has no async client.
+        
+        Returns:
+            The async client, or None if the service has none.
+        """
+        return None
+    
+    def get_async_client(self):
+        """Get the async client for the running event loop.
+        
+        Async clients hold connections bound to the event loop they were
+        created on, so one is created for each loop that uses the service.
+        
+        Returns:
+            The async client, or None if the service has none.
+        """
+        loop = asyncio.get_running_loop()
+        if loop not in self._async_clients:
+            self._async_clients[loop] = self._create_async_client()
+        return self._async_clients[loop]
+    
+    async def get_character_usage_async(self):
+        """Get character usage from the TTS service without blocking the event loop.
+        
+        The default implementation runs get_character_usage in a worker thread.
+        Services with an async client should override it.
+        
+        Returns:
+            tuple: A tuple containing (character_count, character_limit).
+                  Return (-1, -1) if usage tracking is not available.
+            
+        Raises:
+            RuntimeError: If there's an error retrieving usage information.
+        """
+        return await asyncio.to_thread(self.get_character_usage)
+    
+    def list_voices(self, etag=None):
+        """List the voices available to the account.
+        
+        Only called for services that declare the voice_catalogue capability.
+        Each voice is a dictionary with "id" (the value stored in the service
+        configuration), "name", "languages" (language codes), "gender" and
+        "description" keys.
+        
+        Args:
+            etag (str, optional): The ETag of the voice list fetched last time.
+        
+        Returns:
+            tuple: (voices, etag). voices is None if the service confirmed that
+                   the list matching etag has not changed. etag is None if the
+                   service does not return one.
+            
+        Raises:
+            RuntimeError: If there's an error retrieving the voices.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not list its voices")
+    
+    async def synthesize_speech_async(self, text, output_file=None, tts_params=None):
+        """Synthesize speech using the TTS service without blocking the event loop.
+        
+        The default implementation runs synthesize_speech in a worker thread.
+        Services with an async client should override it, so that many
+        concurrent requests share one event loop instead of a thread each.
+        
+        Args:
+            text (str): The text to convert to speech.
+            output_file (Path, optional): Where to save the audio.
+                                          If None, the audio is kept in memory.
+            tts_params (dict, optional): Synthesis parameters to use.
+                                         If None, uses the service configuration.
+        
+        Returns:
+            Path or AudioResult: The saved audio file, or the audio in memory
+                                 if output_file was None.
+            
+        Raises:
+            RuntimeError: If there's an error during synthesis.
+        """
+        return await asyncio.to_thread(self.synthesize_speech, text, output_file, tts_params)
+    
+    def get_tts_params(self, tts_params=None):
+        """Get the parameters to synthesize with.
+        
+        Args:
+            tts_params (dict, optional): Explicit synthesis parameters.
+        
+        Returns:
+            dict: tts_params if given, otherwise the service configuration.
+        """
+        if tts_params is not None:
+            return tts_params
+        return self.config_manager.get_service_config()
+    
+    def get_max_request_size(self, tts_params=None):
+        """Get the largest text accepted by a single request for specific parameters.
+        
+        Services only need to override this if the limit depends on the
+        parameters, e.g. the model. Otherwise the max_request_size capability
+        declared in the service registry applies.
+        
+        Args:
+            tts_params (dict, optional): Synthesis parameters to use.
+                                         If None, uses the service configuration.
+        
+        Returns:
+            int: The maximum request size in the unit returned by measure_text,
+                 or None to use the declared capability.
+        """
+        return None
+    
+    def get_batch_threshold(self, tts_params=None):
+        """Get the text size above which the service's batch API is used.
+        
+        Only called for services that declare the batch capability. Texts
+        larger than the threshold are rendered by synthesize_batch_async in one
+        long-running job instead of being split into segments.
+        
+        Args:
+            tts_params (dict, optional): Synthesis parameters to use.
+                                         If None, uses the service configuration.
+        
+        Returns:
+            int: The threshold in the unit returned by measure_text, or None if
+                 the batch API can't be used with these parameters.
+        """
+        return None
+    
+    def get_gapless_params(self, tts_params=None):
+        """Get the synthesis parameters for segments that are stitched into one file.
+        
+        Lossy formats such as MP3 start and end every file with a short
+        silence from the encoder, which would be heard at each join. Services
+        that produce such formats return overrides that request uncompressed
+        audio instead.
+        
+        Args:
+            tts_params (dict, optional): Synthesis parameters to use.
+                                         If None, uses the service configuration.
+        
+        Returns:
+            dict: Overrides of the synthesis parameters, including file_extension,
+                  or an empty dict if the configured format already joins without gaps.
+        """
+        return {}
+    
+    async def synthesize_batch_async(self, text, output_file, tts_params=None):
+        """Render a very large text with the service's long-running batch API.
+        
+        The audio is streamed to output_file instead of being held in memory.
+        
+        Args:
+            text (str): The text to convert to speech.
+            output_file (Path): Where to save the audio.
+            tts_params (dict, optional): Synthesis parameters to use.
+                                         If None, uses the service configuration.
+        
+        Returns:
+            Path: The saved audio file.
+            
+        Raises:
+            RuntimeError: If there's an error during synthesis.
+        """
+        raise NotImplementedError(f"{type(self).__name__} has no batch API")
+    
+    def measure_text(self, text):
+        """Measure text in the unit the service uses for its request size limit.
+        
+        Args:
+            text (str): The text to measure.
+        
+        Returns:
+            int: The size of the text (number of characters by default).
+        """
+        return len(text)
+    
+    def stream_speech(self, text, audio_sink, tts_params=None):
+        """Synthesize speech, feeding audio to a sink as soon as it arrives.
+        
+        Only called for services that declare the streaming capability.
+        The audio sink must provide start(sample_rate, channels), write(pcm_bytes)
+        and finish() methods. Audio is passed to the sink as signed 16-bit PCM
+        while the complete clip is collected in parallel.
+        
+        Args:
+            text (str): The text to convert to speech.
+            audio_sink: The object receiving PCM audio as it arrives.
+            tts_params (dict, optional): Synthesis parameters to use.
+                                         If None, uses the service configuration.
+        
+        Returns:
+            AudioResult: The complete clip as a WAV file, kept in memory.
+            
+        Raises:
+            RuntimeError: If there's an error during synthesis.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support streaming")
+    
     def is_initialized(self):
         """Check if the service client is properly initialized.
         
@@ -60,8 +366,15 @@ class BaseTTSService(ABC):
         """
         return self.client is not None
     
+    def close(self):
+        """Release the resources held by the client, such as connections or worker processes.
+        
+        The service can't be used afterwards.
+        """
+        pass
+    
     def get_output_file_path(self, file_extension=None):
-        """Get the output file path for audio files.
+        """Get a new, unique output file path for an audio file.
         
         Args:
             file_extension (str, optional): File extension to use.
@@ -74,7 +387,33 @@ class BaseTTSService(ABC):
             tts_params = self.config_manager.get_service_config()
             file_extension = tts_params.get('file_extension', '.mp3')
         
-        return self.config_manager.get_data_dir() / f"audio{file_extension}"
+        return self.output_store.new_path(file_extension)
+    
+    def new_audio_result(self, file_extension=None):
+        """Get an empty in-memory audio result for a request without an output file.
+        
+        Args:
+            file_extension (str, optional): File extension to use.
+                                          If None, gets from service config.
+        
+        Returns:
+            AudioResult: The result to write the audio to, with a new output path
+                         for when it has to be saved to disk.
+        """
+        return AudioResult(self.get_output_file_path(file_extension), self.output_store.max_memory_bytes)
+    
+    def open_output_file(self, output_file):
+        """Open an output file for writing, replacing it atomically once written.
+        
+        Args:
+            output_file (Path or AudioResult): The path or in-memory result to write to.
+        
+        Returns:
+            A context manager yielding the open binary file.
+        """
+        if isinstance(output_file, AudioResult):
+            return metrics.trace_writes(output_file.open_writer())
+        return metrics.trace_writes(OutputStore.atomic_write(output_file))
     
     def cleanup_output_file(self, output_file):
         """Clean up the output file in case of errors.
@@ -1,27 +1,104 @@
-from elevenlabs.client import ElevenLabs
+import wave
+from contextlib import contextmanager
+import httpx
+from elevenlabs.client import AsyncElevenLabs, ElevenLabs
 from elevenlabs.core.api_error import ApiError
-from .base_service import BaseTTSService
+from ..metrics import metrics
+from .base_service import BaseTTSService, TTSServiceError
+from .http_client_pool import http_client_pool
 
 
 class ElevenLabsService(BaseTTSService):
     """Service class for ElevenLabs text-to-speech functionality."""
     
-    def __init__(self, config_manager):
+    # Maximum characters per request for each model
+    MODEL_CHARACTER_LIMITS = {
+        "eleven_v3": 3000,
+        "eleven_multilingual_v2": 10000,
+        "eleven_turbo_v2_5": 40000,
+        "eleven_flash_v2_5": 40000,
+    }
+    
+    CREDENTIAL_FIELDS = ("api_key", "base_url")
+    
+    AUDIO_FIELDS = ("voice_id", "model_id", "voice_settings", "output_format", "file_extension")
+    
+    # Retries are left to the request scheduler, which honours Retry-After across requests
+    REQUEST_OPTIONS = {"max_retries": 0}
+    
+    def __init__(self, config_manager, output_store=None):
         """Initialize the ElevenLabs service.
         
         Args:
             config_manager (ConfigManager): The configuration manager instance.
+            output_store (OutputStore, optional): Where generated audio files are stored.
         """
-        super().__init__(config_manager)
+        super().__init__(config_manager, output_store)
     
     def _initialize_client(self):
-        """Initialize the ElevenLabs client with API key."""
+        """Initialize the ElevenLabs client with API key.
+        
+        An optional "base_url" in the service configuration points the client
+        at another server, e.g. a proxy or the mock server used by the benchmarks.
+        
+        The client sends its requests through the shared HTTP client, so it
+        reuses the connections of other requests and of the client it replaces.
+        """
+        client_options = self._get_client_options()
+        if client_options is None:
+            self.client = None
+            return
+        http_config = self.config_manager.get_http_client_config()
+        self.client = ElevenLabs(**client_options, httpx_client=http_client_pool.get_client(http_config))
+    
+    def _get_client_options(self):
+        """Get the keyword arguments to create an ElevenLabs client with.
+        
+        Returns:
+            dict: The client options, or None if no API key is configured.
+        """
         service_config = self.config_manager.get_service_config()
         api_key = service_config.get("api_key")
         if not api_key:
-            self.client = None
+            return None
+        # The SDK applies its own timeout to every request, overriding the HTTP client's
+        options = {"api_key": api_key, "timeout": self.config_manager.get_http_client_config()["timeout_seconds"]}
+        if service_config.get("base_url"):
+            options["base_url"] = service_config["base_url"]
+        return options
+    
+    @staticmethod
+    def _service_error(error):
+        """Convert an ElevenLabs API or connection error into a TTSServiceError.
+        
+        Args:
+            error (Exception): The ApiError or httpx.TransportError raised by the client.
+        
+        Returns:
+            TTSServiceError: The error to raise, with the status code and Retry-After delay.
+        """
+        if isinstance(error, httpx.TransportError):
+            return TTSServiceError(f"Could not reach ElevenLabs: {error}", retryable=True)
+        
+        detail = error.body.get("detail") if isinstance(error.body, dict) else None
+        if isinstance(detail, dict) and detail.get("message"):
+            message = detail["message"]
         else:
-            self.client = ElevenLabs(api_key=api_key)
+            message = f"ElevenLabs request failed with status {error.status_code}: {error.body}"
+        headers = {key.lower(): value for key, value in (error.headers or {}).items()}
+        return TTSServiceError(
+            message,
+            status_code=error.status_code,
+            retry_after=TTSServiceError.parse_retry_after(headers.get("retry-after")),
+        )
+    
+    def _create_async_client(self):
+        """Create an AsyncElevenLabs client for the current event loop, on the loop's shared HTTP client."""
+        client_options = self._get_client_options()
+        if client_options is None:
+            return None
+        http_config = self.config_manager.get_http_client_config()
+        return AsyncElevenLabs(**client_options, httpx_client=http_client_pool.get_async_client(http_config))
     
     def get_character_usage(self):
         """Get character usage from ElevenLabs.
@@ -33,19 +110,96 @@ class ElevenLabsService(BaseTTSService):
             RuntimeError: If there's an error retrieving usage information.
         """
         try:
-            subscription = self.client.user.subscription.get()
+            subscription = self.client.user.subscription.get(request_options=self.REQUEST_OPTIONS)
+            return subscription.character_count, subscription.character_limit
+        except (ApiError, httpx.TransportError) as e:
+            raise self._service_error(e)
+    
+    async def get_character_usage_async(self):
+        """Get character usage from ElevenLabs with the async client.
+        
+        Returns:
+            tuple: A tuple containing (character_count, character_limit).
+            
+        Raises:
+            RuntimeError: If there's an error retrieving usage information.
+        """
+        try:
+            subscription = await self.get_async_client().user.subscription.get(request_options=self.REQUEST_OPTIONS)
             return subscription.character_count, subscription.character_limit
+        except (ApiError, httpx.TransportError) as e:
+            raise self._service_error(e)
+    
+    def list_voices(self, etag=None):
+        """List the voices of the ElevenLabs account, including its own and saved voices.
+        
+        Args:
+            etag (str, optional): The ETag of the voice list fetched last time.
+        
+        Returns:
+            tuple: (voices, etag), with voices None if the list has not changed.
+            
+        Raises:
+            RuntimeError: If there's an error retrieving the voices.
+        """
+        if not self.is_initialized():
+            raise RuntimeError("ElevenLabs client not initialized. Please check your API key.")
+        
+        request_options = dict(self.REQUEST_OPTIONS)
+        if etag:
+            request_options["additional_headers"] = {"If-None-Match": etag}
+        try:
+            response = self.client.voices.with_raw_response.get_all(request_options=request_options)
         except ApiError as e:
-            raise RuntimeError(e.body['detail']['message'])
+            if e.status_code == 304:
+                return None, etag
+            raise self._service_error(e)
+        except httpx.TransportError as e:
+            raise self._service_error(e)
+        
+        voices = []
+        for voice in response.data.voices:
+            labels = voice.labels or {}
+            languages = [language.language for language in voice.verified_languages or [] if language.language]
+            if not languages and labels.get("language"):
+                languages = [labels["language"]]
+            details = [labels.get(label) for label in ("accent", "age", "description", "use_case")]
+            voices.append({
+                "id": voice.voice_id,
+                "name": voice.name or voice.voice_id,
+                "languages": sorted(set(languages)),
+                "gender": labels.get("gender", ""),
+                "description": ", ".join(filter(None, [voice.category, *details])),
+            })
+        headers = {key.lower(): value for key, value in response.headers.items()}
+        return voices, headers.get("etag")
+    
+    def get_max_request_size(self, tts_params=None):
+        """Get the largest text accepted by a single request for the configured model.
+        
+        Args:
+            tts_params (dict, optional): Synthesis parameters to use.
+                                         If None, uses the service configuration.
+        
+        Returns:
+            int: The maximum number of characters per request, or None for unknown models.
+        """
+        model_id = self.get_tts_params(tts_params).get("model_id")
+        return self.MODEL_CHARACTER_LIMITS.get(model_id)
     
-    def synthesize_speech(self, text):
+    def synthesize_speech(self, text, output_file=None, tts_params=None):
         """Synthesize speech using ElevenLabs.
         
         Args:
             text (str): The text to convert to speech.
+            output_file (Path, optional): Where to save the audio.
+                                          If None, the audio is kept in memory.
+            tts_params (dict, optional): Synthesis parameters to use.
+                                         If None, uses the service configuration.
         
         Returns:
-            Path: The path to the saved audio file.
+            Path or AudioResult: The saved audio file, or the audio in memory
+                                 if output_file was None.
             
         Raises:
             RuntimeError: If there's an error during synthesis.
@@ -53,8 +207,9 @@ class ElevenLabsService(BaseTTSService):
         if not self.is_initialized():
             raise RuntimeError("ElevenLabs client not initialized. Please check your API key.")
         
-        tts_params = self.config_manager.get_service_config()
-        output_file = self.get_output_file_path()
+        tts_params = self.get_tts_params(tts_params)
+        if output_file is None:
+            output_file = self.new_audio_result(tts_params.get("file_extension", ".mp3"))
 
         try:
             audio = self.client.text_to_speech.convert(
@@ -62,17 +217,176 @@ class ElevenLabsService(BaseTTSService):
                 voice_id=tts_params.get("voice_id"),
                 model_id=tts_params.get("model_id"),
                 output_format=tts_params.get("output_format"),
-                voice_settings=tts_params.get("voice_settings")
+                voice_settings=tts_params.get("voice_settings"),
+                request_options=self.REQUEST_OPTIONS
             )
 
             # Write the audio stream to the file
-            with open(output_file, "wb") as f:
-                for chunk in audio:
+            with self.open_output_file(output_file) as f, self._open_audio_writer(f, tts_params.get("output_format")) as write:
+                for chunk in metrics.trace_stream(audio, service="ElevenLabs"):
                     if chunk:
-                        f.write(chunk)
+                        write(chunk)
                         
-        except ApiError as e:
+        except (ApiError, httpx.TransportError) as e:
+            self.cleanup_output_file(output_file)
+            raise self._service_error(e)
+
+        return output_file
+
+    async def synthesize_speech_async(self, text, output_file=None, tts_params=None):
+        """Synthesize speech using the async ElevenLabs client.
+        
+        Args:
+            text (str): The text to convert to speech.
+            output_file (Path, optional): Where to save the audio.
+                                          If None, the audio is kept in memory.
+            tts_params (dict, optional): Synthesis parameters to use.
+                                         If None, uses the service configuration.
+        
+        Returns:
+            Path or AudioResult: The saved audio file, or the audio in memory
+                                 if output_file was None.
+            
+        Raises:
+            RuntimeError: If there's an error during synthesis.
+        """
+        if not self.is_initialized():
+            raise RuntimeError("ElevenLabs client not initialized. Please check your API key.")
+        
+        tts_params = self.get_tts_params(tts_params)
+        if output_file is None:
+            output_file = self.new_audio_result(tts_params.get("file_extension", ".mp3"))
+
+        try:
+            audio = self.get_async_client().text_to_speech.convert(
+                text=text,
+                voice_id=tts_params.get("voice_id"),
+                model_id=tts_params.get("model_id"),
+                output_format=tts_params.get("output_format"),
+                voice_settings=tts_params.get("voice_settings"),
+                request_options=self.REQUEST_OPTIONS
+            )
+
+            # Write the audio stream to the file
+            with self.open_output_file(output_file) as f, self._open_audio_writer(f, tts_params.get("output_format")) as write:
+                async for chunk in metrics.trace_stream_async(audio, service="ElevenLabs"):
+                    if chunk:
+                        write(chunk)
+                        
+        except (ApiError, httpx.TransportError) as e:
+            self.cleanup_output_file(output_file)
+            raise self._service_error(e)
+
+        return output_file
+
+    @staticmethod
+    @contextmanager
+    def _open_audio_writer(file, output_format):
+        """Open a writer for the audio of an output format.
+        
+        Raw PCM formats are wrapped in a WAV container, other formats are
+        written as they arrive.
+        
+        Args:
+            file: The binary output file.
+            output_format (str): The requested output format, e.g. "pcm_22050".
+        
+        Yields:
+            callable: Writes a chunk of the audio.
+        """
+        if not (output_format or "").startswith("pcm_"):
+            yield file.write
+            return
+        with wave.open(file, "wb") as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(int(output_format.split("_")[1]))
+            yield wav_file.writeframesraw
+
+    def get_gapless_params(self, tts_params=None):
+        """Get the synthesis parameters for segments that are stitched into one file.
+        
+        MP3 segments are requested as PCM at the same sample rate and saved as WAV.
+        
+        Args:
+            tts_params (dict, optional): Synthesis parameters to use.
+                                         If None, uses the service configuration.
+        
+        Returns:
+            dict: The PCM output format and the ".wav" file extension, or an
+                  empty dict if the output format is not MP3.
+        """
+        output_format = self.get_tts_params(tts_params).get("output_format") or ""
+        if not output_format.startswith("mp3_"):
+            return {}
+        pcm_format, _ = self._get_pcm_output_format(output_format)
+        return {"output_format": pcm_format, "file_extension": ".wav"}
+    
+    @staticmethod
+    def _get_pcm_output_format(output_format):
+        """Get the PCM output format matching the sample rate of an output format.
+        
+        Args:
+            output_format (str): The configured output format, e.g. "mp3_44100_128".
+        
+        Returns:
+            tuple: (PCM output format name, sample rate in Hz)
+        """
+        sample_rate = int(output_format.split("_")[1])
+        return f"pcm_{sample_rate}", sample_rate
+    
+    def stream_speech(self, text, audio_sink, tts_params=None):
+        """Synthesize speech using ElevenLabs, feeding PCM audio to a sink as it arrives.
+        
+        The audio is requested as raw PCM from the streaming endpoint so that
+        playback can start with the first chunk. The clip is saved as a WAV file.
+        
+        Args:
+            text (str): The text to convert to speech.
+            audio_sink: The object receiving PCM audio as it arrives.
+            tts_params (dict, optional): Synthesis parameters to use.
+                                         If None, uses the service configuration.
+        
+        Returns:
+            AudioResult: The complete clip as a WAV file, kept in memory.
+            
+        Raises:
+            RuntimeError: If there's an error during synthesis.
+        """
+        if not self.is_initialized():
+            raise RuntimeError("ElevenLabs client not initialized. Please check your API key.")
+        
+        tts_params = self.get_tts_params(tts_params)
+        output_format, sample_rate = self._get_pcm_output_format(tts_params.get("output_format"))
+        output_file = self.new_audio_result(".wav")
+
+        try:
+            audio = self.client.text_to_speech.stream(
+                text=text,
+                voice_id=tts_params.get("voice_id"),
+                model_id=tts_params.get("model_id"),
+                output_format=output_format,
+                voice_settings=tts_params.get("voice_settings"),
+                request_options=self.REQUEST_OPTIONS
+            )
+
+            audio_sink.start(sample_rate, 1)
+            try:
+                # Write each chunk to the file while handing it to the sink for playback
+                with self.open_output_file(output_file) as f, wave.open(f, "wb") as wav_file:
+                    wav_file.setnchannels(1)
+                    wav_file.setsampwidth(2)
+                    wav_file.setframerate(sample_rate)
+                    for chunk in metrics.trace_stream(audio, service="ElevenLabs"):
+                        if chunk:
+                            wav_file.writeframesraw(chunk)
+                            audio_sink.write(chunk)
+            finally:
+                # Also on errors, so the player doesn't keep waiting for more audio
+                audio_sink.finish()
+
+        except (ApiError, httpx.TransportError) as e:
             self.cleanup_output_file(output_file)
-            raise RuntimeError(e.body['detail']['message'])
+            raise self._service_error(e)
 
         return output_file
@@ -1,28 +1,262 @@
+import asyncio
+import datetime
+import json
+import os
+import threading
+import uuid
+import weakref
 from pathlib import Path
+from urllib.parse import quote
+from google.api_core.exceptions import GoogleAPICallError
 from google.cloud import texttospeech
-from .base_service import BaseTTSService
+from google.cloud.texttospeech_v1.services.text_to_speech.transports import (
+    TextToSpeechGrpcAsyncIOTransport,
+    TextToSpeechGrpcTransport,
+)
+from google.oauth2 import service_account
+from ..metrics import metrics
+from .base_service import BaseTTSService, TTSServiceError
 
 
 class GoogleCloudService(BaseTTSService):
     """Service class for Google Cloud text-to-speech functionality."""
     
-    def __init__(self, config_manager):
+    # The connection settings are fixed when the channel is created
+    CREDENTIAL_FIELDS = ("service_account_json_path", "connection")
+    
+    AUDIO_FIELDS = (
+        "language_code", "voice_name", "voice_gender", "audio_encoding",
+        "speaking_rate", "pitch", "volume_gain_db", "file_extension",
+    )
+    
+    # The long audio API only renders uncompressed audio
+    LONG_AUDIO_ENCODINGS = ("LINEAR16",)
+    
+    # Scope of the credentials used to download long audio from Cloud Storage
+    CLOUD_PLATFORM_SCOPE = "https://www.googleapis.com/auth/cloud-platform"
+    
+    # Bytes read from Cloud Storage at a time
+    DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+    
+    # Timeout of the list_voices call that opens the connection
+    WARM_UP_TIMEOUT_SECONDS = 10
+    
+    # How long to wait before checking a token that was never fetched or failed to refresh
+    TOKEN_RETRY_SECONDS = 60
+    
+    def __init__(self, config_manager, output_store=None):
         """Initialize the Google Cloud service.
         
         Args:
             config_manager (ConfigManager): The configuration manager instance.
+            output_store (OutputStore, optional): Where generated audio files are stored.
         """
-        super().__init__(config_manager)
+        # Long audio clients keyed by the event loop they were created on
+        self._long_audio_clients = weakref.WeakKeyDictionary()
+        self.credentials = None
+        # Set once the warm-up call has returned or failed
+        self._warm = threading.Event()
+        # Set to stop the background thread keeping the connection ready
+        self._closed = threading.Event()
+        super().__init__(config_manager, output_store)
+    
+    @classmethod
+    def get_credential_fingerprint(cls, service_config):
+        """Get a fingerprint of the service account path and the key file it points to.
+        
+        The file's modification time and size are included so that replacing
+        the key file at the same path also rebuilds the client.
+        
+        Args:
+            service_config (dict): The service configuration.
+        
+        Returns:
+            str: A digest that changes whenever the credentials change.
+        """
+        fingerprint = super().get_credential_fingerprint(service_config)
+        try:
+            stat = os.stat(service_config.get("service_account_json_path") or "")
+        except OSError:
+            return fingerprint
+        return f"{fingerprint}:{stat.st_mtime_ns}:{stat.st_size}"
     
     def _initialize_client(self):
-        """Initialize the Google Cloud TTS client with service account JSON file path."""
+        """Initialize the Google Cloud TTS client on a long-lived channel and keep it ready.
+        
+        The channel sends keepalive pings, so its connection stays open while
+        the application is idle. A background thread opens the connection
+        with a cheap list_voices call and then renews the access token before
+        it expires, so the first synthesis request and those after an idle
+        hour don't pay for the connection setup or a token refresh.
+        """
         service_config = self.config_manager.get_service_config()
         service_account_json_path = service_config.get("service_account_json_path")
 
         try:
-            self.client = texttospeech.TextToSpeechClient.from_service_account_json(service_account_json_path)
+            # Self-signed JWTs, as the client library uses by default, avoid a token exchange
+            self.credentials = service_account.Credentials.from_service_account_file(
+                service_account_json_path,
+                scopes=[self.CLOUD_PLATFORM_SCOPE],
+                always_use_jwt_access=True,
+            )
+            transport = TextToSpeechGrpcTransport(
+                credentials=self.credentials,
+                channel=self._get_channel_factory(TextToSpeechGrpcTransport),
+            )
+            self.client = texttospeech.TextToSpeechClient(transport=transport)
         except Exception as e:
+            self.credentials = None
             self.client = None
+            self._warm.set()
+            return
+        
+        connection = service_config.get("connection", {})
+        if not connection.get("warm_up", True):
+            self._warm.set()
+        threading.Thread(
+            target=self._keep_ready,
+            args=(
+                self.client,
+                self.credentials,
+                service_config.get("language_code"),
+                connection,
+                self._warm,
+                self._closed,
+            ),
+            name="google-tts-connection",
+            daemon=True,
+        ).start()
+        # The thread holds no reference to the service, so it stops once the service is dropped
+        weakref.finalize(self, self._closed.set)
+    
+    def _get_channel_factory(self, transport_class):
+        """Get a function that creates gRPC channels with keepalive for a transport.
+        
+        Args:
+            transport_class: TextToSpeechGrpcTransport or TextToSpeechGrpcAsyncIOTransport.
+        
+        Returns:
+            callable: The channel factory to pass as the transport's channel.
+        """
+        connection = self.config_manager.get_service_config().get("connection", {})
+        keepalive_ms = int(connection.get("keepalive_seconds", 60) * 1000)
+        keepalive_options = [
+            ("grpc.keepalive_time_ms", keepalive_ms),
+            ("grpc.keepalive_timeout_ms", min(keepalive_ms, 20000)),
+            # Keep the connection open between requests; gRPC backs off if the server objects
+            ("grpc.keepalive_permit_without_calls", 1),
+            ("grpc.http2.max_pings_without_data", 0),
+            # Don't let the channel drop its connection after 30 idle minutes
+            ("grpc.client_idle_timeout_ms", 2 ** 31 - 1),
+        ]
+        
+        def create_channel(host, options=(), **kwargs):
+            return self._create_channel(transport_class, host, [*options, *keepalive_options], **kwargs)
+        
+        return create_channel
+    
+    def _create_channel(self, transport_class, host, options, **kwargs):
+        """Create a gRPC channel to the Text-to-Speech API.
+        
+        Args:
+            transport_class: The transport the channel is for.
+            host (str): The API endpoint.
+            options (list): gRPC channel options.
+            **kwargs: Credentials and TLS arguments from the transport.
+        
+        Returns:
+            The channel.
+        """
+        return transport_class.create_channel(host, options=options, **kwargs)
+    
+    @classmethod
+    def _keep_ready(cls, client, credentials, language_code, connection, warm, closed):
+        """Warm up the connection, then renew the access token until the service is closed.
+        
+        Runs on a background thread. Errors are ignored: synthesis requests
+        open the connection and refresh the token themselves when needed.
+        """
+        if not warm.is_set():
+            try:
+                client.list_voices(language_code=language_code, timeout=cls.WARM_UP_TIMEOUT_SECONDS)
+            except Exception:
+                pass
+            warm.set()
+        
+        # Imported here, the transport module pulls in the requests package
+        from google.auth.transport.requests import Request
+        
+        margin = connection.get("token_refresh_margin_seconds", 300)
+        request = Request()
+        while not closed.wait(cls._get_token_refresh_wait(credentials, margin)):
+            try:
+                credentials.refresh(request)
+            except Exception:
+                closed.wait(cls.TOKEN_RETRY_SECONDS)
+    
+    @classmethod
+    def _get_token_refresh_wait(cls, credentials, margin):
+        """Get the seconds until the access token should be renewed.
+        
+        Args:
+            credentials: The service account credentials.
+            margin (float): Seconds before expiry to renew the token.
+        
+        Returns:
+            float: Seconds to wait, 0 if the token should be renewed now.
+        """
+        if credentials.expiry is None:
+            # No request has fetched a token yet
+            return cls.TOKEN_RETRY_SECONDS
+        now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+        return max((credentials.expiry - now).total_seconds() - margin, 0)
+    
+    def wait_until_warm(self, timeout=None):
+        """Wait for the warm-up call that opens the connection to the API.
+        
+        Args:
+            timeout (float, optional): Seconds to wait at most.
+        
+        Returns:
+            bool: True if the warm-up has finished or is disabled.
+        """
+        return self._warm.wait(timeout)
+    
+    def close(self):
+        """Stop renewing the access token and close the connection."""
+        self._closed.set()
+        if self.client is not None:
+            self.client.transport.close()
+    
+    def _create_async_client(self):
+        """Create a TextToSpeechAsyncClient for the current event loop.
+        
+        It shares the credentials of the sync client, so it uses the tokens
+        renewed in the background, and its channel has the same keepalive.
+        """
+        transport = TextToSpeechGrpcAsyncIOTransport(
+            credentials=self.credentials,
+            channel=self._get_channel_factory(TextToSpeechGrpcAsyncIOTransport),
+        )
+        return texttospeech.TextToSpeechAsyncClient(transport=transport)
+
+    def _create_long_audio_client(self):
+        """Create a TextToSpeechLongAudioSynthesizeAsyncClient for the current event loop."""
+        service_config = self.config_manager.get_service_config()
+        return texttospeech.TextToSpeechLongAudioSynthesizeAsyncClient.from_service_account_json(
+            service_config.get("service_account_json_path")
+        )
+    
+    def get_long_audio_client(self):
+        """Get the long audio client for the running event loop.
+        
+        Returns:
+            TextToSpeechLongAudioSynthesizeAsyncClient: The client.
+        """
+        loop = asyncio.get_running_loop()
+        if loop not in self._long_audio_clients:
+            self._long_audio_clients[loop] = self._create_long_audio_client()
+        return self._long_audio_clients[loop]
 
     def get_character_usage(self):
         """Get character usage from Google Cloud TTS.
@@ -36,14 +270,102 @@ class GoogleCloudService(BaseTTSService):
         # Google Cloud TTS pricing is pay-per-use without usage tracking
         return -1, -1
     
-    def synthesize_speech(self, text):
-        """Synthesize speech using Google Cloud TTS.
+    def list_voices(self, etag=None):
+        """List the voices supported by Google Cloud TTS.
+        
+        The API has no ETags, so the whole list is fetched every time.
+        
+        Args:
+            etag (str, optional): Ignored.
+        
+        Returns:
+            tuple: (voices, None)
+            
+        Raises:
+            RuntimeError: If there's an error retrieving the voices.
+        """
+        if not self.is_initialized():
+            raise RuntimeError("Google Cloud TTS client could not be initialized. Please check your service account JSON file path.")
+        try:
+            response = self.client.list_voices()
+        except Exception as e:
+            raise self._service_error(e)
+        
+        voices = [
+            {
+                "id": voice.name,
+                "name": voice.name,
+                "languages": list(voice.language_codes),
+                "gender": texttospeech.SsmlVoiceGender(voice.ssml_gender).name,
+                "description": f"{voice.natural_sample_rate_hertz} Hz",
+            }
+            for voice in response.voices
+        ]
+        return voices, None
+    
+    def get_batch_threshold(self, tts_params=None):
+        """Get the text size above which the long audio API is used.
+        
+        The long audio API needs a Cloud Storage location to write to and
+        only produces LINEAR16 (WAV) audio, so it is used only when enabled
+        with an output location and the WAV file format is selected.
+        
+        Args:
+            tts_params (dict, optional): Synthesis parameters to use.
+                                         If None, uses the service configuration.
+        
+        Returns:
+            int: The threshold in UTF-8 bytes, or None if the long audio API is not used.
+        """
+        tts_params = self.get_tts_params(tts_params)
+        long_audio = tts_params.get("long_audio") or {}
+        if (
+            not long_audio.get("enabled")
+            or not long_audio.get("output_gcs_uri")
+            or tts_params.get("audio_encoding") not in self.LONG_AUDIO_ENCODINGS
+        ):
+            return None
+        return long_audio.get("threshold_bytes")
+    
+    def get_gapless_params(self, tts_params=None):
+        """Get the synthesis parameters for segments that are stitched into one file.
+        
+        Compressed segments are requested as LINEAR16, which Google returns as WAV.
+        
+        Args:
+            tts_params (dict, optional): Synthesis parameters to use.
+                                         If None, uses the service configuration.
+        
+        Returns:
+            dict: The LINEAR16 encoding and the ".wav" file extension, or an
+                  empty dict if LINEAR16 is already selected.
+        """
+        if self.get_tts_params(tts_params).get("audio_encoding") == "LINEAR16":
+            return {}
+        return {"audio_encoding": "LINEAR16", "file_extension": ".wav"}
+    
+    def _get_project_id(self):
+        """Get the project of the service account, which is billed for long audio requests."""
+        service_config = self.config_manager.get_service_config()
+        with open(service_config.get("service_account_json_path"), encoding="utf-8") as f:
+            return json.load(f)["project_id"]
+    
+    async def synthesize_batch_async(self, text, output_file, tts_params=None):
+        """Render a very large text with the long audio API and stream the result to a file.
+        
+        The long-running operation writes the audio to a new object under the
+        configured Cloud Storage location. The operation is polled without
+        blocking the event loop, and once it is done the object is downloaded
+        in chunks and deleted from the bucket.
         
         Args:
             text (str): The text to convert to speech.
+            output_file (Path): Where to save the audio.
+            tts_params (dict, optional): Synthesis parameters to use.
+                                         If None, uses the service configuration.
         
         Returns:
-            Path: The path to the saved audio file.
+            Path: The saved audio file.
             
         Raises:
             RuntimeError: If there's an error during synthesis.
@@ -51,40 +373,190 @@ class GoogleCloudService(BaseTTSService):
         if not self.is_initialized():
             raise RuntimeError("Google Cloud TTS client could not be initialized. Please check your service account JSON file path.")
 
-        output_file = self.get_output_file_path()
+        tts_params = self.get_tts_params(tts_params)
+        long_audio = tts_params["long_audio"]
+        gcs_uri = f"{long_audio['output_gcs_uri'].rstrip('/')}/{uuid.uuid4().hex}.wav"
 
         try:
-            tts_params = self.config_manager.get_service_config()
-            
-            # Set the text input to be synthesized
-            synthesis_input = texttospeech.SynthesisInput(text=text)
-            
-            # Build the voice request
-            voice = texttospeech.VoiceSelectionParams(
-                language_code=tts_params.get("language_code"),
-                name=tts_params.get("voice_name"),
-                ssml_gender=getattr(texttospeech.SsmlVoiceGender, tts_params.get("voice_gender"))
+            request = texttospeech.SynthesizeLongAudioRequest(
+                parent=f"projects/{self._get_project_id()}/locations/{long_audio.get('location', 'global')}",
+                output_gcs_uri=gcs_uri,
+                **self._build_request(text, tts_params),
             )
+            operation = await self.get_long_audio_client().synthesize_long_audio(request=request)
+            while not await operation.done():
+                await asyncio.sleep(long_audio.get("poll_interval", 5.0))
+            # Raises the error of a failed operation
+            await operation.result()
             
-            # Select the type of audio file you want returned
-            audio_config = texttospeech.AudioConfig(
-                audio_encoding=getattr(texttospeech.AudioEncoding, tts_params.get("audio_encoding")),
-                speaking_rate=tts_params.get("speaking_rate"),
-                pitch=tts_params.get("pitch"),
-                volume_gain_db=tts_params.get("volume_gain_db")
-            )
+            await asyncio.to_thread(self._download_gcs_object, gcs_uri, output_file)
+            return Path(output_file)
             
+        except Exception as e:
+            self.cleanup_output_file(output_file)
+            raise self._service_error(e)
+    
+    def _download_gcs_object(self, gcs_uri, output_file):
+        """Stream a Cloud Storage object to a file, then delete the object.
+        
+        Args:
+            gcs_uri (str): The object, as "gs://bucket/name".
+            output_file (Path): Where to save it.
+        """
+        # Imported here, only the long audio API needs Cloud Storage
+        from google.auth.transport.requests import AuthorizedSession
+        
+        service_config = self.config_manager.get_service_config()
+        credentials = service_account.Credentials.from_service_account_file(
+            service_config.get("service_account_json_path"), scopes=[self.CLOUD_PLATFORM_SCOPE]
+        )
+        bucket, _, name = gcs_uri[len("gs://"):].partition("/")
+        url = f"https://storage.googleapis.com/storage/v1/b/{bucket}/o/{quote(name, safe='')}"
+        
+        with AuthorizedSession(credentials) as session:
+            with session.get(url, params={"alt": "media"}, stream=True, timeout=60) as response:
+                if response.status_code != 200:
+                    raise TTSServiceError(
+                        f"Could not download the long audio from {gcs_uri}: {response.status_code} {response.text}",
+                        status_code=response.status_code,
+                    )
+                with self.open_output_file(output_file) as out:
+                    for chunk in response.iter_content(chunk_size=self.DOWNLOAD_CHUNK_SIZE):
+                        out.write(chunk)
+            session.delete(url, timeout=60)
+    
+    def measure_text(self, text):
+        """Measure text in UTF-8 bytes, the unit of the Google Cloud TTS input limit.
+        
+        Args:
+            text (str): The text to measure.
+        
+        Returns:
+            int: The size of the text in bytes.
+        """
+        return len(text.encode("utf-8"))
+    
+    @staticmethod
+    def _service_error(error):
+        """Convert an error raised during synthesis into a TTSServiceError.
+        
+        Args:
+            error (Exception): The error raised by the client.
+        
+        Returns:
+            TTSServiceError: The error to raise. API errors keep their HTTP status
+                             code, so that quota and availability errors are retried.
+        """
+        if isinstance(error, TTSServiceError):
+            return error
+        message = f"Error during Google Cloud TTS synthesis: {str(error)}"
+        if isinstance(error, GoogleAPICallError):
+            return TTSServiceError(message, status_code=error.code)
+        return TTSServiceError(message, retryable=False)
+    
+    @staticmethod
+    def _build_request(text, tts_params):
+        """Build the arguments of a synthesize_speech request.
+        
+        Args:
+            text (str): The text to convert to speech.
+            tts_params (dict): The synthesis parameters.
+        
+        Returns:
+            dict: The input, voice and audio_config request arguments.
+        """
+        # Set the text input to be synthesized
+        synthesis_input = texttospeech.SynthesisInput(text=text)
+        
+        # Build the voice request
+        voice = texttospeech.VoiceSelectionParams(
+            language_code=tts_params.get("language_code"),
+            name=tts_params.get("voice_name"),
+            ssml_gender=getattr(texttospeech.SsmlVoiceGender, tts_params.get("voice_gender"))
+        )
+        
+        # Select the type of audio file you want returned
+        audio_config = texttospeech.AudioConfig(
+            audio_encoding=getattr(texttospeech.AudioEncoding, tts_params.get("audio_encoding")),
+            speaking_rate=tts_params.get("speaking_rate"),
+            pitch=tts_params.get("pitch"),
+            volume_gain_db=tts_params.get("volume_gain_db")
+        )
+        
+        return {"input": synthesis_input, "voice": voice, "audio_config": audio_config}
+    
+    def synthesize_speech(self, text, output_file=None, tts_params=None):
+        """Synthesize speech using Google Cloud TTS.
+        
+        Args:
+            text (str): The text to convert to speech.
+            output_file (Path, optional): Where to save the audio.
+                                          If None, the audio is kept in memory.
+            tts_params (dict, optional): Synthesis parameters to use.
+                                         If None, uses the service configuration.
+        
+        Returns:
+            Path or AudioResult: The saved audio file, or the audio in memory
+                                 if output_file was None.
+            
+        Raises:
+            RuntimeError: If there's an error during synthesis.
+        """
+        if not self.is_initialized():
+            raise RuntimeError("Google Cloud TTS client could not be initialized. Please check your service account JSON file path.")
+
+        tts_params = self.get_tts_params(tts_params)
+        if output_file is None:
+            output_file = self.new_audio_result(tts_params.get("file_extension", ".mp3"))
+
+        try:
             # Perform the text-to-speech request
-            response = self.client.synthesize_speech(
-                input=synthesis_input, voice=voice, audio_config=audio_config
-            )
+            with metrics.span("network.first_byte", service="Google Cloud"):
+                response = self.client.synthesize_speech(**self._build_request(text, tts_params))
             
             # Save the audio to a file
-            with open(output_file, "wb") as out:
+            with self.open_output_file(output_file) as out:
+                out.write(response.audio_content)
+            
+            return output_file
+            
+        except Exception as e:
+            self.cleanup_output_file(output_file)
+            raise self._service_error(e)
+    
+    async def synthesize_speech_async(self, text, output_file=None, tts_params=None):
+        """Synthesize speech using the async Google Cloud TTS client.
+        
+        Args:
+            text (str): The text to convert to speech.
+            output_file (Path, optional): Where to save the audio.
+                                          If None, the audio is kept in memory.
+            tts_params (dict, optional): Synthesis parameters to use.
+                                         If None, uses the service configuration.
+        
+        Returns:
+            Path or AudioResult: The saved audio file, or the audio in memory
+                                 if output_file was None.
+            
+        Raises:
+            RuntimeError: If there's an error during synthesis.
+        """
+        if not self.is_initialized():
+            raise RuntimeError("Google Cloud TTS client could not be initialized. Please check your service account JSON file path.")
+
+        tts_params = self.get_tts_params(tts_params)
+        if output_file is None:
+            output_file = self.new_audio_result(tts_params.get("file_extension", ".mp3"))
+
+        try:
+            with metrics.span("network.first_byte", service="Google Cloud"):
+                response = await self.get_async_client().synthesize_speech(**self._build_request(text, tts_params))
+            
+            with self.open_output_file(output_file) as out:
                 out.write(response.audio_content)
             
             return output_file
             
         except Exception as e:
             self.cleanup_output_file(output_file)
-            raise RuntimeError(f"Error during Google Cloud TTS synthesis: {str(e)}")
+            raise self._service_error(e)
@@ -0,0 +1,97 @@
+import asyncio
+import json
+import threading
+import weakref
+
+
+class HttpClientPool:
+    """Shared httpx clients, so HTTP services reuse their open connections.
+    
+    Every service instance, worker thread and event loop that asks for a
+    client with the same settings gets the same one, and with it the same
+    connection pool. Parallel requests to a provider then reuse kept-alive
+    connections instead of opening a new TLS session each, and rebuilding a
+    service after its credentials change keeps the connections it had.
+    
+    httpx async clients can only be used on the event loop they were created
+    on, so async clients are shared per event loop.
+    """
+    
+    def __init__(self):
+        """Initialize an empty pool."""
+        self._lock = threading.Lock()
+        # Clients keyed by their settings
+        self._clients = {}
+        # Async clients keyed by event loop, then by their settings
+        self._async_clients = weakref.WeakKeyDictionary()
+    
+    @staticmethod
+    def _get_client_options(settings):
+        """Get the httpx client arguments for the HTTP client settings.
+        
+        HTTP/2 needs the optional h2 package; without it the client falls back to HTTP/1.1.
+        
+        Args:
+            settings (dict): The HTTP client configuration.
+        
+        Returns:
+            dict: Keyword arguments for httpx.Client and httpx.AsyncClient.
+        """
+        import httpx
+        
+        http2 = settings.get("http2", False)
+        if http2:
+            try:
+                import h2  # noqa: F401 - only checks that HTTP/2 is available
+            except ImportError:
+                http2 = False
+        return {
+            "http2": http2,
+            "timeout": settings.get("timeout_seconds", 240),
+            "follow_redirects": True,
+            "limits": httpx.Limits(
+                max_connections=settings.get("max_connections"),
+                max_keepalive_connections=settings.get("max_keepalive_connections"),
+                keepalive_expiry=settings.get("keepalive_expiry_seconds"),
+            ),
+        }
+    
+    def get_client(self, settings):
+        """Get the shared client for the given settings.
+        
+        Args:
+            settings (dict): The HTTP client configuration.
+        
+        Returns:
+            httpx.Client: The client.
+        """
+        import httpx
+        
+        key = json.dumps(settings, sort_keys=True)
+        with self._lock:
+            if key not in self._clients:
+                self._clients[key] = httpx.Client(**self._get_client_options(settings))
+            return self._clients[key]
+    
+    def get_async_client(self, settings):
+        """Get the shared async client for the given settings and the running event loop.
+        
+        Args:
+            settings (dict): The HTTP client configuration.
+        
+        Returns:
+            httpx.AsyncClient: The client.
+        """
+        import httpx
+        
+        loop = asyncio.get_running_loop()
+        key = json.dumps(settings, sort_keys=True)
+        with self._lock:
+            clients = self._async_clients.setdefault(loop, {})
+            if key not in clients:
+                clients[key] = httpx.AsyncClient(**self._get_client_options(settings))
+            return clients[key]
+
+
+# The pool shared by all services
+http_client_pool = HttpClientPool()
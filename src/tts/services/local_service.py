@@ -0,0 +1,259 @@
+import concurrent.futures
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from .base_service import BaseTTSService
+
+
+# Speech engine of the current worker process, created once per process
+_worker_engine = None
+# Why the speech engine of the current worker process could not be created
+_worker_error = None
+
+
+def _initialize_worker():
+    """Create the speech engine of a worker process.
+    
+    An engine that fails to start, e.g. because eSpeak is not installed, is
+    reported by the tasks of the worker instead of breaking the whole pool.
+    """
+    global _worker_engine, _worker_error
+    try:
+        import pyttsx3
+        _worker_engine = pyttsx3.init()
+    except Exception as e:
+        _worker_engine, _worker_error = None, e
+
+
+def _get_engine():
+    """Get the speech engine of the worker process.
+    
+    Raises:
+        RuntimeError: If the engine could not be started.
+    """
+    if _worker_engine is None:
+        raise RuntimeError(f"The system speech engine could not be started ({_worker_error})")
+    return _worker_engine
+
+
+def _probe_worker():
+    """Check that the speech engine of a worker works, starting the worker ahead of time."""
+    _get_engine()
+    return True
+
+
+def _list_voices():
+    """List the voices of the speech engine of the worker process.
+    
+    Returns:
+        list: (id, name, languages, gender) tuples.
+    """
+    voices = []
+    for voice in _get_engine().getProperty("voices"):
+        # Some engines report languages as bytes prefixed with a length byte
+        languages = [
+            language[1:].decode("ascii", "replace") if isinstance(language, bytes) else str(language)
+            for language in voice.languages or []
+        ]
+        voices.append((voice.id, voice.name or voice.id, languages, voice.gender or ""))
+    return voices
+
+
+def _render_speech(text, output_file, voice_id, rate, volume):
+    """Render text to an audio file with the speech engine of the worker process.
+    
+    Args:
+        text (str): The text to convert to speech.
+        output_file (str): Where to save the audio.
+        voice_id (str): The engine voice to use, or "" for the system default.
+        rate (int): The speaking rate in words per minute.
+        volume (float): The volume, from 0.0 to 1.0.
+    """
+    engine = _get_engine()
+    if voice_id:
+        engine.setProperty("voice", voice_id)
+    engine.setProperty("rate", rate)
+    engine.setProperty("volume", volume)
+    engine.save_to_file(text, output_file)
+    engine.runAndWait()
+    
+    if not os.path.exists(output_file) or os.path.getsize(output_file) == 0:
+        raise RuntimeError("The speech engine did not produce any audio")
+
+
+class LocalService(BaseTTSService):
+    """Service class for offline text-to-speech using the system speech engine.
+    
+    Synthesis runs in a pool of worker processes, each holding its own
+    pyttsx3 engine (eSpeak NG on Linux, SAPI5 on Windows, NSSpeechSynthesizer
+    on macOS). The engines are not thread-safe, and separate processes let
+    the segments of long texts render on several cores in parallel.
+    """
+    
+    AUDIO_FIELDS = ("voice_id", "rate", "volume", "file_extension")
+    
+    # How long a request waits for the first worker to start its speech engine
+    PROBE_TIMEOUT_SECONDS = 30
+    
+    UNAVAILABLE_MESSAGE = (
+        "Local TTS is not available. Please install the pyttsx3 package "
+        "and a system speech engine (eSpeak NG on Linux)."
+    )
+    
+    def __init__(self, config_manager, output_store=None):
+        """Initialize the local service.
+        
+        Args:
+            config_manager (ConfigManager): The configuration manager instance.
+            output_store (OutputStore, optional): Where generated audio files are stored.
+        """
+        self._probe = None
+        super().__init__(config_manager, output_store)
+    
+    def _initialize_client(self):
+        """Start the worker process pool, if pyttsx3 is installed."""
+        try:
+            import pyttsx3  # noqa: F401 - only checks that the engine is available
+        except ImportError:
+            self.client = None
+            return
+        
+        # Spawned workers don't inherit the UI threads and locks of this process
+        self.client = ProcessPoolExecutor(
+            max_workers=os.cpu_count() or 1,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_initialize_worker,
+        )
+        # Start the first worker now, so the first request doesn't pay for it,
+        # and find out whether its speech engine works
+        self._probe = self.client.submit(_probe_worker)
+    
+    def is_initialized(self):
+        """Check if the worker processes can run the system speech engine.
+        
+        Doesn't wait, since it is called from the UI thread: while the first
+        worker is still starting its engine the service counts as initialized,
+        and requests wait for the engine in _wait_for_engine.
+        
+        Returns:
+            bool: True if speech can be synthesized, False otherwise.
+        """
+        if self.client is not None and not self._probe.done():
+            return True
+        return self._wait_for_engine(timeout=0)
+    
+    def _wait_for_engine(self, timeout):
+        """Wait for the first worker to start its speech engine.
+        
+        If the engine can't start, the worker pool is shut down.
+        
+        Args:
+            timeout (float): Seconds to wait.
+        
+        Returns:
+            bool: True if the engine has started, False if it failed or is still starting.
+        """
+        client, probe = self.client, self._probe
+        if client is None:
+            return False
+        try:
+            probe.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            return False
+        except Exception:
+            self.close()
+            return False
+        return True
+    
+    def close(self):
+        """Shut down the worker processes."""
+        client, self.client = self.client, None
+        if client is not None:
+            client.shutdown(wait=False, cancel_futures=True)
+    
+    def get_character_usage(self):
+        """Get character usage of the local engine.
+        
+        Local synthesis is free and unlimited, so usage is not tracked.
+        
+        Returns:
+            tuple: A tuple containing (-1, -1) to indicate no usage tracking.
+        """
+        return -1, -1
+    
+    def list_voices(self, etag=None):
+        """List the voices installed for the system speech engine.
+        
+        Args:
+            etag (str, optional): Ignored.
+        
+        Returns:
+            tuple: (voices, None)
+        
+        Raises:
+            RuntimeError: If the speech engine is not available.
+        """
+        if not self._wait_for_engine(self.PROBE_TIMEOUT_SECONDS):
+            raise RuntimeError(self.UNAVAILABLE_MESSAGE)
+        try:
+            engine_voices = self.client.submit(_list_voices).result()
+        except Exception as e:
+            raise RuntimeError(f"Error listing local voices: {str(e)}")
+        
+        voices = [
+            {"id": voice_id, "name": name, "languages": languages, "gender": str(gender), "description": ""}
+            for voice_id, name, languages, gender in engine_voices
+        ]
+        return voices, None
+    
+    def synthesize_speech(self, text, output_file=None, tts_params=None):
+        """Synthesize speech using the local speech engine.
+        
+        Args:
+            text (str): The text to convert to speech.
+            output_file (Path, optional): Where to save the audio.
+                                          If None, uses get_output_file_path().
+            tts_params (dict, optional): Synthesis parameters to use.
+                                         If None, uses the service configuration.
+        
+        Returns:
+            Path: The path to the saved audio file.
+        
+        Raises:
+            RuntimeError: If there's an error during synthesis.
+        """
+        if not self._wait_for_engine(self.PROBE_TIMEOUT_SECONDS):
+            raise RuntimeError(self.UNAVAILABLE_MESSAGE)
+        
+        tts_params = self.get_tts_params(tts_params)
+        if output_file is None:
+            output_file = self.get_output_file_path(tts_params.get("file_extension", ".wav"))
+        
+        # The engine writes to a path, so render next to the output and move it into place
+        output_file = Path(output_file)
+        temp_file = output_file.with_name(f".{output_file.stem}.{os.getpid()}.render{output_file.suffix}")
+        try:
+            future = self.client.submit(
+                _render_speech,
+                text,
+                str(temp_file),
+                tts_params.get("voice_id", ""),
+                int(tts_params.get("rate", 200)),
+                float(tts_params.get("volume", 1.0)),
+            )
+            future.result()
+            os.replace(temp_file, output_file)
+            return output_file
+        
+        except BrokenProcessPool as e:
+            # A worker died (e.g. the engine crashed); start a fresh pool for the next request
+            self.close()
+            self._initialize_client()
+            raise RuntimeError(f"Error during local TTS synthesis: the speech engine stopped unexpectedly ({e})")
+        except Exception as e:
+            raise RuntimeError(f"Error during local TTS synthesis: {str(e)}")
+        finally:
+            temp_file.unlink(missing_ok=True)
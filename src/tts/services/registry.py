@@ -0,0 +1,255 @@
+import copy
+import importlib
+from collections import OrderedDict
+from importlib.metadata import entry_points
+
+
+# Capabilities assumed for a service that doesn't declare them
+DEFAULT_CAPABILITIES = {
+    "streaming": False,  # Implements stream_speech for playback while downloading
+    "batch": False,  # Has a native API for rendering very large inputs in one job
+    "usage_tracking": False,  # Reports character usage through get_character_usage
+    "voice_catalogue": False,  # Lists the available voices through list_voices
+    "max_request_size": 5000,  # Largest text per request, as measured by measure_text
+    # Request limits of the provider, enforced by the request scheduler (None is unlimited)
+    "rate_limit": {"requests_per_second": None, "burst": 1, "max_concurrency": None},
+}
+
+
+def _import_object(path):
+    """Import an object from a "package.module:Name" path."""
+    module_name, _, attribute = path.partition(":")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+class ServiceSpec:
+    """Declaration of a TTS service whose implementation is imported on demand."""
+    
+    def __init__(self, name, service_class, default_config, capabilities=None, settings_panel=None):
+        """Initialize the service declaration.
+        
+        Args:
+            name (str): The display name of the service, also used as its config key.
+            service_class: The BaseTTSService subclass, or a "package.module:Class"
+                           path so the provider SDK is only imported when selected.
+            default_config (dict): The default service configuration.
+            capabilities (dict, optional): Declared capabilities, see DEFAULT_CAPABILITIES.
+            settings_panel: The settings panel class or its "package.module:Class" path.
+                            It is created with (parent, app) and must provide grid,
+                            grid_remove, load_settings and get_settings.
+        """
+        self.name = name
+        self.default_config = default_config
+        self.capabilities = {**DEFAULT_CAPABILITIES, **(capabilities or {})}
+        self._service_class = service_class
+        self._settings_panel = settings_panel
+    
+    def load_service_class(self):
+        """Import and return the service class.
+        
+        Returns:
+            type: The BaseTTSService subclass implementing the service.
+        """
+        if isinstance(self._service_class, str):
+            self._service_class = _import_object(self._service_class)
+        return self._service_class
+    
+    def load_settings_panel(self):
+        """Import and return the settings panel class.
+        
+        Returns:
+            type: The settings panel class, or None if the service has no settings.
+        """
+        if isinstance(self._settings_panel, str):
+            self._settings_panel = _import_object(self._settings_panel)
+        return self._settings_panel
+
+
+class ServiceRegistry:
+    """Registry of the available TTS services, in display order."""
+    
+    # Entry point group third-party packages can use to register services
+    ENTRY_POINT_GROUP = "saythis.services"
+    
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._specs = OrderedDict()
+    
+    def register(self, spec):
+        """Register a service, replacing any service with the same name.
+        
+        Args:
+            spec (ServiceSpec): The service declaration.
+        
+        Returns:
+            ServiceSpec: The registered declaration.
+        """
+        self._specs[spec.name] = spec
+        return spec
+    
+    def get(self, name):
+        """Get the declaration of a service.
+        
+        Args:
+            name (str): The service name.
+        
+        Returns:
+            ServiceSpec: The service declaration.
+        
+        Raises:
+            ValueError: If no service with that name is registered.
+        """
+        if name not in self._specs:
+            raise ValueError(f"Unsupported TTS service: {name}")
+        return self._specs[name]
+    
+    def names(self):
+        """Get the names of all registered services.
+        
+        Returns:
+            list: The service names, in registration order.
+        """
+        return list(self._specs)
+    
+    def get_default_configs(self):
+        """Get the default configuration of every registered service.
+        
+        Returns:
+            dict: A copy of each default configuration, keyed by service name.
+        """
+        return {name: copy.deepcopy(spec.default_config) for name, spec in self._specs.items()}
+    
+    def load_entry_points(self):
+        """Register services published by installed packages.
+        
+        Each entry point in the "saythis.services" group must resolve to a
+        ServiceSpec, or to a callable returning one. Only the module defining
+        the entry point is imported, so it should declare the service class
+        by its import path to keep startup fast.
+        """
+        all_entry_points = entry_points()
+        if hasattr(all_entry_points, "select"):
+            group = all_entry_points.select(group=self.ENTRY_POINT_GROUP)
+        else:
+            group = all_entry_points.get(self.ENTRY_POINT_GROUP, [])
+        
+        for entry_point in group:
+            try:
+                spec = entry_point.load()
+                self.register(spec() if callable(spec) else spec)
+            except Exception as e:
+                print(f"Warning: Could not load TTS service '{entry_point.name}' ({e}).")
+
+
+service_registry = ServiceRegistry()
+
+
+def register_service(name, default_config, capabilities=None, settings_panel=None, registry=None):
+    """Class decorator registering a BaseTTSService subclass.
+    
+    Args:
+        name (str): The display name of the service.
+        default_config (dict): The default service configuration.
+        capabilities (dict, optional): Declared capabilities, see DEFAULT_CAPABILITIES.
+        settings_panel (optional): The settings panel class or its import path.
+        registry (ServiceRegistry, optional): The registry to add the service to.
+                                              Defaults to the global registry.
+    
+    Returns:
+        callable: The class decorator.
+    """
+    def decorator(service_class):
+        (registry or service_registry).register(
+            ServiceSpec(name, service_class, default_config, capabilities, settings_panel)
+        )
+        return service_class
+    return decorator
+
+
+# Built-in services are declared by import path so their SDKs load only when selected
+service_registry.register(ServiceSpec(
+    "ElevenLabs",
+    "tts.services.elevenlabs_service:ElevenLabsService",
+    default_config={
+        "api_key": "",
+        "voice_id": "yj30vwTGJxSHezdAGsv9",
+        "model_id": "eleven_turbo_v2_5",
+        "output_format": "mp3_22050_32",
+        "file_extension": ".mp3",
+        "streaming": False,
+        "voice_settings": {
+            "stability": 0.5,
+            "similarity_boost": 0.75,
+            "style": 0.0,
+            "use_speaker_boost": True,
+            "speed": 1.0
+        }
+    },
+    capabilities={
+        "streaming": True,
+        "usage_tracking": True,
+        "voice_catalogue": True,
+        "max_request_size": 3000,
+        # ElevenLabs limits concurrent requests per plan (2 on the free tier, more on paid plans)
+        "rate_limit": {"requests_per_second": None, "burst": 1, "max_concurrency": 4},
+    },
+    settings_panel="ui.settings.components.elevenlabs_settings:ElevenLabsSettings",
+))
+
+service_registry.register(ServiceSpec(
+    "Google Cloud",
+    "tts.services.google_cloud_service:GoogleCloudService",
+    default_config={
+        "service_account_json_path": "",
+        "language_code": "en-US",
+        "voice_name": "en-US-Wavenet-D",
+        "voice_gender": "NEUTRAL",
+        "audio_encoding": "MP3",
+        "speaking_rate": 1.0,
+        "pitch": 0.0,
+        "volume_gain_db": 0.0,
+        "file_extension": ".mp3",
+        # Very large texts are rendered by one long audio operation that writes to Cloud Storage
+        "long_audio": {
+            "enabled": False,
+            "output_gcs_uri": "",
+            "location": "global",
+            "threshold_bytes": 20000,
+            "poll_interval": 5.0
+        },
+        # One connection is kept open and warmed up so requests skip the connection setup
+        "connection": {
+            "warm_up": True,
+            "keepalive_seconds": 60,
+            "token_refresh_margin_seconds": 300
+        }
+    },
+    capabilities={
+        "batch": True,
+        "voice_catalogue": True,
+        # The synthesize_speech RPC accepts at most 5000 bytes of input text
+        "max_request_size": 5000,
+        # The default quota is 1000 synthesize requests per minute
+        "rate_limit": {"requests_per_second": 15, "burst": 15, "max_concurrency": None},
+    },
+    settings_panel="ui.settings.components.google_cloud_settings:GoogleCloudSettings",
+))
+
+service_registry.register(ServiceSpec(
+    "Local",
+    "tts.services.local_service:LocalService",
+    default_config={
+        "voice_id": "",
+        "rate": 200,
+        "volume": 1.0,
+        "file_extension": ".wav"
+    },
+    capabilities={
+        "voice_catalogue": True,
+        # Smaller requests let long texts render on several worker processes at once
+        "max_request_size": 1000,
+    },
+    settings_panel="ui.settings.components.local_settings:LocalSettings",
+))
+
+service_registry.load_entry_points()
@@ -0,0 +1,132 @@
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .text_segmenter import TextSegmenter
+
+
+class SpeculativeSynthesizer:
+    """Synthesizes the completed sentences of a message while it is being typed.
+    
+    Speculative audio goes straight into the synthesis cache, sentence by
+    sentence. When the message is generated, only the sentences that are not
+    cached yet (usually the last one) are synthesized, and all of them are
+    stitched into one file by TextToSpeech.synthesize_sentences. Sentences
+    that are edited away are wasted, so the characters sent speculatively
+    between two generate requests are capped by a budget.
+    """
+    
+    _SENTENCE_END = re.compile(r"[.!?…。！？][\"'”’)\]]*$")
+    
+    def __init__(self, tts_engine):
+        """Initialize the speculative synthesizer.
+        
+        Args:
+            tts_engine (TextToSpeech): The engine that synthesizes and caches the sentences.
+        """
+        self.tts_engine = tts_engine
+        self.config_manager = tts_engine.config_manager
+        self._executor = None
+        self._lock = threading.Lock()
+        # Speculative requests keyed by sentence
+        self._futures = {}
+        # Characters sent speculatively since the last generate request
+        self._spent = 0
+    
+    def is_enabled(self):
+        """Check if speculative synthesis is enabled and can be used.
+        
+        Returns:
+            bool: True if enabled, the synthesis cache is enabled and the service is ready.
+        """
+        return (
+            self.config_manager.get_speculation_config()["enabled"]
+            and self.config_manager.get_cache_config()["enabled"]
+            and self.tts_engine.is_service_initialized()
+        )
+    
+    @classmethod
+    def get_completed_sentences(cls, text):
+        """Get the sentences of a message that the user has finished typing.
+        
+        The last sentence counts as finished once it ends with terminal
+        punctuation followed by whitespace.
+        
+        Args:
+            text (str): The message being typed.
+        
+        Returns:
+            list: The completed sentences in order.
+        """
+        sentences = TextSegmenter.split_message(text)
+        if sentences and not (text[-1:].isspace() and cls._SENTENCE_END.search(sentences[-1])):
+            sentences.pop()
+        return sentences
+    
+    def update(self, text):
+        """Start synthesizing the completed sentences of a message in the background.
+        
+        Called when the user pauses typing. Queued requests for sentences that
+        are no longer in the message are cancelled, and their characters are
+        returned to the budget.
+        
+        Args:
+            text (str): The current message.
+        """
+        if not self.is_enabled() or self.tts_engine.needs_segmentation(text):
+            return
+        config = self.config_manager.get_speculation_config()
+        sentences = self.get_completed_sentences(text)
+        
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=config["max_workers"], thread_name_prefix="speculative-synthesis"
+                )
+            
+            wanted = set(sentences)
+            for sentence, future in list(self._futures.items()):
+                if sentence not in wanted and future.cancel():
+                    del self._futures[sentence]
+                    self._spent -= len(sentence)
+            
+            for sentence in sentences:
+                if sentence in self._futures or self.tts_engine.is_cached(sentence):
+                    continue
+                if self._spent + len(sentence) > config["max_characters"]:
+                    break
+                self._spent += len(sentence)
+                self._futures[sentence] = self._executor.submit(self.tts_engine.synthesize_into_cache, sentence)
+    
+    def synthesize(self, text, audio_sink=None):
+        """Convert a message to speech, reusing the sentences synthesized while it was typed.
+        
+        Falls back to a single request for the whole message when none of its
+        sentences were synthesized ahead of time or are cached. Stitched audio
+        is not streamed.
+        
+        Args:
+            text (str): The message.
+            audio_sink (optional): Receives PCM audio as it arrives when the
+                                   whole message is streamed.
+        
+        Returns:
+            Path: The path to the saved audio file.
+        
+        Raises:
+            RuntimeError: If synthesis fails or the request would exceed the character limit.
+        """
+        with self._lock:
+            futures, self._futures = self._futures, {}
+            # Speculation for the next message starts with a fresh budget
+            self._spent = 0
+        
+        return self.tts_engine.synthesize_sentences(text, audio_sink, pending=futures)
+    
+    def shutdown(self):
+        """Cancel queued speculative requests and stop the worker threads."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._futures = {}
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,214 @@
+import hashlib
+import json
+import re
+import shutil
+import threading
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+
+from .audio_result import AudioResult
+from .output_store import OutputStore
+
+
+class SynthesisCache:
+    """Disk-backed, content-addressed cache of synthesized audio files with LRU eviction."""
+
+    def __init__(self, cache_dir, max_bytes, max_entries):
+        """Initialize the synthesis cache.
+        
+        Args:
+            cache_dir (Path): Directory where cached audio files are stored.
+            max_bytes (int): Maximum total size of the cached files in bytes.
+            max_entries (int): Maximum number of cached files.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._load_entries()
+
+    @staticmethod
+    def normalize_text(text):
+        """Normalize text so that insignificant whitespace differences share a cache entry.
+        
+        Args:
+            text (str): The text to normalize.
+        
+        Returns:
+            str: The normalized text.
+        """
+        text = unicodedata.normalize("NFC", text)
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+        lines = [re.sub(r"[ \t\f\v]+", " ", line).strip() for line in text.split("\n")]
+        return "\n".join(lines).strip()
+
+    @classmethod
+    def make_key(cls, service_name, text, service_config, audio_fields):
+        """Build the cache key for a synthesis request.
+        
+        Only the config fields that change the audio are part of the key, so
+        settings such as streaming don't invalidate the cached entries.
+        
+        Args:
+            service_name (str): The name of the TTS service.
+            text (str): The text to synthesize.
+            service_config (dict): The service configuration used for synthesis.
+            audio_fields (iterable): Config fields that change the synthesized audio,
+                                     such as the voice, model and output format.
+        
+        Returns:
+            str: A hex digest identifying the request.
+        """
+        voice_params = {field: service_config.get(field) for field in audio_fields}
+        payload = json.dumps(
+            [service_name, cls.normalize_text(text), voice_params],
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _load_entries(self):
+        """Index the files already in the cache directory, least recently used first."""
+        files = [path for path in self.cache_dir.iterdir() if path.is_file() and not path.name.endswith(".tmp")]
+        files.sort(key=lambda path: path.stat().st_mtime_ns)
+        for path in files:
+            size = path.stat().st_size
+            self._entries[path.stem] = (path, size)
+            self._total_bytes += size
+        self._evict()
+
+    def get(self, key, suffix=None):
+        """Look up a cached audio file and mark it as recently used.
+        
+        Args:
+            key (str): The cache key from make_key.
+            suffix (str, optional): The file extension the caller needs, e.g. ".mp3".
+                                    Audio cached in another format counts as a miss.
+        
+        Returns:
+            Path: The cached audio file, or None on a cache miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not entry[0].exists():
+                self._remove(key)
+                entry = None
+
+            if entry is None or (suffix is not None and entry[0].suffix != suffix):
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._entries.move_to_end(key)
+            try:
+                # The file modification time doubles as the persisted access time
+                entry[0].touch()
+            except OSError:
+                pass
+            return entry[0]
+
+    def contains(self, key, suffix=None):
+        """Check if audio is cached for a key, without counting a hit or miss.
+        
+        Args:
+            key (str): The cache key from make_key.
+            suffix (str, optional): The file extension the caller needs.
+        
+        Returns:
+            bool: True if the cache holds audio for the key, in the given format if any.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            return (
+                entry is not None
+                and (suffix is None or entry[0].suffix == suffix)
+                and entry[0].exists()
+            )
+
+    def put(self, key, source_file):
+        """Store a copy of a synthesized audio file in the cache.
+        
+        Args:
+            key (str): The cache key from make_key.
+            source_file (Path or AudioResult): The audio to cache.
+        
+        Returns:
+            Path: The path of the cached copy.
+        """
+        if not isinstance(source_file, AudioResult):
+            source_file = Path(source_file)
+        cached_file = self.cache_dir / f"{key}{source_file.suffix}"
+
+        # Each writer gets its own temporary file, so concurrent puts of a key don't collide
+        with OutputStore.atomic_write(cached_file) as out:
+            if isinstance(source_file, AudioResult):
+                # Copied from memory, without writing the result to the output store
+                out.write(source_file.get_buffer())
+            else:
+                with open(source_file, "rb") as f:
+                    shutil.copyfileobj(f, out)
+            size = out.tell()
+
+        with self._lock:
+            if key in self._entries:
+                previous_file, previous_size = self._entries[key]
+                self._total_bytes -= previous_size
+                if previous_file != cached_file:
+                    # The same request cached before in another format, e.g. streamed as WAV
+                    try:
+                        previous_file.unlink(missing_ok=True)
+                    except OSError:
+                        pass
+            self._entries[key] = (cached_file, size)
+            self._entries.move_to_end(key)
+            self._total_bytes += size
+            self._evict()
+        return cached_file
+
+    def _remove(self, key):
+        """Remove an entry from the cache. Must be called with the lock held."""
+        path, size = self._entries.pop(key)
+        self._total_bytes -= size
+        try:
+            path.unlink(missing_ok=True)
+        except OSError:
+            # The file may still be open for playback; it will be replaced on the next put
+            pass
+
+    def _evict(self):
+        """Evict least recently used entries until the cache is within its limits."""
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes
+        ):
+            self._remove(next(iter(self._entries)))
+
+    def get_stats(self):
+        """Get cache statistics.
+        
+        Returns:
+            dict: Entry count, total size, limits and hit/miss counters.
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "total_bytes": self._total_bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def clear(self):
+        """Remove every cached audio file and reset the hit/miss counters."""
+        with self._lock:
+            for key in list(self._entries):
+                self._remove(key)
+            self.hits = 0
+            self.misses = 0
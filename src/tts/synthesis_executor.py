@@ -0,0 +1,80 @@
+import threading
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+
+
+class SynthesisExecutor:
+    """Runs synthesis requests on a background thread so callers never block on network I/O."""
+    
+    def __init__(self, max_workers=1):
+        """Initialize the synthesis executor.
+        
+        Args:
+            max_workers (int): Maximum number of requests synthesized at the same time.
+        """
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="synthesis")
+        self._lock = threading.Lock()
+        self._current = None
+
+    def submit(self, fn, *args, **kwargs):
+        """Submit a synthesis call, cancelling the previous in-flight request.
+        
+        Args:
+            fn (callable): The blocking synthesis function to run.
+            *args: Positional arguments passed to fn.
+            **kwargs: Keyword arguments passed to fn.
+        
+        Returns:
+            Future: A future resolved with the return value of fn. If the request is
+                    superseded before it finishes, the future is cancelled or resolves
+                    with a CancelledError.
+        """
+        future = Future()
+        cancel_event = threading.Event()
+
+        with self._lock:
+            self._cancel_locked()
+            self._current = (future, cancel_event)
+
+        self._executor.submit(self._run, future, cancel_event, fn, args, kwargs)
+        return future
+
+    def cancel_current(self):
+        """Cancel the in-flight request, if any.
+        
+        A request that has not started yet is dropped. A request that is already
+        talking to the service runs to completion, but its result is discarded.
+        """
+        with self._lock:
+            self._cancel_locked()
+
+    def _cancel_locked(self):
+        """Cancel the current request. Must be called with the lock held."""
+        if self._current is not None:
+            future, cancel_event = self._current
+            cancel_event.set()
+            future.cancel()
+            self._current = None
+
+    def _run(self, future, cancel_event, fn, args, kwargs):
+        """Run a synthesis call on a worker thread and resolve its future."""
+        if not future.set_running_or_notify_cancel():
+            return
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(CancelledError() if cancel_event.is_set() else e)
+        else:
+            if cancel_event.is_set():
+                future.set_exception(CancelledError())
+            else:
+                future.set_result(result)
+        finally:
+            with self._lock:
+                if self._current is not None and self._current[0] is future:
+                    self._current = None
+
+    def shutdown(self):
+        """Cancel pending work and stop the worker threads without waiting for them."""
+        self.cancel_current()
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,154 @@
+import re
+
+
+class TextSegmenter:
+    """Splits long text into segments that fit within a maximum request size.
+    
+    Text is split at the coarsest boundary that makes every segment fit:
+    paragraphs first, then sentences, clauses and words. Only a single word
+    longer than the maximum size is ever cut in the middle.
+    """
+    
+    _PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+    _SENTENCE_BREAK = re.compile(
+        r"(?<=[.!?…][\"'”’)\]])\s+|(?<=[.!?…])\s+|(?<=[。！？])\s*"
+    )
+    _CLAUSE_BREAK = re.compile(r"(?<=[,;:])\s+|(?<=[，；：])\s*")
+    
+    def __init__(self, max_size, measure=len):
+        """Initialize the text segmenter.
+        
+        Args:
+            max_size (int): Maximum size of a segment.
+            measure (callable): Function returning the size of a string, in the
+                                same unit as max_size. Must be additive, e.g. the
+                                number of characters or UTF-8 bytes.
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self.measure = measure
+        
+        # Boundaries from coarsest to finest, with the separator used to rejoin pieces
+        self._splitters = [
+            (self.split_paragraphs, "\n\n"),
+            (self.split_sentences, " "),
+            (self.split_clauses, " "),
+            (str.split, " "),
+        ]
+    
+    @classmethod
+    def split_paragraphs(cls, text):
+        """Split text into paragraphs separated by blank lines.
+        
+        Args:
+            text (str): The text to split.
+        
+        Returns:
+            list: The non-empty paragraphs.
+        """
+        return [part.strip() for part in cls._PARAGRAPH_BREAK.split(text) if part.strip()]
+    
+    @classmethod
+    def split_sentences(cls, text):
+        """Split text into sentences at terminal punctuation.
+        
+        Args:
+            text (str): The text to split.
+        
+        Returns:
+            list: The non-empty sentences.
+        """
+        return [part.strip() for part in cls._SENTENCE_BREAK.split(text) if part.strip()]
+    
+    @classmethod
+    def split_message(cls, text):
+        """Split a message into its sentences, paragraph by paragraph.
+        
+        Args:
+            text (str): The message to split.
+        
+        Returns:
+            list: The sentences of all paragraphs, in order.
+        """
+        return [
+            sentence
+            for paragraph in cls.split_paragraphs(text)
+            for sentence in cls.split_sentences(paragraph)
+        ]
+    
+    @classmethod
+    def split_clauses(cls, text):
+        """Split text into clauses at commas, semicolons and colons.
+        
+        Args:
+            text (str): The text to split.
+        
+        Returns:
+            list: The non-empty clauses.
+        """
+        return [part.strip() for part in cls._CLAUSE_BREAK.split(text) if part.strip()]
+    
+    def split(self, text):
+        """Split text into segments no larger than the maximum size.
+        
+        Args:
+            text (str): The text to split.
+        
+        Returns:
+            list: The segments in reading order. Text that already fits is
+                  returned unchanged as a single segment.
+        """
+        if not text.strip():
+            return []
+        return self._split_to_fit(text.strip(), 0)
+    
+    def _fits(self, text):
+        """Check if text fits within the maximum size."""
+        return self.measure(text) <= self.max_size
+    
+    def _split_to_fit(self, text, level):
+        """Split text at the given boundary level, recursing into pieces that are still too large."""
+        if self._fits(text):
+            return [text]
+        if level == len(self._splitters):
+            return self._hard_split(text)
+        
+        splitter, separator = self._splitters[level]
+        pieces = []
+        for part in splitter(text):
+            pieces.extend(self._split_to_fit(part, level + 1))
+        return self._pack(pieces, separator)
+    
+    def _pack(self, pieces, separator):
+        """Greedily join consecutive pieces while the result still fits."""
+        segments = []
+        current = None
+        for piece in pieces:
+            if current is None:
+                current = piece
+            elif self._fits(current + separator + piece):
+                current += separator + piece
+            else:
+                segments.append(current)
+                current = piece
+        if current is not None:
+            segments.append(current)
+        return segments
+    
+    def _hard_split(self, text):
+        """Cut text that has no usable boundaries into pieces of the maximum size."""
+        segments = []
+        current = ""
+        current_size = 0
+        for char in text:
+            char_size = self.measure(char)
+            if current and current_size + char_size > self.max_size:
+                segments.append(current)
+                current = ""
+                current_size = 0
+            current += char
+            current_size += char_size
+        if current:
+            segments.append(current)
+        return segments
@@ -1,32 +1,158 @@
-from .services.elevenlabs_service import ElevenLabsService
-from .services.google_cloud_service import GoogleCloudService
+import asyncio
+import shutil
+import tempfile
+import threading
+import wave
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from .audio_result import AudioResult
+from .audio_stitcher import AudioStitcher
+from .job_queue import JobQueue
+from .job_worker_pool import JobWorkerPool
+from .metrics import metrics
+from .output_store import OutputStore
+from .request_scheduler import RequestScheduler, ScheduledService
+from .segmented_synthesizer import SegmentedSynthesizer
+from .speculative_synthesizer import SpeculativeSynthesizer
+from .services.registry import service_registry
+from .synthesis_cache import SynthesisCache
+from .text_segmenter import TextSegmenter
+from .usage_tracker import UsageTracker
+from .voice_catalogue import VoiceCatalogue
 
 
 class TextToSpeech:
     """Class for handling text-to-speech conversion using multiple TTS services."""
     
-    def __init__(self, app, config_manager):
+    # Number of recent requests whose cache savings are kept for get_synthesis_report
+    MAX_SYNTHESIS_REPORTS = 100
+    
+    def __init__(self, app, config_manager, registry=None):
         """Initialize the TTS engine.
         
         Args:
             app (Application): The application instance.
             config_manager (ConfigManager): The configuration manager instance.
+            registry (ServiceRegistry, optional): The available services.
+                                                  Defaults to the global service registry.
         """
         self.app = app
         self.config_manager = config_manager
+        self.registry = registry or service_registry
+        self.service_spec = None
         self.service_instance = None
+        # The current service with its provider requests routed through the request scheduler
+        self.scheduled_service = None
+        self._service_pool = {}
+        self._service_pool_lock = threading.Lock()
+        self.output_store = OutputStore.from_config(config_manager)
+
+        cache_config = config_manager.get_cache_config()
+        self.synthesis_cache = SynthesisCache(
+            config_manager.get_data_dir() / "cache",
+            max_bytes=cache_config["max_bytes"],
+            max_entries=cache_config["max_entries"],
+        )
+        # Characters served from the synthesis cache instead of the service, since it was last cleared
+        self._characters_saved = 0
+        # Characters served from the cache for the latest requests, keyed by output path
+        self._synthesis_reports = OrderedDict()
+        self._reports_lock = threading.Lock()
+        self.usage_tracker = UsageTracker(config_manager.get_usage_config()["ttl_seconds"])
+        self.voice_catalogue = VoiceCatalogue(
+            config_manager.get_data_dir() / "voices",
+            config_manager.get_voice_catalogue_config()["ttl_seconds"],
+        )
+
+        scheduler_config = config_manager.get_scheduler_config()
+        self.request_scheduler = RequestScheduler(
+            self._get_rate_limits,
+            max_retries=scheduler_config["max_retries"],
+            base_delay=scheduler_config["base_delay"],
+            max_delay=scheduler_config["max_delay"],
+        )
+
+        job_config = config_manager.get_job_queue_config()
+        self.job_queue = JobQueue(config_manager.get_data_dir() / "jobs.db")
+        self.job_workers = JobWorkerPool(
+            self,
+            self.job_queue,
+            config_manager.get_data_dir() / "jobs",
+            concurrency=job_config["concurrency"],
+            poll_interval=job_config["poll_interval"],
+            lease_seconds=job_config["lease_seconds"],
+        )
+        self.speculative_synthesizer = SpeculativeSynthesizer(self)
         self.initialize_service()
 
     def initialize_service(self):
-        """Initialize the appropriate service client."""
+        """Initialize the appropriate service client.
+        
+        Initialized services are kept in a pool keyed on the service name and a
+        fingerprint of its credentials. Switching services or saving settings
+        that don't touch the credentials reuses the existing client and its
+        open connections; a client is only rebuilt when its credentials change,
+        and the client it replaces is closed.
+        """
         selected_service = self.config_manager.get_selected_service()
+        spec = self.registry.get(selected_service)
+        service_class = spec.load_service_class()
+        fingerprint = service_class.get_credential_fingerprint(self.config_manager.get_service_config())
 
-        if selected_service == "ElevenLabs":
-            self.service_instance = ElevenLabsService(self.config_manager)
-        elif selected_service == "Google Cloud":
-            self.service_instance = GoogleCloudService(self.config_manager)
-        else:
-            raise ValueError(f"Unsupported TTS service: {selected_service}")
+        replaced_service = None
+        with self._service_pool_lock:
+            service = self._service_pool.get(selected_service)
+            if service is None or service.credential_fingerprint != fingerprint:
+                replaced_service = service
+                with metrics.span("service.init", service=selected_service):
+                    service = service_class(self.config_manager, self.output_store)
+                service.credential_fingerprint = fingerprint
+                self._service_pool[selected_service] = service
+            self.service_spec = spec
+            self.service_instance = service
+            self.scheduled_service = ScheduledService(service, self.request_scheduler, selected_service)
+
+        # Closed outside the lock, closing a channel or a worker pool can block
+        if replaced_service is not None:
+            replaced_service.close()
+
+    def _get_rate_limits(self, service_name):
+        """Get the request limits of a service for the request scheduler.
+        
+        Args:
+            service_name (str): The service name.
+        
+        Returns:
+            dict: The limits declared by the service, with configured overrides applied.
+        """
+        overrides = self.config_manager.get_scheduler_config()["rate_limits"].get(service_name, {})
+        return {**self.registry.get(service_name).capabilities["rate_limit"], **overrides}
+
+    def get_scheduler_stats(self):
+        """Get the queue depth, wait-time and retry metrics of the request scheduler.
+        
+        Returns:
+            dict: The metrics of each service that has been used, keyed by service name.
+        """
+        return self.request_scheduler.get_stats()
+
+    def get_available_services(self):
+        """Get the names of all available TTS services.
+        
+        Returns:
+            list: The registered service names.
+        """
+        return self.registry.names()
+
+    def get_capabilities(self):
+        """Get the declared capabilities of the current TTS service.
+        
+        Returns:
+            dict: The capabilities, see services.registry.DEFAULT_CAPABILITIES.
+        """
+        return self.service_spec.capabilities
 
     def is_service_initialized(self):
         """Check if the current TTS service is properly initialized.
@@ -36,21 +162,836 @@ class TextToSpeech:
         """
         return self.service_instance is not None and self.service_instance.is_initialized()
 
-    def get_character_usage(self):
-        """Retrieve character usage and limit from the current TTS service.
+    def _get_account_key(self):
+        """Get the key identifying the account of the current service in the usage tracker and voice catalogue."""
+        return self.config_manager.get_selected_service(), self.service_instance.credential_fingerprint
+
+    def get_character_usage(self, refresh=False):
+        """Retrieve character usage and limit of the current TTS service.
+        
+        Usage is served from the usage tracker, which adds the characters of
+        every synthesized request to the last fetched count. The service is
+        only called when no usage is known yet or refresh is requested; stale
+        usage is returned as is and refreshed in the background.
+        
+        Args:
+            refresh (bool): Fetch the usage from the service even if it is cached.
         
         Returns:
             tuple: A tuple containing (character_count, character_limit).
+                   Returns (-1, -1) if the service does not track usage.
         """
-        return self.service_instance.get_character_usage()
+        if not self.get_capabilities()["usage_tracking"]:
+            return -1, -1
+        key = self._get_account_key()
+        fetch = self.scheduled_service.get_character_usage
+        usage = None if refresh else self.usage_tracker.get(key)
+        if usage is None:
+            return self.usage_tracker.refresh(key, fetch)
+        if self.usage_tracker.is_stale(key):
+            self.usage_tracker.refresh_in_background(key, fetch, force=False)
+        return usage
 
-    def synthesize_speech(self, text):
-        """Convert text to speech and save to a file.
+    async def get_character_usage_async(self, refresh=False):
+        """Retrieve character usage and limit without blocking the event loop.
+        
+        Args:
+            refresh (bool): Fetch the usage from the service even if it is cached.
+        
+        Returns:
+            tuple: A tuple containing (character_count, character_limit).
+                   Returns (-1, -1) if the service does not track usage.
+        """
+        if not self.get_capabilities()["usage_tracking"]:
+            return -1, -1
+        key = self._get_account_key()
+        usage = None if refresh or self.usage_tracker.is_stale(key) else self.usage_tracker.get(key)
+        if usage is None:
+            usage = await self.scheduled_service.get_character_usage_async()
+            self.usage_tracker.set(key, *usage)
+        return usage
+
+    def get_cached_character_usage(self):
+        """Get the known character usage without calling the service.
+        
+        Missing or stale usage is refreshed in the background, so this is safe
+        to call from the UI thread. After a failed refresh, the service is not
+        asked again for a while.
+        
+        Returns:
+            tuple: (character_count, character_limit), (-1, -1) if the service does
+                   not track usage, or None if the usage is not known yet.
+        """
+        if not self.get_capabilities()["usage_tracking"]:
+            return -1, -1
+        key = self._get_account_key()
+        if self.usage_tracker.is_stale(key):
+            self.usage_tracker.refresh_in_background(key, self.scheduled_service.get_character_usage, force=False)
+        return self.usage_tracker.get(key)
+
+    def refresh_character_usage(self, callback=None, force=True):
+        """Fetch the character usage of the current service in the background.
+        
+        Args:
+            callback (callable, optional): Called on a background thread with
+                                           (usage, error) once the usage is fetched.
+            force (bool): Fetch even if the last fetch failed recently. If not,
+                          the callback gets that error without calling the service.
+        """
+        if not self.get_capabilities()["usage_tracking"]:
+            if callback is not None:
+                callback((-1, -1), None)
+            return
+        self.usage_tracker.refresh_in_background(
+            self._get_account_key(), self.scheduled_service.get_character_usage, callback, force
+        )
+
+    def get_voices(self):
+        """Get the saved voice list of the current service without calling it.
+        
+        A missing or stale list is refreshed in the background. After a failed
+        refresh, the service is not asked again for a while.
+        
+        Returns:
+            list: The voices sorted by name, or None if the service does not
+                  list its voices or they were never fetched.
+        """
+        if not self.get_capabilities()["voice_catalogue"] or not self.is_service_initialized():
+            return None
+        key = self._get_account_key()
+        if self.voice_catalogue.is_stale(key):
+            self.voice_catalogue.refresh_in_background(key, self.scheduled_service.list_voices, force=False)
+        return self.voice_catalogue.get(key)
+    
+    def refresh_voices(self, callback=None, force=True):
+        """Fetch the voice list of the current service in the background.
+        
+        Args:
+            callback (callable, optional): Called on a background thread with
+                                           (voices, error) once the voices are fetched.
+            force (bool): Fetch even if the last fetch failed recently. If not,
+                          the callback gets that error without calling the service.
+        """
+        if not self.get_capabilities()["voice_catalogue"] or not self.is_service_initialized():
+            if callback is not None:
+                callback(None, None)
+            return
+        self.voice_catalogue.refresh_in_background(
+            self._get_account_key(), self.scheduled_service.list_voices, callback, force
+        )
+    
+    def search_voices(self, query):
+        """Find voices of the current service in its saved voice list.
+        
+        Args:
+            query (str): The search query; every word must start a word of the
+                         voice's id, name, gender, description or languages.
+        
+        Returns:
+            list: The matching voices sorted by name.
+        """
+        if not self.get_capabilities()["voice_catalogue"] or not self.is_service_initialized():
+            return []
+        return self.voice_catalogue.search(self._get_account_key(), query)
+    
+    def find_voice(self, voice_id):
+        """Look up a voice of the current service in its saved voice list.
+        
+        Args:
+            voice_id (str): The voice id stored in the service configuration.
+        
+        Returns:
+            dict: The voice, or None if it is unknown.
+        """
+        if not self.get_capabilities()["voice_catalogue"] or not self.is_service_initialized():
+            return None
+        return self.voice_catalogue.find(self._get_account_key(), voice_id)
+    
+    def check_character_quota(self, characters, wait_for_usage=False):
+        """Check a request against the character limit before sending it.
+        
+        The check uses the cached usage, so it needs no remote call. If the
+        usage is not known yet, it is fetched in the background and the request
+        is allowed, unless wait_for_usage is set.
+        
+        Args:
+            characters (int): The number of characters about to be synthesized.
+            wait_for_usage (bool): Fetch unknown usage before checking.
+        
+        Returns:
+            str: A warning if the request brings usage close to the limit, otherwise None.
+        
+        Raises:
+            RuntimeError: If the request would exceed the character limit and
+                          blocking is enabled in the character usage configuration.
+        """
+        if not self.get_capabilities()["usage_tracking"] or not self.is_service_initialized():
+            return None
+        usage_config = self.config_manager.get_usage_config()
+        usage = self.get_character_usage() if wait_for_usage else self.get_cached_character_usage()
+        if usage is None:
+            return None
+        
+        character_count, character_limit = usage
+        if character_limit <= 0:
+            return None
+        remaining = character_limit - character_count
+        if characters > remaining:
+            message = (
+                f"This request needs {characters} characters, but only {max(remaining, 0)} "
+                f"of your {character_limit} character limit remain."
+            )
+            if usage_config["block_over_limit"]:
+                raise RuntimeError(message)
+            return message
+        if character_count + characters >= usage_config["warning_ratio"] * character_limit:
+            return (
+                f"This request brings usage to {character_count + characters} "
+                f"of your {character_limit} character limit."
+            )
+        return None
+
+    def is_streaming_enabled(self):
+        """Check if audio should be streamed to the player while it is synthesized.
+        
+        Returns:
+            bool: True if streaming is enabled and supported by the current service.
+        """
+        return (
+            self.get_capabilities()["streaming"]
+            and self.config_manager.get_service_config().get("streaming", False)
+        )
+
+    def get_tts_params(self, overrides=None):
+        """Get the synthesis parameters for the current service.
+        
+        Args:
+            overrides (dict, optional): Values that take precedence over the service
+                                        configuration. Nested dictionaries such as
+                                        voice_settings are merged key by key.
+        
+        Returns:
+            dict: The effective synthesis parameters.
+        """
+        # Every request reads its parameters here, including the check for config file changes
+        with metrics.span("config.load"):
+            service_config = self.config_manager.get_service_config()
+            if not overrides:
+                return service_config
+            return self.config_manager.deep_merge(service_config, overrides)
+
+    def _get_max_segment_size(self, tts_params):
+        """Get the largest text the current service is sent in one request.
+        
+        Args:
+            tts_params (dict): The synthesis parameters.
+        
+        Returns:
+            int: The maximum size, in the unit of the service's measure_text.
+        """
+        max_request_size = self.service_instance.get_max_request_size(tts_params) or self.get_capabilities()["max_request_size"]
+        return min(max_request_size, self.config_manager.get_segmentation_config()["max_segment_size"])
+
+    def needs_segmentation(self, text, overrides=None):
+        """Check if a text is too large for one request to the current service.
+        
+        Args:
+            text (str): The text to convert to speech.
+            overrides (dict, optional): Synthesis parameters that take precedence
+                                        over the service configuration.
+        
+        Returns:
+            bool: True if the text has to be split into segments.
+        """
+        return self.service_instance.measure_text(text) > self._get_max_segment_size(self.get_tts_params(overrides))
+
+    def uses_batch(self, text, overrides=None):
+        """Check if a text is large enough to be rendered by the current service's batch API.
+        
+        Args:
+            text (str): The text to convert to speech.
+            overrides (dict, optional): Synthesis parameters that take precedence
+                                        over the service configuration.
+        
+        Returns:
+            bool: True if the text is sent to the batch API in one request
+                  instead of being split into segments.
+        """
+        return self._uses_batch(text, self.get_tts_params(overrides))
+
+    def _uses_batch(self, text, tts_params):
+        """Check if a text is rendered by the batch API with specific synthesis parameters."""
+        if not self.get_capabilities()["batch"]:
+            return False
+        threshold = self.service_instance.get_batch_threshold(tts_params)
+        return threshold is not None and self.service_instance.measure_text(text) > threshold
+
+    def split_text(self, text, overrides=None):
+        """Split a text into segments that fit in one request to the current service.
+        
+        Args:
+            text (str): The text to split.
+            overrides (dict, optional): Synthesis parameters that take precedence
+                                        over the service configuration.
+        
+        Returns:
+            list: The segment texts in order.
+        """
+        max_segment_size = self._get_max_segment_size(self.get_tts_params(overrides))
+        return TextSegmenter(max_segment_size, measure=self.service_instance.measure_text).split(text)
+
+    def get_file_extension(self, text, overrides=None):
+        """Get the file extension that the audio of a text is saved with.
+        
+        Args:
+            text (str): The text to convert to speech.
+            overrides (dict, optional): Synthesis parameters that take precedence
+                                        over the service configuration.
+        
+        Returns:
+            str: The configured file extension, or the extension of the format
+                 that joins without gaps if the text is split into segments.
+        """
+        tts_params = self.get_tts_params(overrides)
+        if self.needs_segmentation(text, overrides):
+            tts_params = self._get_stitching_params(tts_params)
+        return tts_params.get("file_extension", ".mp3")
+
+    def _get_stitching_params(self, tts_params, output_file=None):
+        """Get the synthesis parameters of a text that is synthesized in segments.
+        
+        The segments are requested in a format that joins without gaps, such
+        as WAV instead of MP3, unless output_file asks for another format.
+        
+        Args:
+            tts_params (dict): The synthesis parameters.
+            output_file (Path, optional): Where the stitched audio will be saved.
+        
+        Returns:
+            dict: The synthesis parameters for the segments and the stitched file.
+        """
+        overrides = self.service_instance.get_gapless_params(tts_params)
+        if not overrides or (output_file is not None and Path(output_file).suffix != overrides["file_extension"]):
+            return tts_params
+        return {**tts_params, **overrides}
+
+    def _synthesize_uncached(self, text, tts_params, output_file=None, audio_sink=None):
+        """Synthesize speech with the current service, bypassing the cache.
+        
+        Text above the batch threshold of the service is rendered by its batch
+        API. Other text larger than the segment size is split into segments
+        that are synthesized in parallel and stitched together. Batch and
+        segmented requests are not streamed. Segments are requested in a
+        format that joins without gaps. Every request goes through the
+        request scheduler, which applies the provider's rate limits and
+        retries transient errors.
         
         Args:
             text (str): The text to convert to speech.
+            tts_params (dict): The synthesis parameters.
+            output_file (Path, optional): Where to save the audio.
+            audio_sink (optional): Receives PCM audio as it arrives when streaming is enabled.
         
         Returns:
             Path: The path to the saved audio file.
         """
-        return self.service_instance.synthesize_speech(text)
+        service = self.scheduled_service
+        capabilities = self.get_capabilities()
+        segmentation_config = self.config_manager.get_segmentation_config()
+        max_segment_size = self._get_max_segment_size(tts_params)
+        if self._uses_batch(text, tts_params):
+            if output_file is None:
+                output_file = service.get_output_file_path(tts_params.get("file_extension", ".mp3"))
+            return asyncio.run(service.synthesize_batch_async(text, output_file, tts_params))
+        if service.measure_text(text) > max_segment_size:
+            tts_params = self._get_stitching_params(tts_params, output_file)
+            if output_file is None:
+                output_file = service.get_output_file_path(tts_params.get("file_extension", ".mp3"))
+            synthesizer = SegmentedSynthesizer(
+                service,
+                max_segment_size,
+                segmentation_config["max_workers"],
+                self.config_manager.get_data_dir() / "segments",
+            )
+            return synthesizer.synthesize(text, output_file, tts_params)
+
+        if audio_sink is not None and output_file is None and capabilities["streaming"] and tts_params.get("streaming", False):
+            return service.stream_speech(text, audio_sink, tts_params)
+        return service.synthesize_speech(text, output_file, tts_params)
+
+    def _get_cache_key(self, text, tts_params):
+        """Get the synthesis cache key of a request.
+        
+        Args:
+            text (str): The text to convert to speech.
+            tts_params (dict): The synthesis parameters.
+        
+        Returns:
+            str: The cache key, or None if the cache is disabled.
+        """
+        if not self.config_manager.get_cache_config()["enabled"]:
+            return None
+        return SynthesisCache.make_key(
+            self.config_manager.get_selected_service(),
+            text,
+            tts_params,
+            type(self.service_instance).get_audio_fields(tts_params),
+        )
+
+    def is_cached(self, text, overrides=None):
+        """Check if the synthesis cache holds audio for a request.
+        
+        Args:
+            text (str): The text to convert to speech.
+            overrides (dict, optional): Synthesis parameters that take precedence
+                                        over the service configuration.
+        
+        Returns:
+            bool: True if synthesizing the text would be a cache hit.
+        """
+        cache_key = self._get_cache_key(text, self.get_tts_params(overrides))
+        return cache_key is not None and self.synthesis_cache.contains(cache_key)
+
+    def get_cached_audio(self, text, tts_params, output_file=None):
+        """Get the cached audio of a request, copied to output_file if given.
+        
+        Args:
+            text (str): The text to convert to speech.
+            tts_params (dict): The synthesis parameters.
+            output_file (Path, optional): Where the caller wants the audio.
+        
+        Returns:
+            Path: The audio file, or None if the cache is disabled or has no
+                  audio for the request in the format of output_file.
+        """
+        return self._get_cached(self._get_cache_key(text, tts_params), output_file)
+
+    def cache_audio(self, text, tts_params, audio_file):
+        """Store the audio of a request in the synthesis cache, if it is enabled.
+        
+        Args:
+            text (str): The text the audio was synthesized from.
+            tts_params (dict): The synthesis parameters.
+            audio_file (Path): The synthesized audio.
+        """
+        cache_key = self._get_cache_key(text, tts_params)
+        if cache_key is not None:
+            self.synthesis_cache.put(cache_key, audio_file)
+
+    def _get_cached(self, cache_key, output_file=None):
+        """Get cached audio for a request, copied to output_file if given.
+        
+        Audio cached in another format than output_file, such as a streamed
+        request saved as WAV, is a cache miss.
+        
+        Args:
+            cache_key (str): The cache key, or None if the cache is disabled.
+            output_file (Path, optional): Where the caller wants the audio.
+        
+        Returns:
+            Path: The audio file, or None on a cache miss.
+        """
+        if cache_key is None:
+            return None
+        suffix = Path(output_file).suffix if output_file is not None else None
+        cached_file = self.synthesis_cache.get(cache_key, suffix)
+        if cached_file is None or output_file is None:
+            return cached_file
+        with OutputStore.atomic_write(output_file) as out, open(cached_file, "rb") as f:
+            shutil.copyfileobj(f, out)
+        return Path(output_file)
+
+    def synthesize_speech(self, text, audio_sink=None, output_file=None, overrides=None):
+        """Convert text to speech and save to a file.
+        
+        Requests with the same text and voice parameters as a previous request
+        are served from the synthesis cache without calling the service. Cache
+        hits are never streamed, since the complete file is already available.
+        Other requests are first checked against the cached character usage.
+        
+        With the sentence cache enabled, messages of several sentences that
+        share sentences with earlier requests are synthesized sentence by
+        sentence (see synthesize_sentences), so the shared sentences come
+        from the cache.
+        
+        Args:
+            text (str): The text to convert to speech.
+            audio_sink (optional): Receives PCM audio as it arrives when streaming is enabled.
+            output_file (Path, optional): Where to save the audio. If None, the
+                                          service picks the path.
+            overrides (dict, optional): Synthesis parameters that take precedence
+                                        over the service configuration.
+        
+        Returns:
+            Path or AudioResult: The saved audio file. Without an output_file,
+                                 fresh audio is returned in memory.
+        
+        Raises:
+            RuntimeError: If synthesis fails or the request would exceed the character limit.
+        """
+        tts_params = self.get_tts_params(overrides)
+        if self.config_manager.get_cache_config().get("sentence_level", False):
+            output_file, cached_characters = self._synthesize_by_sentence(text, tts_params, audio_sink, output_file)
+        else:
+            output_file, cached_characters = self._synthesize_whole(text, tts_params, audio_sink, output_file)
+        self._record_report(output_file, len(text), cached_characters)
+        return output_file
+
+    def synthesize_sentences(self, text, audio_sink=None, output_file=None, overrides=None, pending=None):
+        """Convert a message to speech sentence by sentence, reusing cached sentences.
+        
+        Each sentence is looked up in the synthesis cache on its own, only the
+        missing sentences are sent to the service (in parallel), and all of
+        them are stitched into one file. A message without any cached or
+        pending sentence is sent as one request, which keeps the intonation
+        across sentences and can be streamed.
+        
+        Args:
+            text (str): The message.
+            audio_sink (optional): Receives PCM audio as it arrives when the
+                                   whole message is streamed.
+            output_file (Path, optional): Where to save the audio. If None, the
+                                          service picks the path.
+            overrides (dict, optional): Synthesis parameters that take precedence
+                                        over the service configuration.
+            pending (dict, optional): Futures of requests already synthesizing
+                                      some sentences into the cache, keyed by
+                                      sentence. They are waited for instead of
+                                      sending the sentences again.
+        
+        Returns:
+            Path or AudioResult: The saved audio file.
+        
+        Raises:
+            RuntimeError: If synthesis fails or the request would exceed the character limit.
+        """
+        output_file, cached_characters = self._synthesize_by_sentence(
+            text, self.get_tts_params(overrides), audio_sink, output_file, pending
+        )
+        self._record_report(output_file, len(text), cached_characters)
+        return output_file
+
+    def synthesize_into_cache(self, text, overrides=None):
+        """Synthesize a text into the synthesis cache only, e.g. ahead of a request.
+        
+        The audio is written from memory into the cache, without an output
+        file, and no synthesis report is kept for it. Cached texts and a
+        disabled cache make this a no-op.
+        
+        Args:
+            text (str): The text to convert to speech.
+            overrides (dict, optional): Synthesis parameters that take precedence
+                                        over the service configuration.
+        
+        Raises:
+            RuntimeError: If synthesis fails or the request would exceed the character limit.
+        """
+        tts_params = self.get_tts_params(overrides)
+        cache_key = self._get_cache_key(text, tts_params)
+        if cache_key is None or self.synthesis_cache.contains(cache_key, tts_params.get("file_extension", ".mp3")):
+            return
+        self.check_character_quota(len(text))
+        usage_key = self._get_account_key()
+        audio = self._synthesize_uncached(text, tts_params)
+        self.usage_tracker.record(usage_key, len(text))
+        self.synthesis_cache.put(cache_key, audio)
+
+    def _synthesize_whole(self, text, tts_params, audio_sink=None, output_file=None):
+        """Synthesize a text in one request, through the synthesis cache.
+        
+        Returns:
+            tuple: (the audio file, the number of characters served from the cache).
+        """
+        cache_key = self._get_cache_key(text, tts_params)
+        cached_file = self._get_cached(cache_key, output_file)
+        if cached_file is not None:
+            return cached_file, len(text)
+
+        self.check_character_quota(len(text))
+        usage_key = self._get_account_key()
+        output_file = self._synthesize_uncached(text, tts_params, output_file, audio_sink)
+        self.usage_tracker.record(usage_key, len(text))
+        if cache_key is not None:
+            self.synthesis_cache.put(cache_key, output_file)
+        return output_file, 0
+
+    def _synthesize_by_sentence(self, text, tts_params, audio_sink=None, output_file=None, pending=None):
+        """Synthesize a message sentence by sentence through the synthesis cache.
+        
+        Falls back to one request for the whole message when it is a single
+        sentence, is cached as a whole, is too large for one request, or when
+        none of its sentences are cached or pending.
+        
+        Returns:
+            tuple: (the audio file, the number of characters served from the cache).
+        """
+        pending = pending or {}
+        sentences = TextSegmenter.split_message(text)
+        cache_key = self._get_cache_key(text, tts_params)
+        if (
+            cache_key is None
+            or len(sentences) < 2
+            or self.synthesis_cache.contains(cache_key)
+            or self.service_instance.measure_text(text) > self._get_max_segment_size(tts_params)
+        ):
+            return self._synthesize_whole(text, tts_params, audio_sink, output_file)
+        
+        # Sentences are stitched from files in the configured format
+        file_extension = tts_params.get("file_extension", ".mp3")
+        if not any(
+            sentence in pending
+            or self.synthesis_cache.contains(self._get_cache_key(sentence, tts_params), file_extension)
+            for sentence in sentences
+        ):
+            return self._synthesize_whole(text, tts_params, audio_sink, output_file)
+        
+        def synthesize_sentence(index, sentence):
+            future = pending.get(sentence)
+            if future is not None and not future.cancelled():
+                try:
+                    future.result()
+                except Exception:
+                    # Synthesized again below, e.g. after a network error
+                    pass
+            return self._synthesize_whole(sentence, tts_params, output_file=sentence_dir / f"{index:05d}{file_extension}")
+        
+        work_dir = self.config_manager.get_data_dir() / "segments"
+        work_dir.mkdir(parents=True, exist_ok=True)
+        sentence_dir = Path(tempfile.mkdtemp(dir=work_dir))
+        try:
+            # A sentence that recurs in the message is requested once and stitched at each position
+            distinct_sentences = list(dict.fromkeys(sentences))
+            max_workers = min(self.config_manager.get_segmentation_config()["max_workers"], len(distinct_sentences))
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sentence-synthesis") as pool:
+                results = dict(zip(
+                    distinct_sentences,
+                    pool.map(synthesize_sentence, range(len(distinct_sentences)), distinct_sentences),
+                ))
+            
+            if output_file is None:
+                output_file = self.output_store.new_path(file_extension)
+            AudioStitcher.concatenate([results[sentence][0] for sentence in sentences], output_file)
+        finally:
+            shutil.rmtree(sentence_dir, ignore_errors=True)
+        
+        self.synthesis_cache.put(cache_key, output_file)
+        # Repeats of a sentence are not sent to the service, so they count as cached
+        cached_characters = sum(cached for _, cached in results.values())
+        cached_characters += sum(len(sentence) for sentence in sentences) - sum(len(sentence) for sentence in results)
+        return output_file, cached_characters
+
+    def _record_report(self, audio, characters, cached_characters):
+        """Remember how many characters of a request were served from the cache."""
+        key = str(audio.path if isinstance(audio, AudioResult) else Path(audio))
+        with self._reports_lock:
+            self._characters_saved += cached_characters
+            self._synthesis_reports[key] = {"characters": characters, "cached_characters": cached_characters}
+            self._synthesis_reports.move_to_end(key)
+            while len(self._synthesis_reports) > self.MAX_SYNTHESIS_REPORTS:
+                self._synthesis_reports.popitem(last=False)
+
+    def get_synthesis_report(self, audio):
+        """Get how much of a recent request was served from the synthesis cache.
+        
+        Args:
+            audio: The Path or AudioResult returned for the request.
+        
+        Returns:
+            dict: The "characters" of the request and the "cached_characters"
+                  that were not sent to the service, or None if the request is
+                  not among the recent ones.
+        """
+        key = str(audio.path if isinstance(audio, AudioResult) else Path(audio))
+        with self._reports_lock:
+            return self._synthesis_reports.get(key)
+
+    async def synthesize_speech_async(self, text, output_file=None, overrides=None):
+        """Convert text to speech and save to a file, without blocking the event loop.
+        
+        Works like synthesize_speech, using the service's async client so that
+        many requests can be in flight on one event loop. Texts that have to be
+        split into segments, and messages synthesized sentence by sentence, run
+        on worker threads; texts for the batch API wait for it on the event loop.
+        
+        Args:
+            text (str): The text to convert to speech.
+            output_file (Path, optional): Where to save the audio. If None, the
+                                          service picks the path.
+            overrides (dict, optional): Synthesis parameters that take precedence
+                                        over the service configuration.
+        
+        Returns:
+            Path or AudioResult: The saved audio file. Without an output_file,
+                                 fresh audio is returned in memory.
+        
+        Raises:
+            RuntimeError: If synthesis fails or the request would exceed the character limit.
+        """
+        service = self.scheduled_service
+        tts_params = self.get_tts_params(overrides)
+        if (
+            self.config_manager.get_cache_config().get("sentence_level", False)
+            and len(TextSegmenter.split_message(text)) > 1
+            and service.measure_text(text) <= self._get_max_segment_size(tts_params)
+        ):
+            # Sentences are synthesized in parallel on worker threads
+            output_file, cached_characters = await asyncio.to_thread(
+                self._synthesize_by_sentence, text, tts_params, None, output_file
+            )
+            self._record_report(output_file, len(text), cached_characters)
+            return output_file
+
+        cache_key = self._get_cache_key(text, tts_params)
+        cached_file = self._get_cached(cache_key, output_file)
+        if cached_file is not None:
+            self._record_report(cached_file, len(text), len(text))
+            return cached_file
+
+        self.check_character_quota(len(text))
+        usage_key = self._get_account_key()
+        if self._uses_batch(text, tts_params):
+            if output_file is None:
+                output_file = service.get_output_file_path(tts_params.get("file_extension", ".mp3"))
+            output_file = await service.synthesize_batch_async(text, output_file, tts_params)
+        elif service.measure_text(text) > self._get_max_segment_size(tts_params):
+            output_file = await asyncio.to_thread(self._synthesize_uncached, text, tts_params, output_file)
+        else:
+            output_file = await service.synthesize_speech_async(text, output_file, tts_params)
+        self.usage_tracker.record(usage_key, len(text))
+        if cache_key is not None:
+            self.synthesis_cache.put(cache_key, output_file)
+        self._record_report(output_file, len(text), 0)
+        return output_file
+
+    def get_audio_duration(self, audio):
+        """Get the playing time of generated audio.
+        
+        Args:
+            audio: Path to the audio file, or an AudioResult.
+        
+        Returns:
+            float: The duration in seconds, or None if it cannot be determined.
+        """
+        try:
+            data = audio.get_buffer() if hasattr(audio, "get_buffer") else Path(audio).read_bytes()
+            return AudioStitcher.get_duration(data, Path(audio.name).suffix)
+        except (OSError, EOFError, wave.Error):
+            return None
+
+    def get_cache_stats(self):
+        """Get statistics about the synthesis cache.
+        
+        Returns:
+            dict: Entry count, total size, limits, hit/miss counters and the
+                  characters served from the cache instead of the service.
+        """
+        with self._reports_lock:
+            characters_saved = self._characters_saved
+        return {**self.synthesis_cache.get_stats(), "characters_saved": characters_saved}
+
+    def clear_cache(self):
+        """Remove all cached audio from the synthesis cache."""
+        self.synthesis_cache.clear()
+        with self._reports_lock:
+            self._characters_saved = 0
+
+    def enqueue_job(self, text, output_file=None, overrides=None):
+        """Add a synthesis job for the current service to the persistent job queue.
+        
+        The effective synthesis parameters are stored with the job, so a job
+        resumed after a restart keeps its voice even if the settings changed.
+        Credentials are not stored; they are read from the configuration when
+        the job runs. Texts that are split into segments are stored with the
+        parameters of a format that joins without gaps.
+        
+        Args:
+            text (str): The text to convert to speech.
+            output_file (Path, optional): Where to save the audio. If None, a new
+                                          path in the output store is used.
+            overrides (dict, optional): Synthesis parameters that take precedence
+                                        over the service configuration.
+        
+        Returns:
+            int: The id of the job.
+        """
+        tts_params = self.get_tts_params(overrides)
+        if self.needs_segmentation(text, overrides):
+            tts_params = self._get_stitching_params(tts_params, output_file)
+        credential_fields = type(self.service_instance).CREDENTIAL_FIELDS
+        params = {key: value for key, value in tts_params.items() if key not in credential_fields}
+        if output_file is None:
+            output_file = self.output_store.new_path(tts_params.get("file_extension", ".mp3"))
+        job_id = self.job_queue.enqueue(self.config_manager.get_selected_service(), text, params, output_file)
+        self.job_workers.notify()
+        return job_id
+
+    def start_job_workers(self):
+        """Start draining the job queue in the background.
+        
+        Jobs interrupted by a crash or restart are picked up again once their
+        lease expires, and resume after their last finished segment.
+        """
+        self.job_workers.start()
+
+    def stop_job_workers(self):
+        """Stop draining the job queue. Running jobs go back to the queue."""
+        self.job_workers.stop()
+
+    def close_services(self):
+        """Close every pooled service, releasing its connections and worker processes."""
+        with self._service_pool_lock:
+            services = list(self._service_pool.values())
+            self._service_pool.clear()
+        for service in services:
+            service.close()
+
+    def wait_for_job(self, job_id):
+        """Get a future resolved when a job finishes.
+        
+        Args:
+            job_id (int): The id of the job.
+        
+        Returns:
+            Future: Resolved with the path to the saved audio file. Cancelling
+                    the future cancels the job.
+        """
+        return self.job_workers.wait_for(job_id)
+
+    def cancel_job(self, job_id):
+        """Cancel a job that has not finished yet.
+        
+        Args:
+            job_id (int): The id of the job.
+        """
+        self.job_workers.cancel(job_id)
+
+    def list_jobs(self, status=None):
+        """List the jobs in the job queue.
+        
+        Args:
+            status (str, optional): Only list jobs with this status.
+        
+        Returns:
+            list: The jobs, oldest first.
+        """
+        return self.job_queue.list(status)
+
+    def retry_failed_jobs(self):
+        """Queue failed jobs again, keeping their finished segments.
+        
+        Returns:
+            int: The number of jobs queued again.
+        """
+        count = self.job_queue.retry_failed()
+        self.job_workers.notify()
+        return count
+
+    def clear_jobs(self):
+        """Delete done and failed jobs and their segment files.
+        
+        Returns:
+            int: The number of deleted jobs.
+        """
+        job_ids = self.job_queue.clear()
+        self.job_workers.remove_job_files(job_ids)
+        return len(job_ids)
@@ -0,0 +1,105 @@
+import threading
+import time
+
+from .background_refresher import BackgroundRefresher
+
+
+class UsageTracker:
+    """Cache of character usage per service account, refreshed in the background.
+    
+    Usage is fetched from the service at most once per TTL. In between, the
+    characters of every request sent to the service are added to the cached
+    count, so quota checks stay accurate without a remote call per request.
+    """
+    
+    def __init__(self, ttl_seconds):
+        """Initialize the usage tracker.
+        
+        Args:
+            ttl_seconds (float): How long fetched usage is considered current.
+        """
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        # (character_count, character_limit, fetch time) keyed by account
+        self._usage = {}
+        self._refresher = BackgroundRefresher()
+    
+    def get(self, key):
+        """Get the cached usage of an account.
+        
+        Args:
+            key: The account key (service name and credential fingerprint).
+        
+        Returns:
+            tuple: (character_count, character_limit), or None if usage is unknown.
+        """
+        with self._lock:
+            entry = self._usage.get(key)
+        return entry[:2] if entry else None
+    
+    def is_stale(self, key):
+        """Check if an account's usage is missing or older than the TTL.
+        
+        Args:
+            key: The account key.
+        
+        Returns:
+            bool: True if the usage should be fetched again.
+        """
+        with self._lock:
+            entry = self._usage.get(key)
+        return entry is None or time.monotonic() - entry[2] >= self.ttl_seconds
+    
+    def set(self, key, character_count, character_limit):
+        """Store freshly fetched usage.
+        
+        Args:
+            key: The account key.
+            character_count (int): Characters used in the current period.
+            character_limit (int): Characters available in the current period.
+        """
+        with self._lock:
+            self._usage[key] = (character_count, character_limit, time.monotonic())
+    
+    def record(self, key, characters):
+        """Add the characters of a request to the cached usage.
+        
+        Args:
+            key: The account key.
+            characters (int): The number of characters sent to the service.
+        """
+        with self._lock:
+            entry = self._usage.get(key)
+            if entry is not None:
+                self._usage[key] = (entry[0] + characters, entry[1], entry[2])
+    
+    def refresh(self, key, fetch):
+        """Fetch usage now and store it.
+        
+        Args:
+            key: The account key.
+            fetch (callable): Returns (character_count, character_limit).
+        
+        Returns:
+            tuple: (character_count, character_limit)
+        """
+        character_count, character_limit = fetch()
+        self.set(key, character_count, character_limit)
+        return character_count, character_limit
+    
+    def refresh_in_background(self, key, fetch, callback=None, force=True):
+        """Fetch usage on a background thread.
+        
+        Only one refresh per account runs at a time, and a refresh that isn't
+        forced is skipped for a while after a failed one (see BackgroundRefresher).
+        
+        Args:
+            key: The account key.
+            fetch (callable): Returns (character_count, character_limit).
+            callback (callable, optional): Called with (usage, error) once the refresh ends.
+            force (bool): Refresh even if the last refresh failed recently.
+        
+        Returns:
+            bool: True if a refresh was started.
+        """
+        return self._refresher.run(key, lambda: self.refresh(key, fetch), callback, force)
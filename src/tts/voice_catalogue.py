@@ -0,0 +1,198 @@
+import bisect
+import hashlib
+import json
+import re
+import threading
+import time
+from pathlib import Path
+
+from .background_refresher import BackgroundRefresher
+from .output_store import OutputStore
+
+
+class VoiceCatalogue:
+    """On-disk cache of the voices offered to each service account, refreshed in the background.
+    
+    The voice list of an account is saved as a JSON file, so it is available
+    as soon as the application starts. A list older than the TTL is fetched
+    again in the background, so the provider is asked at most once per TTL.
+    Providers that return an ETag are sent it with the next request, and a
+    "not modified" answer only renews the TTL of the saved list.
+    
+    Each voice is a dictionary with "id", "name", "languages", "gender" and
+    "description" keys. Voices are indexed by the words of these fields, so
+    searching a catalogue of thousands of voices doesn't scan all of them.
+    """
+    
+    _WORD = re.compile(r"\w+")
+    
+    def __init__(self, cache_dir, ttl_seconds):
+        """Initialize the voice catalogue.
+        
+        Args:
+            cache_dir (Path): Directory of the saved voice lists.
+            ttl_seconds (float): How long a fetched voice list is considered current.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        # Voice lists with their ETag, fetch time and search index, keyed by account
+        self._entries = {}
+        self._refresher = BackgroundRefresher()
+    
+    def _get_path(self, key):
+        """Get the file holding the saved voice list of an account."""
+        digest = hashlib.sha256(json.dumps(list(key)).encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{digest[:32]}.json"
+    
+    def _get_entry(self, key):
+        """Get the voice list of an account, loading it from disk on first use."""
+        with self._lock:
+            if key in self._entries:
+                return self._entries[key]
+        try:
+            saved = json.loads(self._get_path(key).read_text(encoding="utf-8"))
+            entry = self._build_entry(saved["voices"], saved.get("etag"), saved["fetched_at"])
+        except (OSError, ValueError, KeyError, TypeError):
+            entry = None
+        with self._lock:
+            return self._entries.setdefault(key, entry)
+    
+    @classmethod
+    def _build_entry(cls, voices, etag, fetched_at):
+        """Sort voices by name and index them for searching."""
+        voices = sorted(voices, key=lambda voice: (voice["name"].lower(), voice["id"]))
+        index = {}
+        for position, voice in enumerate(voices):
+            for word in cls._get_words(voice):
+                index.setdefault(word, set()).add(position)
+        return {
+            "voices": voices,
+            "etag": etag,
+            "fetched_at": fetched_at,
+            "index": index,
+            "words": sorted(index),
+        }
+    
+    @classmethod
+    def _get_words(cls, voice):
+        """Get the lowercase words a voice can be found by."""
+        text = " ".join([voice["id"], voice["name"], voice["gender"], voice["description"], *voice["languages"]])
+        return set(cls._WORD.findall(text.lower()))
+    
+    def get(self, key):
+        """Get the saved voice list of an account.
+        
+        Args:
+            key: The account key (service name and credential fingerprint).
+        
+        Returns:
+            list: The voices sorted by name, or None if they were never fetched.
+        """
+        entry = self._get_entry(key)
+        return entry["voices"] if entry is not None else None
+    
+    def is_stale(self, key):
+        """Check if an account's voice list is missing or older than the TTL.
+        
+        Args:
+            key: The account key.
+        
+        Returns:
+            bool: True if the voices should be fetched again.
+        """
+        entry = self._get_entry(key)
+        return entry is None or time.time() - entry["fetched_at"] >= self.ttl_seconds
+    
+    def find(self, key, voice_id):
+        """Get a voice of an account by its id.
+        
+        Args:
+            key: The account key.
+            voice_id (str): The voice id.
+        
+        Returns:
+            dict: The voice, or None if it is not in the saved voice list.
+        """
+        for voice in self.get(key) or []:
+            if voice["id"] == voice_id:
+                return voice
+        return None
+    
+    def search(self, key, query):
+        """Find the voices of an account matching a search query.
+        
+        Every word of the query must be the start of a word of the voice's
+        id, name, gender, description or languages.
+        
+        Args:
+            key: The account key.
+            query (str): The search query.
+        
+        Returns:
+            list: The matching voices sorted by name, empty if the voices were never fetched.
+        """
+        entry = self._get_entry(key)
+        if entry is None:
+            return []
+        
+        matches = None
+        for prefix in set(self._WORD.findall(query.lower())):
+            words = entry["words"]
+            positions = set()
+            start = bisect.bisect_left(words, prefix)
+            for word in words[start:]:
+                if not word.startswith(prefix):
+                    break
+                positions |= entry["index"][word]
+            matches = positions if matches is None else matches & positions
+            if not matches:
+                return []
+        
+        if matches is None:
+            return entry["voices"]
+        return [entry["voices"][position] for position in sorted(matches)]
+    
+    def refresh(self, key, fetch):
+        """Fetch the voices of an account now and save them.
+        
+        Args:
+            key: The account key.
+            fetch (callable): Called with the saved ETag (or None). Returns
+                              (voices, etag), with voices None if the saved
+                              list has not changed.
+        
+        Returns:
+            list: The voices sorted by name.
+        """
+        entry = self._get_entry(key)
+        voices, etag = fetch(entry["etag"] if entry is not None else None)
+        if voices is None:
+            if entry is None:
+                raise RuntimeError("The service reported no change to a voice list that was never fetched")
+            voices = entry["voices"]
+        
+        entry = self._build_entry(voices, etag, time.time())
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with OutputStore.atomic_write(self._get_path(key), "w") as f:
+            json.dump({"voices": entry["voices"], "etag": etag, "fetched_at": entry["fetched_at"]}, f)
+        with self._lock:
+            self._entries[key] = entry
+        return entry["voices"]
+    
+    def refresh_in_background(self, key, fetch, callback=None, force=True):
+        """Fetch the voices of an account on a background thread.
+        
+        Only one refresh per account runs at a time, and a refresh that isn't
+        forced is skipped for a while after a failed one (see BackgroundRefresher).
+        
+        Args:
+            key: The account key.
+            fetch (callable): See refresh.
+            callback (callable, optional): Called with (voices, error) once the refresh ends.
+            force (bool): Refresh even if the last refresh failed recently.
+        
+        Returns:
+            bool: True if a refresh was started.
+        """
+        return self._refresher.run(key, lambda: self.refresh(key, fetch), callback, force)
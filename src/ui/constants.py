@@ -31,12 +31,24 @@ class UIConstants:
     STATE_NORMAL = "normal"
     
     # Audio playback settings
-    AUDIO_MONITOR_INTERVAL_MS = 100  # Interval for checking audio playback status
+    PLAYBACK_PROGRESS_INTERVAL_MS = 500  # Interval for redrawing the playback progress bar on the main loop
     
     # Character usage labels
     UNSET_USAGE = "--"
     CHARACTER_USAGE_FORMAT = "Used: {} / {} characters"
     CHARACTER_USAGE_NOT_AVAILABLE = "Usage tracking not available for this service"
     
+    # Synthesis cache labels
+    CACHE_INFO_FORMAT = "Cached clips: {} ({:.1f} MB) | Hits: {} | Misses: {} | Characters saved: {:,}"
+    CACHE_SAVINGS_FORMAT = " Reused {:,} of {:,} characters from the cache."
+    SPECULATION_LABEL = "Synthesize finished sentences while typing (uses characters for edited text)"
+    
+    # Voice picker settings
+    VOICE_PICKER_HEIGHT = 6  # Rows of the voice list
+    VOICE_PICKER_MAX_RESULTS = 200  # Voices listed at once; narrow the search to see others
+    VOICE_PICKER_NOT_LOADED = "Voices are listed once the service credentials are saved"
+    VOICE_PICKER_CURRENT_VOICE = "Current voice: {}"
+    VOICE_PICKER_UNKNOWN_VOICE = "Voice \"{}\" is not offered by this service or account"
+    
     # Entry widget settings
     API_KEY_ENTRY_SHOW_CHAR = "*"
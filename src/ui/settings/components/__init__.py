@@ -2,12 +2,18 @@ from .character_usage_label import CharacterUsageLabel
 from .service_selector import ServiceSelector
 from .elevenlabs_settings import ElevenLabsSettings
 from .google_cloud_settings import GoogleCloudSettings
+from .local_settings import LocalSettings
 from .scroll_frame import ScrollFrame
+from .cache_info import CacheInfo
+from .voice_picker import VoicePicker
 
 __all__ = [
     'CharacterUsageLabel',
     'ServiceSelector', 
     'ElevenLabsSettings',
     'GoogleCloudSettings',
-    'ScrollFrame'
+    'LocalSettings',
+    'ScrollFrame',
+    'CacheInfo',
+    'VoicePicker'
 ]
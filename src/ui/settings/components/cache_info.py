@@ -0,0 +1,69 @@
+import tkinter as tk
+from tkinter import ttk
+from ...constants import UIConstants
+
+
+class CacheInfo:
+    """Component for displaying synthesis cache statistics with a clear button."""
+    
+    def __init__(self, parent, app):
+        """Initialize the cache info component.
+        
+        Args:
+            parent: The parent widget to contain this component
+            app: The Application instance for fetching cache statistics
+        """
+        self.parent = parent
+        self.app = app
+        self._create_widgets()
+    
+    def _create_widgets(self):
+        """Create the cache info label and clear button."""
+        self.cache_frame = ttk.Frame(self.parent)
+        self.cache_frame.pack(anchor=tk.W, pady=(UIConstants.TEXT_PADDING, 0), fill=tk.X)
+        
+        self.cache_var = tk.StringVar()
+        self.cache_label = ttk.Label(
+            self.cache_frame,
+            textvariable=self.cache_var,
+            font=(UIConstants.DEFAULT_FONT_FAMILY, UIConstants.DEFAULT_FONT_SIZE),
+        )
+        self.cache_label.pack(side=tk.LEFT, anchor=tk.W)
+        
+        self.clear_button = ttk.Button(
+            self.parent,
+            text="Clear Cache",
+            command=self._clear_cache
+        )
+        self.clear_button.pack(anchor=tk.W, pady=(UIConstants.BUTTON_PADDING, 0))
+        
+        # Speculative synthesis fills the cache with sentences while typing
+        self.speculation_var = tk.BooleanVar()
+        self.speculation_check = ttk.Checkbutton(
+            self.parent,
+            text=UIConstants.SPECULATION_LABEL,
+            variable=self.speculation_var,
+            command=self._toggle_speculation
+        )
+        self.speculation_check.pack(anchor=tk.W, pady=(UIConstants.BUTTON_PADDING, 0))
+    
+    def _toggle_speculation(self):
+        """Save the speculative synthesis setting."""
+        self.app.set_speculation_enabled(self.speculation_var.get())
+    
+    def _clear_cache(self):
+        """Clear the synthesis cache and refresh the statistics."""
+        self.app.clear_cache()
+        self.load_cache_info()
+    
+    def load_cache_info(self):
+        """Load and display synthesis cache statistics."""
+        self.speculation_var.set(self.app.get_speculation_config()["enabled"])
+        stats = self.app.get_cache_stats()
+        self.cache_var.set(UIConstants.CACHE_INFO_FORMAT.format(
+            stats["entries"],
+            stats["total_bytes"] / (1024 * 1024),
+            stats["hits"],
+            stats["misses"],
+            stats["characters_saved"]
+        ))
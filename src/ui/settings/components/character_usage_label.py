@@ -55,33 +55,76 @@ class CharacterUsageLabel:
         self.usage_label.config(foreground=color)
 
     def _refresh_usage(self):
-        """Refresh character usage with loading state."""
+        """Refresh character usage from the service in the background."""
+        self._show_loading()
+        self.app.refresh_character_usage(self._schedule_usage_loaded)
+
+    def _show_loading(self):
+        """Show the usage as unknown while it is being fetched."""
         self.set_label(UIConstants.CHARACTER_USAGE_FORMAT.format(
             UIConstants.UNSET_USAGE,
             self.character_limit if self.character_limit else UIConstants.UNSET_USAGE
         ))
-        self.usage_frame.update_idletasks()
-        self.load_character_usage()
+
+    def _schedule_usage_loaded(self, usage, error):
+        """Hand fetched usage back to the Tk main loop.
+        
+        This runs on the refresh thread, so it must not touch any widgets directly.
+        
+        Args:
+            usage (tuple): (character_count, character_limit), or None on error
+            error (Exception): The error raised while fetching, if any
+        """
+        try:
+            self.usage_frame.after(0, self._on_usage_loaded, usage, error)
+        except (tk.TclError, RuntimeError):
+            # The window was closed while the usage was being fetched
+            pass
+
+    def _on_usage_loaded(self, usage, error):
+        """Display fetched usage, or the error that prevented fetching it."""
+        if error is not None:
+            self.set_label(f"Error loading usage: {str(error)}", color="red")
+            self._show_refresh_button()
+            return
+
+        # Show the usage of the current service, in case it changed during the fetch
+        usage = self.app.get_cached_character_usage()
+        if usage is not None:
+            self._show_usage(*usage)
+
+    def _show_usage(self, character_count, character_limit):
+        """Display character usage, highlighted when it is close to the limit."""
+        # Handle case where usage tracking is not available
+        if character_count == -1 and character_limit == -1:
+            self.set_label(UIConstants.CHARACTER_USAGE_NOT_AVAILABLE, color="gray")
+            self._hide_refresh_button()
+            return
+
+        usage_text = UIConstants.CHARACTER_USAGE_FORMAT.format(character_count, character_limit)
+        warning_ratio = self.app.get_usage_config()["warning_ratio"]
+        if character_limit > 0 and character_count >= warning_ratio * character_limit:
+            self.set_label(usage_text, color=UIConstants.STATUS_COLOR_WARNING)
+        else:
+            self.set_label(usage_text)
+        self.character_limit = character_limit
+        self._show_refresh_button()
 
     def load_character_usage(self):
-        """Load and display character usage information."""
+        """Load and display character usage information.
+        
+        The cached usage is shown without calling the service. If no usage is
+        known yet, it is fetched in the background and shown once it arrives.
+        """
         if not self.app.is_service_initialized():
             self.character_limit = None
             self.set_label(UIConstants.CHARACTER_USAGE_FORMAT.format(UIConstants.UNSET_USAGE, UIConstants.UNSET_USAGE))
             return
 
-        try:
-            character_count, character_limit = self.app.get_character_usage()
-            
-            # Handle case where usage tracking is not available
-            if character_count == -1 and character_limit == -1:
-                self.set_label(UIConstants.CHARACTER_USAGE_NOT_AVAILABLE, color="gray")
-                self._hide_refresh_button()
-            else:
-                usage_text = UIConstants.CHARACTER_USAGE_FORMAT.format(character_count, character_limit)
-                self.set_label(usage_text)
-                self.character_limit = character_limit
-                self._show_refresh_button()
-        except Exception as e:
-            self.set_label(f"Error loading usage: {str(e)}", color="red")
-            self._show_refresh_button()
+        usage = self.app.get_cached_character_usage()
+        if usage is None:
+            self._show_loading()
+            # Shows the last error instead of asking again if a fetch failed just now
+            self.app.refresh_character_usage(self._schedule_usage_loaded, force=False)
+        else:
+            self._show_usage(*usage)
@@ -2,6 +2,7 @@ import tkinter as tk
 from tkinter import ttk
 from ...constants import UIConstants
 from .tooltip import ToolTip
+from .voice_picker import VoicePicker
 
 
 class ElevenLabsSettings:
@@ -56,6 +57,9 @@ class ElevenLabsSettings:
         )
         voice_id_entry.pack(anchor=tk.W)
         
+        self.voice_picker = VoicePicker(voice_frame, self.app, lambda voice: self.voice_id_var.set(voice["id"]))
+        self.voice_id_var.trace_add("write", lambda *args: self.voice_picker.set_current_voice(self.voice_id_var.get()))
+        
         # Model ID Configuration Section
         model_frame = ttk.Frame(self.frame)
         model_frame.pack(pady=10, fill=tk.X)
@@ -103,6 +107,21 @@ class ElevenLabsSettings:
         )
         self.output_format_dropdown.pack(anchor=tk.W)
         
+        # Streaming playback checkbox
+        streaming_frame = ttk.Frame(self.frame)
+        streaming_frame.pack(pady=10, fill=tk.X)
+        
+        self.streaming_var = tk.BooleanVar(value=False)
+        self.streaming_checkbox = ttk.Checkbutton(
+            streaming_frame,
+            text="Stream Playback",
+            variable=self.streaming_var,
+        )
+        self.streaming_checkbox.pack(anchor=tk.W)
+        
+        # Add tooltip to the streaming checkbox
+        ToolTip(self.streaming_checkbox, "Starts playing audio as soon as the first part arrives instead of waiting for the whole clip. Streamed audio is saved as a WAV file at the sample rate of the selected output format.")
+        
         # Voice Settings Configuration Section
         voice_settings_frame = ttk.LabelFrame(self.frame, text="Voice Settings", padding=(10, 5))
         voice_settings_frame.pack(pady=10, fill=tk.X)
@@ -243,8 +262,10 @@ class ElevenLabsSettings:
         config = self.app.get_service_config()
         self.api_key_var.set(config.get("api_key", ""))
         self.voice_id_var.set(config.get("voice_id", ""))
+        self.voice_picker.load()
         self.model_id_var.set(config.get("model_id", "eleven_turbo_v2_5"))
         self.output_format_var.set(config.get("output_format", "mp3_22050_32"))
+        self.streaming_var.set(config.get("streaming", False))
         
         # Load voice settings
         voice_settings = config.get("voice_settings", {})
@@ -272,6 +293,7 @@ class ElevenLabsSettings:
             "model_id": self.model_id_var.get(),
             "output_format": self.output_format_var.get(),
             "file_extension": ".mp3",
+            "streaming": self.streaming_var.get(),
             "voice_settings": {
                 "stability": self.stability_var.get(),
                 "similarity_boost": self.similarity_boost_var.get(),
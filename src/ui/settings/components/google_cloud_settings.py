@@ -1,6 +1,8 @@
 import tkinter as tk
 from tkinter import ttk, filedialog
 from ...constants import UIConstants
+from .tooltip import ToolTip
+from .voice_picker import VoicePicker
 
 
 class GoogleCloudSettings:
@@ -76,7 +78,10 @@ class GoogleCloudSettings:
             font=(UIConstants.DEFAULT_FONT_FAMILY, UIConstants.DEFAULT_FONT_SIZE),
             width=30
         )
-        self.voice_name_entry.pack(anchor=tk.W, pady=(0, 10))
+        self.voice_name_entry.pack(anchor=tk.W)
+        
+        self.voice_picker = VoicePicker(voice_settings_frame, self.app, self._on_voice_selected)
+        self.voice_name_var.trace_add("write", lambda *args: self.voice_picker.set_current_voice(self.voice_name_var.get()))
         
         # Voice Gender
         ttk.Label(voice_settings_frame, text="Voice Gender:", 
@@ -180,6 +185,46 @@ class GoogleCloudSettings:
         self.volume_gain_value_label.pack(anchor=tk.W)
         
         self.volume_gain_scale.configure(command=lambda val: self.volume_gain_value_label.configure(text=f"{float(val):.1f}"))
+        
+        # Long Audio Configuration Section
+        long_audio_frame = ttk.LabelFrame(self.frame, text="Long Audio", padding=(10, 5))
+        long_audio_frame.pack(pady=10, fill=tk.X)
+        
+        # Values of the long audio settings that have no widgets
+        self.long_audio_config = {}
+        # Connection settings, which have no widgets at all
+        self.connection_config = {}
+        
+        self.long_audio_enabled_var = tk.BooleanVar(value=False)
+        self.long_audio_checkbox = ttk.Checkbutton(
+            long_audio_frame,
+            text="Render very long texts with the Long Audio API",
+            variable=self.long_audio_enabled_var,
+        )
+        self.long_audio_checkbox.pack(anchor=tk.W, pady=(0, 5))
+        
+        # Add tooltip to the long audio checkbox
+        ToolTip(self.long_audio_checkbox, "Texts above the long audio threshold are rendered by one long-running operation instead of many short requests. The audio is written to the Cloud Storage location below, downloaded and then deleted from the bucket. Only used with the .wav file format.")
+        
+        ttk.Label(long_audio_frame, text="Cloud Storage Location (gs://bucket/folder):", 
+                  font=(UIConstants.DEFAULT_FONT_FAMILY, UIConstants.DEFAULT_FONT_SIZE)).pack(anchor=tk.W, pady=(0, 5))
+        
+        self.output_gcs_uri_var = tk.StringVar()
+        self.output_gcs_uri_entry = ttk.Entry(
+            long_audio_frame,
+            textvariable=self.output_gcs_uri_var,
+            font=(UIConstants.DEFAULT_FONT_FAMILY, UIConstants.DEFAULT_FONT_SIZE),
+            width=40
+        )
+        self.output_gcs_uri_entry.pack(anchor=tk.W, pady=(0, 10))
+    
+    def _on_voice_selected(self, voice):
+        """Fill in the voice name, language and gender of the voice picked from the list."""
+        self.voice_name_var.set(voice["id"])
+        if voice["languages"]:
+            self.language_code_var.set(voice["languages"][0])
+        if voice["gender"] in self.voice_gender_dropdown["values"]:
+            self.voice_gender_var.set(voice["gender"])
     
     def _browse_service_account_file(self):
         """Open file dialog to browse for service account JSON file."""
@@ -205,6 +250,7 @@ class GoogleCloudSettings:
         self.language_code_var.set(config.get("language_code", "en-US"))
         self.voice_name_var.set(config.get("voice_name", "en-US-Wavenet-D"))
         self.voice_gender_var.set(config.get("voice_gender", "NEUTRAL"))
+        self.voice_picker.load()
         
         # Map audio encoding to file format for display
         audio_encoding = config.get("audio_encoding", "MP3")
@@ -220,6 +266,11 @@ class GoogleCloudSettings:
         self.pitch_var.set(config.get("pitch", 0.0))
         self.volume_gain_var.set(config.get("volume_gain_db", 0.0))
         
+        self.long_audio_config = dict(config.get("long_audio", {}))
+        self.long_audio_enabled_var.set(self.long_audio_config.get("enabled", False))
+        self.output_gcs_uri_var.set(self.long_audio_config.get("output_gcs_uri", ""))
+        self.connection_config = dict(config.get("connection", {}))
+        
         # Update value labels
         self.speaking_rate_value_label.configure(text=f"{self.speaking_rate_var.get():.2f}")
         self.pitch_value_label.configure(text=f"{self.pitch_var.get():.2f}")
@@ -249,5 +300,11 @@ class GoogleCloudSettings:
             "speaking_rate": self.speaking_rate_var.get(),
             "pitch": self.pitch_var.get(),
             "volume_gain_db": self.volume_gain_var.get(),
-            "file_extension": file_format
+            "file_extension": file_format,
+            "long_audio": {
+                **self.long_audio_config,
+                "enabled": self.long_audio_enabled_var.get(),
+                "output_gcs_uri": self.output_gcs_uri_var.get().strip()
+            },
+            "connection": self.connection_config
         }
@@ -0,0 +1,124 @@
+import tkinter as tk
+from tkinter import ttk
+from ...constants import UIConstants
+from .voice_picker import VoicePicker
+
+
+class LocalSettings:
+    """Component for local (offline) TTS settings."""
+    
+    def __init__(self, parent, app):
+        """Initialize the local settings component.
+        
+        Args:
+            parent: The parent widget to contain this component
+            app: The Application instance
+        """
+        self.parent = parent
+        self.app = app
+        self.frame = ttk.Frame(parent)
+        self._create_widgets()
+    
+    def _create_widgets(self):
+        """Create the local settings widgets."""
+        # Voice Configuration Section
+        voice_frame = ttk.Frame(self.frame)
+        voice_frame.pack(pady=10, fill=tk.X)
+        
+        ttk.Label(voice_frame, text="Voice ID (leave empty for the system default):", 
+                  font=(UIConstants.DEFAULT_FONT_FAMILY, UIConstants.DEFAULT_FONT_SIZE)).pack(anchor=tk.W, pady=(0, 5))
+        
+        self.voice_id_var = tk.StringVar()
+        voice_id_entry = ttk.Entry(
+            voice_frame,
+            textvariable=self.voice_id_var,
+            font=(UIConstants.DEFAULT_FONT_FAMILY, UIConstants.DEFAULT_FONT_SIZE),
+            width=40
+        )
+        voice_id_entry.pack(anchor=tk.W)
+        
+        self.voice_picker = VoicePicker(voice_frame, self.app, lambda voice: self.voice_id_var.set(voice["id"]))
+        self.voice_id_var.trace_add("write", lambda *args: self.voice_picker.set_current_voice(self.voice_id_var.get()))
+        
+        # Audio Settings Configuration Section
+        audio_settings_frame = ttk.LabelFrame(self.frame, text="Audio Settings", padding=(10, 5))
+        audio_settings_frame.pack(pady=10, fill=tk.X)
+        
+        # Speaking Rate
+        rate_frame = ttk.Frame(audio_settings_frame)
+        rate_frame.pack(pady=5, fill=tk.X)
+        
+        ttk.Label(rate_frame, text="Speaking Rate (80 - 400 words per minute):", 
+                  font=(UIConstants.DEFAULT_FONT_FAMILY, UIConstants.DEFAULT_FONT_SIZE)).pack(anchor=tk.W)
+        
+        self.rate_var = tk.IntVar(value=200)
+        self.rate_scale = ttk.Scale(
+            rate_frame,
+            from_=80,
+            to=400,
+            variable=self.rate_var,
+            orient=tk.HORIZONTAL,
+            length=300
+        )
+        self.rate_scale.pack(anchor=tk.W, pady=(2, 0))
+        
+        self.rate_value_label = ttk.Label(rate_frame, text="200")
+        self.rate_value_label.pack(anchor=tk.W)
+        
+        self.rate_scale.configure(command=lambda val: self.rate_value_label.configure(text=f"{float(val):.0f}"))
+        
+        # Volume
+        volume_frame = ttk.Frame(audio_settings_frame)
+        volume_frame.pack(pady=5, fill=tk.X)
+        
+        ttk.Label(volume_frame, text="Volume (0.0 - 1.0):", 
+                  font=(UIConstants.DEFAULT_FONT_FAMILY, UIConstants.DEFAULT_FONT_SIZE)).pack(anchor=tk.W)
+        
+        self.volume_var = tk.DoubleVar(value=1.0)
+        self.volume_scale = ttk.Scale(
+            volume_frame,
+            from_=0.0,
+            to=1.0,
+            variable=self.volume_var,
+            orient=tk.HORIZONTAL,
+            length=300
+        )
+        self.volume_scale.pack(anchor=tk.W, pady=(2, 0))
+        
+        self.volume_value_label = ttk.Label(volume_frame, text="1.0")
+        self.volume_value_label.pack(anchor=tk.W)
+        
+        self.volume_scale.configure(command=lambda val: self.volume_value_label.configure(text=f"{float(val):.2f}"))
+    
+    def grid(self, **kwargs):
+        """Grid the component frame."""
+        self.frame.grid(**kwargs)
+    
+    def grid_remove(self):
+        """Remove the component frame from grid."""
+        self.frame.grid_remove()
+    
+    def load_settings(self):
+        """Load settings from the application configuration."""
+        config = self.app.get_service_config()
+        self.voice_id_var.set(config.get("voice_id", ""))
+        self.voice_picker.load()
+        self.rate_var.set(config.get("rate", 200))
+        self.volume_var.set(config.get("volume", 1.0))
+        
+        # Update value labels
+        self.rate_value_label.configure(text=f"{self.rate_var.get():.0f}")
+        self.volume_value_label.configure(text=f"{self.volume_var.get():.2f}")
+    
+    def get_settings(self):
+        """Get the current settings from the UI.
+        
+        Returns:
+            dict: Dictionary containing the local settings
+        """
+        return {
+            "voice_id": self.voice_id_var.get().strip(),
+            "rate": self.rate_var.get(),
+            "volume": self.volume_var.get(),
+            "file_extension": ".wav"
+        }
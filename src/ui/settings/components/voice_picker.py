@@ -0,0 +1,163 @@
+import tkinter as tk
+from tkinter import ttk
+from ...constants import UIConstants
+
+
+class VoicePicker:
+    """Component for searching the voices of the selected service and picking one.
+    
+    The voice list comes from the voice catalogue, so it shows up instantly
+    from the cache and is only fetched from the service when it is missing,
+    stale or refreshed by the user.
+    """
+    
+    def __init__(self, parent, app, on_select):
+        """Initialize the voice picker component.
+        
+        Args:
+            parent: The parent widget to contain this component
+            app: The Application instance for fetching voices
+            on_select: Callback function called with the voice dictionary the user picked
+        """
+        self.parent = parent
+        self.app = app
+        self.on_select = on_select
+        # Voices shown in the list, in list order
+        self.results = []
+        self.current_voice_id = None
+        self._create_widgets()
+    
+    def _create_widgets(self):
+        """Create the search entry, voice list and status label."""
+        self.frame = ttk.Frame(self.parent)
+        self.frame.pack(anchor=tk.W, pady=(5, 10), fill=tk.X)
+        
+        search_frame = ttk.Frame(self.frame)
+        search_frame.pack(anchor=tk.W, fill=tk.X)
+        
+        ttk.Label(search_frame, text="Search voices:",
+                  font=(UIConstants.DEFAULT_FONT_FAMILY, UIConstants.DEFAULT_FONT_SIZE)).pack(side=tk.LEFT)
+        
+        self.search_var = tk.StringVar()
+        self.search_entry = ttk.Entry(
+            search_frame,
+            textvariable=self.search_var,
+            font=(UIConstants.DEFAULT_FONT_FAMILY, UIConstants.DEFAULT_FONT_SIZE),
+            width=25
+        )
+        self.search_entry.pack(side=tk.LEFT, padx=(5, 0))
+        self.search_var.trace_add("write", lambda *args: self._show_results())
+        
+        self.refresh_button = ttk.Button(
+            search_frame,
+            text="Refresh Voices",
+            command=self._refresh_voices
+        )
+        self.refresh_button.pack(side=tk.LEFT, padx=(5, 0))
+        
+        list_frame = ttk.Frame(self.frame)
+        list_frame.pack(anchor=tk.W, pady=(5, 0), fill=tk.X)
+        
+        self.voice_list = tk.Listbox(
+            list_frame,
+            height=UIConstants.VOICE_PICKER_HEIGHT,
+            exportselection=False,
+            font=(UIConstants.DEFAULT_FONT_FAMILY, UIConstants.DEFAULT_FONT_SIZE)
+        )
+        scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.voice_list.yview)
+        self.voice_list.configure(yscrollcommand=scrollbar.set)
+        self.voice_list.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        scrollbar.pack(side=tk.LEFT, fill=tk.Y)
+        self.voice_list.bind("<<ListboxSelect>>", self._on_voice_selected)
+        
+        self.status_var = tk.StringVar()
+        self.status_label = ttk.Label(
+            self.frame,
+            textvariable=self.status_var,
+            foreground="gray"
+        )
+        self.status_label.pack(anchor=tk.W, pady=(2, 0))
+    
+    def load(self):
+        """Show the cached voices, fetching them in the background if none are cached."""
+        voices = self.app.get_voices()
+        self._show_results()
+        if voices is None:
+            # Shows the last error instead of asking again if a fetch failed just now
+            self._refresh_voices(force=False)
+    
+    def set_current_voice(self, voice_id):
+        """Show which voice is configured, and warn if the service doesn't offer it.
+        
+        Args:
+            voice_id (str): The voice id in the service configuration
+        """
+        self.current_voice_id = voice_id
+        self._show_status()
+    
+    def _refresh_voices(self, force=True):
+        """Fetch the voices from the service in the background."""
+        self.status_label.configure(foreground="gray")
+        self.status_var.set("Loading voices...")
+        self.app.refresh_voices(self._schedule_voices_loaded, force)
+    
+    def _schedule_voices_loaded(self, voices, error):
+        """Hand fetched voices back to the Tk main loop.
+        
+        This runs on the refresh thread, so it must not touch any widgets directly.
+        
+        Args:
+            voices (list): The fetched voices, or None on error
+            error (Exception): The error raised while fetching, if any
+        """
+        try:
+            self.frame.after(0, self._on_voices_loaded, error)
+        except (tk.TclError, RuntimeError):
+            # The window was closed while the voices were being fetched
+            pass
+    
+    def _on_voices_loaded(self, error):
+        """Show fetched voices, or the error that prevented fetching them."""
+        if error is not None:
+            self.status_label.configure(foreground="red")
+            self.status_var.set(f"Error loading voices: {str(error)}")
+            return
+        self._show_results()
+    
+    def _show_results(self):
+        """List the voices matching the search query."""
+        self.results = self.app.search_voices(self.search_var.get())[:UIConstants.VOICE_PICKER_MAX_RESULTS]
+        self.voice_list.delete(0, tk.END)
+        for voice in self.results:
+            self.voice_list.insert(tk.END, self._format_voice(voice))
+        self._show_status()
+    
+    @staticmethod
+    def _format_voice(voice):
+        """Format a voice for the list."""
+        details = ", ".join(filter(None, [", ".join(voice["languages"]), voice["gender"].lower()]))
+        return f"{voice['name']} ({details})" if details else voice["name"]
+    
+    def _show_status(self):
+        """Show the configured voice, or why no voices are listed."""
+        if self.app.get_voices() is None:
+            self.status_label.configure(foreground="gray")
+            self.status_var.set(UIConstants.VOICE_PICKER_NOT_LOADED)
+            return
+        if not self.current_voice_id:
+            self.status_label.configure(foreground="gray")
+            self.status_var.set("")
+            return
+        voice = self.app.find_voice(self.current_voice_id)
+        if voice is None:
+            self.status_label.configure(foreground=UIConstants.STATUS_COLOR_WARNING)
+            self.status_var.set(UIConstants.VOICE_PICKER_UNKNOWN_VOICE.format(self.current_voice_id))
+        else:
+            self.status_label.configure(foreground="gray")
+            self.status_var.set(UIConstants.VOICE_PICKER_CURRENT_VOICE.format(self._format_voice(voice)))
+    
+    def _on_voice_selected(self, event):
+        """Pass the clicked voice to the settings panel."""
+        selection = self.voice_list.curselection()
+        if selection:
+            self.on_select(self.results[selection[0]])
@@ -5,9 +5,8 @@ from ..constants import UIConstants
 from .components import (
     CharacterUsageLabel, 
     ServiceSelector, 
-    ElevenLabsSettings, 
-    GoogleCloudSettings,
-    ScrollFrame
+    ScrollFrame,
+    CacheInfo
 )
 
 
@@ -24,6 +23,9 @@ class SettingsTab:
         self.app = app
         self.root = parent
         
+        # Settings panels are created the first time their service is shown
+        self.service_panels = {}
+        
         # Create UI components
         self._create_components()
     
@@ -51,6 +53,12 @@ class SettingsTab:
             self.app, 
         )
         
+        # Synthesis cache section
+        cache_frame = ttk.Frame(container)
+        cache_frame.pack(pady=(10, 0), padx=UIConstants.FRAME_PADDING, fill=tk.X)
+        
+        self.cache_info = CacheInfo(cache_frame, self.app)
+        
         # Settings container frame
         self.settings_container = ttk.Frame(container)
         self.settings_container.pack(pady=10, padx=UIConstants.FRAME_PADDING, fill=tk.BOTH, expand=True)
@@ -58,10 +66,6 @@ class SettingsTab:
         self.settings_container.grid_rowconfigure(0, weight=1)
         self.settings_container.grid_columnconfigure(0, weight=1)
         
-        # Create settings components for each service
-        self.elevenlabs_settings = ElevenLabsSettings(self.settings_container, self.app)
-        self.google_cloud_settings = GoogleCloudSettings(self.settings_container, self.app)
-        
         # Save button at the bottom
         save_frame = ttk.Frame(container)
         save_frame.pack(pady=10, padx=20, fill=tk.X)
@@ -82,31 +86,41 @@ class SettingsTab:
         self.app.set_selected_service(selected_service)
         self._show_settings(selected_service)
     
+    def _get_service_panel(self, service):
+        """Get the settings panel of a service, creating it on first use.
+        
+        Args:
+            service (str): The service name
+            
+        Returns:
+            The settings panel, or None if the service has no settings panel
+        """
+        if service not in self.service_panels:
+            panel_class = self.app.get_settings_panel_class(service)
+            self.service_panels[service] = panel_class(self.settings_container, self.app) if panel_class else None
+        return self.service_panels[service]
+    
     def _show_settings(self, service):
         """Show settings for the selected TTS service."""
-        self.elevenlabs_settings.grid_remove()
-        self.google_cloud_settings.grid_remove()
+        for panel in self.service_panels.values():
+            if panel is not None:
+                panel.grid_remove()
         
         self.character_usage.load_character_usage()
+        self.cache_info.load_cache_info()
 
         # Show the selected service frame and load its settings
-        if service == "ElevenLabs":
-            self.elevenlabs_settings.load_settings()
-            self.elevenlabs_settings.grid(row=0, column=0, sticky="nsew")
-        elif service == "Google Cloud":
-            self.google_cloud_settings.load_settings()
-            self.google_cloud_settings.grid(row=0, column=0, sticky="nsew")
+        panel = self._get_service_panel(service)
+        if panel is not None:
+            panel.load_settings()
+            panel.grid(row=0, column=0, sticky="nsew")
     
     def _on_save_settings(self):
         """Handle save settings button click."""
         try:
-            service = self.app.get_selected_service()
-            if service == "ElevenLabs":
-                config = self.elevenlabs_settings.get_settings()
-                self.app.set_service_config(config)
-            elif service == "Google Cloud":
-                config = self.google_cloud_settings.get_settings()
-                self.app.set_service_config(config)
+            panel = self._get_service_panel(self.app.get_selected_service())
+            if panel is not None:
+                self.app.set_service_config(panel.get_settings())
                         
             self.character_usage.load_character_usage()
             messagebox.showinfo("Success", "Settings saved successfully!")
@@ -4,10 +4,14 @@ from .message_input import MessageInput
 from .control_buttons import ControlButtons
 from .status_label import StatusLabel
 from .audio_controls import AudioControls
+from .audio_player import AudioPlayer
+from .stream_player import StreamPlayer
 
 __all__ = [
     'MessageInput',
     'ControlButtons', 
     'StatusLabel',
-    'AudioControls'
+    'AudioControls',
+    'AudioPlayer',
+    'StreamPlayer'
 ]
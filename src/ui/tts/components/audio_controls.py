@@ -1,28 +1,45 @@
+import queue
 import tkinter as tk
 from tkinter import ttk, filedialog
-import pygame
 import shutil
+import time
 from pathlib import Path
 from ...constants import UIConstants
+from .audio_player import AudioPlayer, get_active_mixer
+from .stream_player import StreamPlayer
 
 
 class AudioControls:
     """Component for audio playback controls with integrated audio handling."""
     
-    def __init__(self, parent, on_error):
+    def __init__(self, parent, on_error, get_duration=None, trace=None):
         """Initialize the audio controls component.
         
         Args:
             parent: The parent widget to contain this component
             on_error: Callback function for playback error handling
+            get_duration: Optional function returning the duration of an audio clip in seconds,
+                          used to detect the end of playback without polling and to show progress
+            trace: Optional function returning a context manager that times the named stage
         """
         self.parent = parent
         self.on_error = on_error
+        # Path of the audio file, or an in-memory AudioResult
         self.current_audio_file = None
         self.is_playing = False
-        
-        # Initialize pygame mixer for audio playback
-        pygame.mixer.init()
+        self.stream_player = None
+        # Id of the playback whose events update the controls
+        self.play_id = None
+        # Duration of the playing clip in seconds, None if unknown
+        self.duration = None
+        self.player = AudioPlayer(
+            on_event=lambda: self._call_on_main_loop(self._drain_player_events),
+            get_duration=get_duration,
+            trace=trace
+        )
+        # Position in the playing clip when the clock below was read, for the progress display
+        self._position_anchor = (0.0, time.monotonic())
+        self._progress_timer = None
         
         self._create_widgets()
     
@@ -68,6 +85,28 @@ class AudioControls:
         )
         self.download_button.pack(side=tk.LEFT, padx=UIConstants.BUTTON_PADDING)
         
+        # Playback progress; clicking the bar seeks
+        self.progress_frame = ttk.Frame(self.audio_frame)
+        self.progress_frame.pack(fill=tk.X, expand=True, pady=(5, 0))
+        
+        self.progress_var = tk.DoubleVar(value=0.0)
+        self.progress_bar = ttk.Progressbar(
+            self.progress_frame,
+            variable=self.progress_var,
+            maximum=1.0,
+            mode="determinate"
+        )
+        self.progress_bar.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.progress_bar.bind("<Button-1>", self._on_progress_click)
+        
+        self.position_var = tk.StringVar(value="")
+        self.position_label = ttk.Label(
+            self.progress_frame,
+            textvariable=self.position_var,
+            foreground="gray"
+        )
+        self.position_label.pack(side=tk.LEFT, padx=(UIConstants.BUTTON_PADDING, 0))
+        
         # Audio file label
         self.audio_file_var = tk.StringVar(value="No audio file generated yet")
         self.audio_file_label = ttk.Label(
@@ -78,13 +117,13 @@ class AudioControls:
         )
         self.audio_file_label.pack(anchor=tk.W, pady=(5, 0), fill=tk.X)
     
-    def set_audio_file(self, file_path):
-        """Set the current audio file and enable playback.
+    def set_audio_file(self, audio):
+        """Set the current audio and enable playback.
         
         Args:
-            file_path (str): Path to the audio file
+            audio: Path to the audio file, or an AudioResult holding the audio in memory
         """
-        self.current_audio_file = Path(file_path)
+        self.current_audio_file = audio if hasattr(audio, "is_in_memory") else Path(audio)
         self.audio_file_var.set(self.current_audio_file.name)
         self.play_button.configure(state=UIConstants.STATE_NORMAL)
         self.download_button.configure(state=UIConstants.STATE_NORMAL)
@@ -99,28 +138,136 @@ class AudioControls:
         self.play_button.configure(state=UIConstants.STATE_NORMAL)
         self.stop_button.configure(state=UIConstants.STATE_DISABLED)
     
+    def play(self):
+        """Start playing the current audio file."""
+        self._on_play()
+    
+    def create_stream_player(self):
+        """Create a player that starts playback as soon as streamed audio arrives.
+        
+        Returns:
+            StreamPlayer: The audio sink to pass to the synthesis request
+        """
+        self.stop_stream()
+        player = StreamPlayer(
+            on_started=lambda: self._call_on_main_loop(self._on_stream_started, player),
+            on_finished=lambda: self._call_on_main_loop(self._on_stream_finished, player)
+        )
+        self.stream_player = player
+        return player
+    
+    def stop_stream(self):
+        """Stop the current stream player, if any."""
+        if self.stream_player is not None:
+            self.stream_player.stop()
+            self.stream_player = None
+    
+    def _call_on_main_loop(self, callback, *args):
+        """Schedule a callback on the Tk main loop from a background thread."""
+        try:
+            self.parent.after(0, callback, *args)
+        except (tk.TclError, RuntimeError):
+            # The window was closed while audio was streaming
+            pass
+    
+    def _on_stream_started(self, player):
+        """Update the controls when streamed audio starts playing."""
+        if player is self.stream_player:
+            self.play_button.configure(state=UIConstants.STATE_DISABLED)
+            self.stop_button.configure(state=UIConstants.STATE_NORMAL)
+    
+    def _on_stream_finished(self, player):
+        """Update the controls when streamed audio has finished playing."""
+        if player is self.stream_player:
+            self.stream_player = None
+            self._reset_audio_controls()
+    
     def _on_play(self):
         """Handle play button click."""
         if self.current_audio_file and self.current_audio_file.exists():
-            try:
-                pygame.mixer.music.load(self.current_audio_file)
-                pygame.mixer.music.play()
-                
-                # Update UI state
-                self.set_playing_state()
-                
-                # Set playing flag and start monitoring playback
-                self.is_playing = True
-                self._monitor_playback()
-            except Exception as e:
-                self._reset_audio_controls()
-                self.on_error(f"Audio playback error: {str(e)}")
+            # Loading and playing happen on the audio thread, errors come back as events
+            self.play_id = self.player.play(self.current_audio_file)
+            self.duration = None
+            self._show_position(0.0)
+            self.set_playing_state()
+            self.is_playing = True
     
     def _on_stop(self):
         """Handle stop button click."""
-        pygame.mixer.music.stop()
+        self.stop_stream()
+        self.player.stop()
         self._reset_audio_controls()
     
+    def _on_progress_click(self, event):
+        """Continue playback from the position clicked on the progress bar."""
+        width = self.progress_bar.winfo_width()
+        if not self.is_playing or not self.duration or width <= 0:
+            return
+        position = min(max(event.x / width, 0.0), 1.0) * self.duration
+        self.player.seek(position)
+        self._show_position(position)
+    
+    def _drain_player_events(self):
+        """Apply the playback events queued by the audio thread."""
+        while True:
+            try:
+                play_id, event, value = self.player.events.get_nowait()
+            except queue.Empty:
+                return
+            # Events of a clip that was stopped or replaced are stale
+            if play_id != self.play_id:
+                continue
+            if event == AudioPlayer.STARTED:
+                self.duration = value
+                self._position_anchor = (0.0, time.monotonic())
+                self._cancel_progress_timer()
+                self._update_progress()
+            elif event == AudioPlayer.PROGRESS:
+                self._position_anchor = (value, time.monotonic())
+                self._show_position(value)
+            elif event == AudioPlayer.FINISHED:
+                self._reset_audio_controls()
+            elif event == AudioPlayer.ERROR:
+                self._reset_audio_controls()
+                self.on_error(f"Audio playback error: {value}")
+    
+    def _update_progress(self):
+        """Show the position of the playing clip, and again after the progress interval.
+        
+        The position is computed from the time the clip started or was seeked,
+        so the audio thread doesn't need to report it.
+        """
+        self._progress_timer = None
+        if not self.is_playing:
+            return
+        position, anchored_at = self._position_anchor
+        position += time.monotonic() - anchored_at
+        if self.duration:
+            position = min(position, self.duration)
+        self._show_position(position)
+        self._progress_timer = self.parent.after(UIConstants.PLAYBACK_PROGRESS_INTERVAL_MS, self._update_progress)
+    
+    def _cancel_progress_timer(self):
+        """Stop updating the progress display."""
+        if self._progress_timer is not None:
+            self.parent.after_cancel(self._progress_timer)
+            self._progress_timer = None
+    
+    def _show_position(self, position):
+        """Show the playback position on the progress bar and its label."""
+        if self.duration:
+            self.progress_var.set(position / self.duration)
+            self.position_var.set(f"{self._format_time(position)} / {self._format_time(self.duration)}")
+        else:
+            self.progress_var.set(0.0)
+            self.position_var.set(self._format_time(position))
+    
+    @staticmethod
+    def _format_time(seconds):
+        """Format a duration as minutes and seconds."""
+        minutes, seconds = divmod(int(seconds), 60)
+        return f"{minutes}:{seconds:02d}"
+    
     def _on_download(self):
         """Handle download button click."""
         if not self.current_audio_file or not self.current_audio_file.exists():
@@ -141,43 +288,43 @@ class AudioControls:
         
         if save_path:
             try:
-                # Copy the file to the selected location
-                shutil.copy2(self.current_audio_file, save_path)
+                # Copy the audio to the selected location
+                if hasattr(self.current_audio_file, "save"):
+                    self.current_audio_file.save(save_path)
+                else:
+                    shutil.copy2(self.current_audio_file, save_path)
             except Exception as e:
                 self.on_error(f"Download failed: {str(e)}")
     
-    def stop_and_unload_audio(self):
-        """Stop and unload any currently playing audio."""
-        if self.is_playing:
-            pygame.mixer.music.stop()
-            self.is_playing = False
+    def stop_audio(self):
+        """Stop any currently playing audio.
         
-        # Unload any previously loaded audio to free resources
-        if pygame.mixer.music.get_busy() or pygame.mixer.get_init():
-            pygame.mixer.music.unload()
+        Every generated clip has its own file, so the loaded audio does not
+        need to be unloaded to let the next generation write its output.
+        """
+        self.stop_stream()
+        if self.is_playing:
+            self.player.stop()
         
         # Reset audio controls to default state
-        self.set_stopped_state()
+        self._reset_audio_controls()
     
     def _reset_audio_controls(self):
         """Reset audio control states and playing flag."""
         self.is_playing = False
+        self.play_id = None
+        self._cancel_progress_timer()
+        self.progress_var.set(0.0)
+        self.position_var.set("")
         self.set_stopped_state()
     
-    def _monitor_playback(self):
-        """Monitor audio playback and reset control states when finished."""
-        if self.is_playing:
-            # Check if audio is still playing
-            if not pygame.mixer.music.get_busy():
-                # Audio has finished playing naturally
-                self._reset_audio_controls()
-            else:
-                # Audio is still playing, check again after the monitoring interval
-                self.parent.after(UIConstants.AUDIO_MONITOR_INTERVAL_MS, self._monitor_playback)
-    
     def cleanup(self):
         """Clean up audio resources."""
+        self.stop_stream()
         self.is_playing = False
-        if pygame.mixer.get_init() and pygame.mixer.music.get_busy():
-            pygame.mixer.music.stop()
-        pygame.mixer.quit()
+        self.play_id = None
+        self._cancel_progress_timer()
+        self.player.close()
+        mixer = get_active_mixer()
+        if mixer is not None:
+            mixer.quit()
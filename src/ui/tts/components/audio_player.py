@@ -0,0 +1,243 @@
+import contextlib
+import itertools
+import os
+import queue
+import sys
+import threading
+import time
+
+
+def get_mixer():
+    """Import pygame and initialize its mixer on first use.
+    
+    pygame is slow to import, so it is only loaded once audio is actually played.
+    
+    Returns:
+        module: The initialized pygame.mixer module
+    """
+    import pygame
+    
+    if not pygame.mixer.get_init():
+        pygame.mixer.init()
+    return pygame.mixer
+
+
+def get_active_mixer():
+    """Get the pygame mixer only if it has already been initialized.
+    
+    Returns:
+        module: The pygame.mixer module, or None if nothing has been played yet
+    """
+    pygame = sys.modules.get("pygame")
+    if pygame is None or not pygame.mixer.get_init():
+        return None
+    return pygame.mixer
+
+
+class AudioPlayer:
+    """Plays audio clips through the pygame mixer on a dedicated audio thread.
+    
+    The audio thread knows how long a clip is, so it sets a single timeout
+    for the end of the clip and only then asks the mixer whether playback
+    has finished. It does not wake up while a clip plays or between clips.
+    Only a clip whose length neither get_duration nor the mixer can tell is
+    polled, every UNKNOWN_DURATION_CHECK_SECONDS.
+    Owners that show the playback position compute it from the STARTED and
+    PROGRESS events.
+    
+    Playback state changes are put on a single thread-safe queue, events, as
+    (play_id, event, value) tuples. on_event is called on the audio thread
+    after each one, so the owner can drain the queue on its own thread.
+    """
+    
+    # Events and their values
+    STARTED = "started"  # The duration of the clip in seconds, or None if unknown
+    PROGRESS = "progress"  # The position playback continues from after a seek, in seconds
+    FINISHED = "finished"  # None
+    ERROR = "error"  # The error message
+    
+    # How long to wait before asking the mixer again when a clip plays past its duration
+    OVERRUN_CHECK_SECONDS = 0.05
+    
+    # How often to ask the mixer whether a clip of unknown duration has finished
+    UNKNOWN_DURATION_CHECK_SECONDS = 0.5
+    
+    def __init__(self, on_event, get_duration=None, trace=None):
+        """Initialize the audio player. The audio thread starts on the first command.
+        
+        Args:
+            on_event: Callback function called on the audio thread after an event is queued
+            get_duration: Optional function returning the duration of an audio clip in seconds, or None
+            trace: Optional function returning a context manager that times the named stage
+        """
+        self.on_event = on_event
+        self.get_duration = get_duration
+        self.trace = trace if trace is not None else lambda stage: contextlib.nullcontext()
+        self.events = queue.Queue()
+        
+        self._commands = queue.Queue()
+        self._play_ids = itertools.count(1)
+        self._thread = None
+        self._lock = threading.Lock()
+    
+    def play(self, audio):
+        """Start playing a clip, replacing the one that is playing.
+        
+        Args:
+            audio: Path to the audio file, or an AudioResult holding the audio in memory
+        
+        Returns:
+            int: The id of this playback, attached to all of its events
+        """
+        play_id = next(self._play_ids)
+        self._send("play", play_id, audio)
+        return play_id
+    
+    def seek(self, position):
+        """Continue the current clip from another position.
+        
+        Args:
+            position (float): The position in seconds
+        """
+        self._send("seek", position)
+    
+    def stop(self):
+        """Stop playback. No more events are sent for the stopped clip."""
+        self._send("stop")
+    
+    def close(self):
+        """Stop playback and end the audio thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._commands.put(("close",))
+            thread.join()
+    
+    def _send(self, *command):
+        """Queue a command for the audio thread, starting it if needed."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="audio-player", daemon=True)
+                self._thread.start()
+        self._commands.put(command)
+    
+    def _emit(self, play_id, event, value=None):
+        """Queue an event for the owner and notify it."""
+        self.events.put((play_id, event, value))
+        self.on_event()
+    
+    def _run(self):
+        """Run commands and watch the playing clip until the player is closed."""
+        clip = None
+        while True:
+            try:
+                command = self._commands.get(timeout=self._get_wait(clip))
+            except queue.Empty:
+                clip = self._check_playback(clip)
+                continue
+            
+            name, args = command[0], command[1:]
+            play_id = args[0] if name == "play" else clip["play_id"] if clip is not None else None
+            try:
+                if name == "play":
+                    self._stop(clip)
+                    clip = self._start(*args)
+                elif name == "seek" and clip is not None:
+                    clip = self._seek(clip, *args)
+                elif name in ("stop", "close"):
+                    self._stop(clip)
+                    clip = None
+                    if name == "close":
+                        return
+            except Exception as e:
+                self._stop(clip)
+                clip = None
+                self._emit(play_id, self.ERROR, str(e))
+    
+    def _get_wait(self, clip):
+        """Get how long the audio thread can sleep before it needs to look at the clip.
+        
+        Returns:
+            float: Seconds until the clip is due to end, or None to wait for the next command.
+        """
+        if clip is None:
+            return None
+        if clip["duration"] is None:
+            return self.UNKNOWN_DURATION_CHECK_SECONDS
+        return max(clip["duration"] - self._get_position(clip), self.OVERRUN_CHECK_SECONDS)
+    
+    @staticmethod
+    def _get_position(clip):
+        """Get the current position in a clip in seconds."""
+        return clip["offset"] + time.monotonic() - clip["started_at"]
+    
+    @staticmethod
+    def _get_mixer_duration(mixer, audio):
+        """Get the length of a clip by loading it as a mixer sound, or None if it can't be loaded."""
+        try:
+            if hasattr(audio, "is_in_memory") and audio.is_in_memory():
+                with audio.open() as buffer:
+                    return mixer.Sound(file=buffer).get_length()
+            return mixer.Sound(os.fspath(audio)).get_length()
+        except Exception:
+            return None
+    
+    def _start(self, play_id, audio):
+        """Load a clip into the mixer and start playing it."""
+        duration = self.get_duration(audio) if self.get_duration is not None else None
+        with self.trace("playback.load"):
+            mixer = get_mixer()
+            buffer = None
+            if hasattr(audio, "is_in_memory") and audio.is_in_memory():
+                # Play straight from memory; the name hint tells pygame the format
+                buffer = audio.open()
+                mixer.music.load(buffer, audio.suffix.lstrip("."))
+            else:
+                mixer.music.load(os.fspath(audio))
+            if duration is None:
+                duration = self._get_mixer_duration(mixer, audio)
+        mixer.music.play()
+        self._emit(play_id, self.STARTED, duration)
+        return {
+            "play_id": play_id,
+            "duration": duration,
+            # In-memory audio being read by the mixer, kept open while it plays
+            "buffer": buffer,
+            "offset": 0.0,
+            "started_at": time.monotonic(),
+        }
+    
+    def _seek(self, clip, position):
+        """Restart the loaded clip at a position."""
+        if clip["duration"] is not None:
+            position = min(position, clip["duration"])
+        position = max(position, 0.0)
+        get_mixer().music.play(start=position)
+        clip.update(offset=position, started_at=time.monotonic())
+        self._emit(clip["play_id"], self.PROGRESS, position)
+        return clip
+    
+    def _stop(self, clip):
+        """Stop the mixer and release the clip's buffer."""
+        if clip is None:
+            return
+        mixer = get_active_mixer()
+        if mixer is not None:
+            mixer.music.stop()
+        if clip["buffer"] is not None:
+            clip["buffer"].close()
+    
+    def _check_playback(self, clip):
+        """Report the end of a clip once it is due to end, or has stopped if its duration is unknown.
+        
+        Returns:
+            dict: The clip, or None if it has finished.
+        """
+        mixer = get_active_mixer()
+        if mixer is None or not mixer.music.get_busy():
+            # Finished, or the mixer was restarted to play a stream at another sample rate
+            self._stop(clip)
+            self._emit(clip["play_id"], self.FINISHED)
+            return None
+        # Still playing past its duration, or of unknown duration; checked again after the next wait
+        return clip
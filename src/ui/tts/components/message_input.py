@@ -46,6 +46,20 @@ class MessageInput:
         
         self.message_text.focus_set()
     
+    def bind_text_change(self, callback):
+        """Call a function whenever the text is edited.
+        
+        Args:
+            callback: Function called with no arguments after each change
+        """
+        def on_modified(event):
+            # Resetting the flag fires <<Modified>> again, so only react while it is set
+            if self.message_text.edit_modified():
+                self.message_text.edit_modified(False)
+                callback()
+        
+        self.message_text.bind("<<Modified>>", on_modified)
+    
     def get_text(self):
         """Get the current text content.
         
@@ -0,0 +1,135 @@
+import queue
+import threading
+import time
+from array import array
+
+
+class StreamPlayer:
+    """Audio sink that plays PCM chunks through pygame while synthesis is still running."""
+    
+    # Minimum duration of audio handed to the mixer at once, to avoid underruns between chunks
+    MIN_SOUND_SECONDS = 0.2
+    
+    # How often the feeder thread checks whether the mixer channel can take the next sound
+    FEED_INTERVAL_SECONDS = 0.02
+    
+    def __init__(self, on_started, on_finished):
+        """Initialize the stream player.
+        
+        Both callbacks are called from the feeder thread.
+        
+        Args:
+            on_started: Callback function called when the first audio starts playing
+            on_finished: Callback function called when all streamed audio has been played
+        """
+        self.on_started = on_started
+        self.on_finished = on_finished
+        self.started = False
+        self.stopped = False
+        
+        self._sounds = queue.Queue()
+        self._pending = bytearray()
+        self._source_channels = 1
+        self._mixer_channels = 1
+        self._min_sound_bytes = 0
+        self._channel = None
+        self._mixer = None
+    
+    def start(self, sample_rate, channels):
+        """Prepare the mixer for a stream of signed 16-bit PCM audio.
+        
+        Args:
+            sample_rate (int): Sample rate of the stream in Hz
+            channels (int): Number of interleaved channels in the stream
+        """
+        # Imported here so that pygame is only loaded once audio is played
+        import pygame
+        
+        mixer_init = pygame.mixer.get_init()
+        if mixer_init is None or mixer_init[0] != sample_rate or mixer_init[1] != -16:
+            if mixer_init is not None:
+                pygame.mixer.quit()
+            pygame.mixer.init(frequency=sample_rate, size=-16, channels=channels, allowedchanges=0)
+        
+        self._source_channels = channels
+        self._mixer = pygame.mixer
+        self._mixer_channels = pygame.mixer.get_init()[2]
+        self._min_sound_bytes = int(sample_rate * self.MIN_SOUND_SECONDS) * 2 * channels
+        
+        threading.Thread(target=self._feed, name="stream-player", daemon=True).start()
+    
+    def write(self, pcm_bytes):
+        """Queue a chunk of PCM audio for playback.
+        
+        Args:
+            pcm_bytes (bytes): Signed 16-bit little-endian PCM audio
+        """
+        if self.stopped:
+            return
+        self._pending.extend(pcm_bytes)
+        if len(self._pending) >= self._min_sound_bytes:
+            self._flush()
+    
+    def finish(self):
+        """Signal that the stream is complete."""
+        if not self.stopped:
+            self._flush()
+        self._sounds.put(None)
+    
+    def stop(self):
+        """Stop playback and discard any audio that has not been played yet."""
+        self.stopped = True
+        self._sounds.put(None)
+        if self._channel is not None:
+            self._channel.stop()
+    
+    def _flush(self):
+        """Turn the buffered audio into a sound and hand it to the feeder thread."""
+        frame_size = 2 * self._source_channels
+        usable = len(self._pending) - len(self._pending) % frame_size
+        if usable == 0:
+            return
+        
+        samples = array("h", bytes(self._pending[:usable]))
+        del self._pending[:usable]
+        
+        # Duplicate mono samples when the mixer could only be opened in stereo
+        if self._source_channels == 1 and self._mixer_channels == 2:
+            stereo = array("h", bytes(len(samples) * 4))
+            stereo[0::2] = samples
+            stereo[1::2] = samples
+            samples = stereo
+        
+        self._sounds.put(self._mixer.Sound(buffer=samples.tobytes()))
+    
+    def _feed(self):
+        """Queue sounds on a mixer channel back to back until the stream ends."""
+        while True:
+            sound = self._sounds.get()
+            if sound is None or self.stopped:
+                break
+            
+            if self._channel is None:
+                self._channel = self._mixer.find_channel(True)
+            
+            # Wait for the queue slot of the channel to free up before queueing the next sound
+            while self._channel.get_queue() is not None and not self.stopped:
+                time.sleep(self.FEED_INTERVAL_SECONDS)
+            if self.stopped:
+                break
+            
+            if self._channel.get_busy():
+                self._channel.queue(sound)
+            else:
+                self._channel.play(sound)
+            
+            if not self.started:
+                self.started = True
+                self.on_started()
+        
+        # Let the last queued sounds play out
+        while self._channel is not None and self._channel.get_busy() and not self.stopped:
+            time.sleep(self.FEED_INTERVAL_SECONDS)
+        
+        if not self.stopped:
+            self.on_finished()
@@ -1,5 +1,6 @@
 import tkinter as tk
 from tkinter import ttk
+from concurrent.futures import CancelledError
 
 from ..constants import UIConstants
 from .components import MessageInput, ControlButtons, StatusLabel, AudioControls
@@ -17,6 +18,10 @@ class TTSTab:
         """
         self.app = app
         self.root = parent
+        self.pending_future = None
+        self.pending_audio_sink = None
+        # Pending after() call that starts speculative synthesis once typing pauses
+        self.speculation_after_id = None
         
         self._create_components()
     
@@ -31,18 +36,32 @@ class TTSTab:
         
         self.message_input = MessageInput(self.tts_frame)
         self.control_buttons = ControlButtons(self.tts_frame, self._handle_generate, self._handle_clear)
-        self.audio_controls = AudioControls(self.tts_frame, self._handle_audio_error)
+        self.audio_controls = AudioControls(
+            self.tts_frame, self._handle_audio_error, self.app.get_audio_duration, self.app.trace
+        )
         self.status_label = StatusLabel(self.tts_frame)
         
+        self.message_input.bind_text_change(self._on_text_changed)
+        
         # Bind window resize event to update text wrapping
         self.tts_frame.bind("<Configure>", self._on_frame_configure)
     
     def on_close(self):
         """Clean up resources."""
+        self.pending_future = None
+        if self.speculation_after_id is not None:
+            self.root.after_cancel(self.speculation_after_id)
+            self.speculation_after_id = None
+        # Long messages in the job queue are finished on the next start
+        self.app.cancel_generation(keep_queued=True)
         self.audio_controls.cleanup()
     
     def _handle_generate(self):
-        """Handle a request to generate audio."""
+        """Handle a request to generate audio.
+        
+        Synthesis runs in the background. Clicking Generate again while a request
+        is in flight cancels it and starts a new one.
+        """
         message = self.message_input.get_text()
         
         if not message or not message.strip():
@@ -52,34 +71,90 @@ class TTSTab:
             )
             return
         
-        try:
-            # Stop and unload any currently playing audio
-            self.audio_controls.stop_and_unload_audio()
-            
-            self.control_buttons.set_generate_enabled(False)
-            self.status_label.set_status(
-                "⏳ Generating audio...", 
-                UIConstants.STATUS_COLOR_PROCESSING
-            )
+        # Stop any currently playing audio
+        self.audio_controls.stop_audio()
+        
+        self.status_label.set_status(
+            "⏳ Generating audio...", 
+            UIConstants.STATUS_COLOR_PROCESSING
+        )
 
-            # Update UI to show the status change
-            self.tts_frame.update_idletasks()
+        # Start playback while the audio is still downloading if the service supports it
+        audio_sink = None
+        if self.app.is_streaming_enabled():
+            audio_sink = self.audio_controls.create_stream_player()
 
-            output_path = self.app.generate_audio(message)
+        future = self.app.generate_audio(message, audio_sink)
+        self.pending_future = future
+        self.pending_audio_sink = audio_sink
+        
+        future.add_done_callback(self._schedule_generate_done)
+    
+    def _schedule_generate_done(self, future):
+        """Hand a finished request back to the Tk main loop.
+        
+        This runs on the synthesis thread, so it must not touch any widgets directly.
+        
+        Args:
+            future (Future): The finished future
+        """
+        try:
+            self.root.after(0, self._on_generate_done, future)
+        except (tk.TclError, RuntimeError):
+            # The window was closed while the request was in flight
+            pass
+    
+    def _on_generate_done(self, future):
+        """Handle a finished audio generation request on the Tk main loop.
+        
+        Args:
+            future (Future): The future returned by the application for the request
+        """
+        # Ignore results from requests that were superseded or cancelled
+        if future is not self.pending_future:
+            return
+        self.pending_future = None
+        audio_sink, self.pending_audio_sink = self.pending_audio_sink, None
+        
+        try:
+            output_path = future.result()
             
             # Show success message and enable playback
             self.audio_controls.set_audio_file(output_path)
-            self.status_label.set_status(
-                "✅ Audio generated successfully!", 
-                UIConstants.STATUS_COLOR_SUCCESS
-            )
             
+            # Cached audio is never streamed, so play the complete file instead
+            if audio_sink is not None and not audio_sink.started:
+                self.audio_controls.stop_stream()
+                self.audio_controls.play()
+            message = "✅ Audio generated successfully!"
+            report = self.app.get_synthesis_report(output_path)
+            if report is not None and report["cached_characters"]:
+                message += UIConstants.CACHE_SAVINGS_FORMAT.format(report["cached_characters"], report["characters"])
+            self.status_label.set_status(message, UIConstants.STATUS_COLOR_SUCCESS)
+            
+        except CancelledError:
+            return
         except RuntimeError as e:
+            self.audio_controls.stop_stream()
             self.status_label.set_error(str(e))
         except Exception as e:
+            self.audio_controls.stop_stream()
             self.status_label.set_error(f"Unexpected error: {str(e)}")
-        finally:
-            self.control_buttons.set_generate_enabled(True)
+    
+    def _on_text_changed(self):
+        """Restart the typing pause timer for speculative synthesis."""
+        if self.speculation_after_id is not None:
+            self.root.after_cancel(self.speculation_after_id)
+            self.speculation_after_id = None
+        
+        speculation_config = self.app.get_speculation_config()
+        if speculation_config["enabled"]:
+            self.speculation_after_id = self.root.after(speculation_config["debounce_ms"], self._speculate)
+    
+    def _speculate(self):
+        """Synthesize the completed sentences of the message after a pause in typing."""
+        self.speculation_after_id = None
+        self.app.speculate(self.message_input.get_text())
     
     def _handle_clear(self):
         """Handle a request to clear the message input."""
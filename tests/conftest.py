@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The application modules are imported the way src/main.py imports them
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
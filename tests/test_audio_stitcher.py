@@ -0,0 +1,90 @@
+import wave
+
+import pytest
+
+from tts.audio_stitcher import AudioStitcher
+
+# MPEG-1 Layer III frame header: 128 kbps, 44100 Hz, no padding (417 bytes, 1152 samples)
+MP3_HEADER = bytes([0xFF, 0xFB, 0x90, 0x00])
+MP3_FRAME_LENGTH = 417
+
+
+def make_mp3_frame(fill):
+    return MP3_HEADER + bytes([fill]) * (MP3_FRAME_LENGTH - len(MP3_HEADER))
+
+
+def make_mp3(path, frames):
+    """Write an MP3 file as an encoder would: ID3 tag, Info frame, audio frames, ID3v1 tag."""
+    id3_body = b"\x00" * 20
+    size = len(id3_body)
+    id3 = b"ID3\x03\x00\x00" + bytes([(size >> 21) & 0x7F, (size >> 14) & 0x7F, (size >> 7) & 0x7F, size & 0x7F]) + id3_body
+    info_frame = MP3_HEADER + b"\x00" * 32 + b"Info" + b"\x00" * (MP3_FRAME_LENGTH - 40)
+    id3v1 = b"TAG" + b"\x00" * 125
+    path.write_bytes(id3 + info_frame + b"".join(frames) + id3v1)
+    return path
+
+
+def make_wav(path, frames, rate=22050, channels=1):
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(channels)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(frames)
+    return path
+
+
+def test_wav_parts_are_merged_into_one_container(tmp_path):
+    first = make_wav(tmp_path / "a.wav", b"\x01\x00" * 100)
+    second = make_wav(tmp_path / "b.wav", b"\x02\x00" * 50)
+    
+    output = AudioStitcher.concatenate([first, second], tmp_path / "out.wav")
+    
+    with wave.open(str(output), "rb") as f:
+        assert (f.getnchannels(), f.getsampwidth(), f.getframerate()) == (1, 2, 22050)
+        assert f.readframes(f.getnframes()) == b"\x01\x00" * 100 + b"\x02\x00" * 50
+    assert AudioStitcher.get_duration(output.read_bytes(), ".wav") == pytest.approx(150 / 22050)
+
+
+def test_wav_parts_with_different_formats_are_rejected(tmp_path):
+    first = make_wav(tmp_path / "a.wav", b"\x00\x00" * 10, rate=22050)
+    second = make_wav(tmp_path / "b.wav", b"\x00\x00" * 10, rate=44100)
+    
+    with pytest.raises(ValueError):
+        AudioStitcher.concatenate([first, second], tmp_path / "out.wav")
+    assert not (tmp_path / "out.wav").exists()
+
+
+def test_mp3_parts_are_joined_frame_by_frame_without_tags(tmp_path):
+    first = make_mp3(tmp_path / "a.mp3", [make_mp3_frame(1), make_mp3_frame(2)])
+    second = make_mp3(tmp_path / "b.mp3", [make_mp3_frame(3)])
+    
+    output = AudioStitcher.concatenate([first, second], tmp_path / "out.mp3")
+    
+    assert output.read_bytes() == make_mp3_frame(1) + make_mp3_frame(2) + make_mp3_frame(3)
+
+
+def test_mp3_duration_counts_the_audio_frames(tmp_path):
+    data = make_mp3(tmp_path / "a.mp3", [make_mp3_frame(0)] * 3).read_bytes()
+    
+    assert AudioStitcher.get_duration(data, ".MP3") == pytest.approx(3 * 1152 / 44100)
+
+
+def test_mp3_without_frames_has_no_duration():
+    assert AudioStitcher.get_duration(b"not audio", ".mp3") is None
+
+
+def test_mpeg2_frames_are_parsed():
+    # The silent frame generated by the benchmark mock server: 32 kbps, 22050 Hz
+    frame = bytes([0xFF, 0xF3, 0x40, 0xC0]) + bytes(100)
+    
+    assert AudioStitcher.get_duration(frame * 2, ".mp3") == pytest.approx(2 * 576 / 22050)
+
+
+def test_other_formats_are_joined_byte_by_byte(tmp_path):
+    (tmp_path / "a.ogg").write_bytes(b"abc")
+    (tmp_path / "b.ogg").write_bytes(b"def")
+    
+    output = AudioStitcher.concatenate([tmp_path / "a.ogg", tmp_path / "b.ogg"], tmp_path / "out.ogg")
+    
+    assert output.read_bytes() == b"abcdef"
+    assert AudioStitcher.get_duration(b"abcdef", ".ogg") is None
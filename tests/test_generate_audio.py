@@ -0,0 +1,140 @@
+import threading
+from concurrent.futures import CancelledError
+
+import pytest
+
+from config_manager import ConfigManager
+from tts.services.base_service import BaseTTSService, TTSServiceError
+from tts.services.registry import ServiceSpec, service_registry
+from tts.synthesis_executor import SynthesisExecutor
+
+
+class FakeService(BaseTTSService):
+    """Service that saves the text as its audio, without any network I/O.
+    
+    Texts starting with "slow" wait for the release event, and texts
+    starting with "fail" raise an error.
+    """
+    
+    started = None
+    release = None
+    
+    def _initialize_client(self):
+        self.client = object()
+    
+    def get_character_usage(self):
+        return -1, -1
+    
+    def synthesize_speech(self, text, output_file=None, tts_params=None):
+        if text.startswith("slow"):
+            self.started.set()
+            self.release.wait(5)
+        if text.startswith("fail"):
+            raise TTSServiceError("The fake service failed", status_code=400)
+        if output_file is None:
+            output_file = self.new_audio_result(".txt")
+        with self.open_output_file(output_file) as f:
+            f.write(text.encode("utf-8"))
+        return output_file
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """An Application using FakeService, with its data directory under tmp_path."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setitem(service_registry._specs, "Fake", ServiceSpec("Fake", FakeService, {"file_extension": ".txt"}))
+    monkeypatch.setattr(FakeService, "started", threading.Event())
+    monkeypatch.setattr(FakeService, "release", threading.Event())
+    
+    config_manager = ConfigManager()
+    config = config_manager.load_config()
+    config["selected_service"] = "Fake"
+    config_manager.save_config(config)
+    
+    from main import Application
+    app = Application()
+    yield app
+    FakeService.release.set()
+    app.shutdown()
+
+
+def read_audio(audio):
+    return bytes(audio.get_buffer()).decode("utf-8")
+
+
+def test_generate_audio_delivers_the_result(app):
+    future = app.generate_audio("Hello there.")
+    
+    assert read_audio(future.result(timeout=5)) == "Hello there."
+
+
+def test_generate_audio_delivers_errors(app):
+    future = app.generate_audio("fail now")
+    
+    with pytest.raises(Exception, match="The fake service failed"):
+        future.result(timeout=5)
+
+
+def test_generate_audio_cancels_the_request_in_flight(app):
+    first = app.generate_audio("slow message")
+    assert FakeService.started.wait(5)
+    
+    second = app.generate_audio("Second message.")
+    FakeService.release.set()
+    
+    with pytest.raises(CancelledError):
+        first.result(timeout=5)
+    assert read_audio(second.result(timeout=5)) == "Second message."
+
+
+def test_cancel_generation_discards_the_result(app):
+    future = app.generate_audio("slow message")
+    assert FakeService.started.wait(5)
+    
+    app.cancel_generation()
+    FakeService.release.set()
+    
+    with pytest.raises(CancelledError):
+        future.result(timeout=5)
+
+
+def test_executor_drops_requests_superseded_before_they_start():
+    executor = SynthesisExecutor()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+    
+    def synthesize(text):
+        calls.append(text)
+        if text == "first":
+            started.set()
+            release.wait(5)
+        return text
+    
+    try:
+        first = executor.submit(synthesize, "first")
+        assert started.wait(5)
+        second = executor.submit(synthesize, "second")
+        third = executor.submit(synthesize, "third")
+        release.set()
+        
+        assert third.result(timeout=5) == "third"
+        assert second.cancelled()
+        with pytest.raises(CancelledError):
+            first.result(timeout=5)
+        assert calls == ["first", "third"]
+    finally:
+        executor.shutdown()
+
+
+def test_executor_delivers_exceptions():
+    executor = SynthesisExecutor()
+    
+    def synthesize():
+        raise ValueError("boom")
+    
+    try:
+        with pytest.raises(ValueError, match="boom"):
+            executor.submit(synthesize).result(timeout=5)
+    finally:
+        executor.shutdown()
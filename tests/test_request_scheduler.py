@@ -0,0 +1,135 @@
+import asyncio
+
+import pytest
+
+from tts import request_scheduler
+from tts.request_scheduler import RequestScheduler
+from tts.services.base_service import TTSServiceError
+
+UNLIMITED = {"requests_per_second": None, "burst": 1, "max_concurrency": None}
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record the retry delays instead of waiting for them, with the jitter at its maximum."""
+    delays = []
+    
+    # The limiters also sleep for 0 seconds when they don't need to wait
+    def sleep(delay):
+        if delay > 0:
+            delays.append(delay)
+    
+    async def sleep_async(delay):
+        sleep(delay)
+    
+    monkeypatch.setattr(request_scheduler.time, "sleep", sleep)
+    monkeypatch.setattr(request_scheduler.asyncio, "sleep", sleep_async)
+    monkeypatch.setattr(request_scheduler.random, "uniform", lambda low, high: high)
+    return delays
+
+
+def make_scheduler(**kwargs):
+    return RequestScheduler(lambda provider: UNLIMITED, **kwargs)
+
+
+def failing(errors, result="audio"):
+    """Make a function that raises the given errors in turn, then returns result."""
+    errors = list(errors)
+    calls = []
+    
+    def function():
+        calls.append(None)
+        if errors:
+            raise errors.pop(0)
+        return result
+    
+    function.calls = calls
+    return function
+
+
+def test_retries_transient_errors_with_exponential_backoff(sleeps):
+    scheduler = make_scheduler(base_delay=1.0, max_delay=30.0)
+    function = failing([TTSServiceError("busy", status_code=503)] * 3)
+    
+    assert scheduler.call("mock", function) == "audio"
+    assert len(function.calls) == 4
+    assert sleeps == [1.0, 2.0, 4.0]
+    stats = scheduler.get_stats()["mock"]
+    assert (stats["requests"], stats["retries"], stats["failures"]) == (4, 3, 0)
+
+
+def test_backoff_is_capped_at_the_maximum_delay(sleeps):
+    scheduler = make_scheduler(base_delay=1.0, max_delay=3.0)
+    
+    assert [scheduler.get_retry_delay(attempt, TTSServiceError("busy", status_code=503)) for attempt in range(4)] == [1.0, 2.0, 3.0, 3.0]
+
+
+def test_gives_up_after_the_allowed_retries(sleeps):
+    scheduler = make_scheduler(max_retries=2, base_delay=0.01)
+    function = failing([TTSServiceError("busy", status_code=500)] * 5)
+    
+    with pytest.raises(TTSServiceError):
+        scheduler.call("mock", function)
+    assert len(function.calls) == 3
+    assert scheduler.get_stats()["mock"]["failures"] == 1
+
+
+def test_errors_that_are_not_retryable_are_raised_at_once(sleeps):
+    scheduler = make_scheduler()
+    function = failing([TTSServiceError("bad key", status_code=401)])
+    
+    with pytest.raises(TTSServiceError):
+        scheduler.call("mock", function)
+    assert len(function.calls) == 1
+    assert sleeps == []
+
+
+def test_other_exceptions_are_not_retried(sleeps):
+    scheduler = make_scheduler()
+    function = failing([ValueError("bug")])
+    
+    with pytest.raises(ValueError):
+        scheduler.call("mock", function)
+    assert len(function.calls) == 1
+
+
+def test_retry_after_sets_the_minimum_delay(sleeps):
+    scheduler = make_scheduler(base_delay=0.01, max_delay=30.0)
+    function = failing([TTSServiceError("slow down", status_code=429, retry_after=5.0)])
+    
+    assert scheduler.call("mock", function) == "audio"
+    assert sleeps == [5.0]
+    assert scheduler.get_stats()["mock"]["throttled"] == 1
+
+
+def test_retry_after_is_capped_at_the_maximum_delay(sleeps):
+    scheduler = make_scheduler(base_delay=0.01, max_delay=2.0)
+    
+    assert scheduler.get_retry_delay(0, TTSServiceError("slow down", status_code=429, retry_after=600.0)) == 2.0
+
+
+def test_retry_after_is_parsed_from_seconds():
+    assert TTSServiceError.parse_retry_after("7") == 7.0
+    assert TTSServiceError.parse_retry_after(None) is None
+
+
+def test_can_retry_stops_retries(sleeps):
+    scheduler = make_scheduler()
+    function = failing([TTSServiceError("busy", status_code=503)])
+    
+    with pytest.raises(TTSServiceError):
+        scheduler.call("mock", function, can_retry=lambda: False)
+    assert len(function.calls) == 1
+
+
+def test_async_calls_retry_with_retry_after(sleeps):
+    scheduler = make_scheduler(base_delay=0.01)
+    errors = [TTSServiceError("slow down", status_code=429, retry_after=1.5)]
+    
+    async def function():
+        if errors:
+            raise errors.pop()
+        return "audio"
+    
+    assert asyncio.run(scheduler.call_async("mock", function)) == "audio"
+    assert sleeps == [1.5]
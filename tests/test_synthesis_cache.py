@@ -0,0 +1,141 @@
+import threading
+
+from tts.services.base_service import BaseTTSService
+from tts.synthesis_cache import SynthesisCache
+
+AUDIO_FIELDS = ("voice_id", "model_id", "voice_settings", "output_format", "file_extension")
+
+CONFIG = {
+    "api_key": "secret",
+    "voice_id": "voice",
+    "model_id": "model",
+    "output_format": "mp3_22050_32",
+    "file_extension": ".mp3",
+    "streaming": False,
+    "voice_settings": {"stability": 0.5, "speed": 1.0},
+}
+
+
+def make_key(text="Hello there.", **changes):
+    return SynthesisCache.make_key("ElevenLabs", text, {**CONFIG, **changes}, AUDIO_FIELDS)
+
+
+def make_cache(tmp_path, max_bytes=1000, max_entries=10):
+    return SynthesisCache(tmp_path / "cache", max_bytes=max_bytes, max_entries=max_entries)
+
+
+def make_audio(tmp_path, name, size):
+    path = tmp_path / name
+    path.write_bytes(b"x" * size)
+    return path
+
+
+def test_key_ignores_insignificant_whitespace():
+    assert make_key("  Hello \t there.\r\n") == make_key("Hello there.")
+    assert make_key("Hello there.") != make_key("Hello there!")
+
+
+def test_key_ignores_settings_that_dont_change_the_audio():
+    assert make_key(streaming=True) == make_key()
+    assert make_key(api_key="other", long_audio={"enabled": True}) == make_key()
+
+
+def test_key_changes_with_the_voice_model_settings_and_format():
+    key = make_key()
+    assert make_key(voice_id="other") != key
+    assert make_key(model_id="other") != key
+    assert make_key(voice_settings={"stability": 0.5, "speed": 1.2}) != key
+    assert make_key(output_format="pcm_22050", file_extension=".wav") != key
+
+
+def test_services_without_audio_fields_key_on_everything_but_credentials():
+    class PluginService(BaseTTSService):
+        CREDENTIAL_FIELDS = ("api_key",)
+    
+    fields = PluginService.get_audio_fields({**CONFIG, "pitch": 2})
+    assert set(fields) == {"voice_id", "model_id", "output_format", "file_extension", "voice_settings", "pitch"}
+
+
+def test_get_returns_the_cached_copy(tmp_path):
+    cache = make_cache(tmp_path)
+    cached = cache.put("key", make_audio(tmp_path, "audio.mp3", 10))
+    
+    assert cache.get("key") == cached
+    assert cached.read_bytes() == b"x" * 10
+    assert cache.get("missing") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_least_recently_used_entries_are_evicted_by_count(tmp_path):
+    cache = make_cache(tmp_path, max_entries=2)
+    cache.put("a", make_audio(tmp_path, "a.mp3", 10))
+    cache.put("b", make_audio(tmp_path, "b.mp3", 10))
+    cache.get("a")
+    cache.put("c", make_audio(tmp_path, "c.mp3", 10))
+    
+    assert cache.contains("a") and cache.contains("c")
+    assert not cache.contains("b")
+    assert not (tmp_path / "cache" / "b.mp3").exists()
+
+
+def test_least_recently_used_entries_are_evicted_by_size(tmp_path):
+    cache = make_cache(tmp_path, max_bytes=25)
+    cache.put("a", make_audio(tmp_path, "a.mp3", 10))
+    cache.put("b", make_audio(tmp_path, "b.mp3", 10))
+    cache.put("c", make_audio(tmp_path, "c.mp3", 10))
+    
+    assert not cache.contains("a")
+    assert cache.get_stats()["total_bytes"] == 20
+
+
+def test_entries_are_reloaded_from_disk(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.put("a", make_audio(tmp_path, "a.mp3", 10))
+    
+    reloaded = make_cache(tmp_path)
+    assert reloaded.get("a") == tmp_path / "cache" / "a.mp3"
+    assert reloaded.get_stats()["total_bytes"] == 10
+
+
+def test_audio_cached_in_another_format_is_a_miss(tmp_path):
+    # A sentence streamed as WAV must not be stitched into an MP3 message
+    cache = make_cache(tmp_path)
+    cache.put("key", make_audio(tmp_path, "streamed.wav", 10))
+    
+    assert not cache.contains("key", ".mp3")
+    assert cache.get("key", ".mp3") is None
+    assert cache.contains("key", ".wav")
+    assert cache.get("key", ".wav") == tmp_path / "cache" / "key.wav"
+
+
+def test_caching_another_format_replaces_the_old_file(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.put("key", make_audio(tmp_path, "streamed.wav", 10))
+    cache.put("key", make_audio(tmp_path, "saved.mp3", 5))
+    
+    assert cache.get("key", ".mp3") == tmp_path / "cache" / "key.mp3"
+    assert not (tmp_path / "cache" / "key.wav").exists()
+    assert cache.get_stats()["total_bytes"] == 5
+
+
+def test_concurrent_puts_of_a_key_keep_a_complete_entry(tmp_path):
+    cache = make_cache(tmp_path, max_bytes=10 ** 7)
+    source = make_audio(tmp_path, "audio.mp3", 10 ** 6)
+    errors = []
+    
+    def put():
+        try:
+            cache.put("key", source)
+        except Exception as e:
+            errors.append(e)
+    
+    threads = [threading.Thread(target=put) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert errors == []
+    assert cache.get("key").read_bytes() == source.read_bytes()
+    assert cache.get_stats()["total_bytes"] == 10 ** 6
+    assert [path.name for path in (tmp_path / "cache").iterdir()] == ["key.mp3"]
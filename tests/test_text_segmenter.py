@@ -0,0 +1,59 @@
+import pytest
+
+from tts.text_segmenter import TextSegmenter
+
+
+def test_text_that_fits_is_one_segment():
+    assert TextSegmenter(100).split("  Hello there. How are you?  ") == ["Hello there. How are you?"]
+
+
+def test_blank_text_has_no_segments():
+    assert TextSegmenter(100).split(" \n\n ") == []
+
+
+def test_splits_at_paragraphs_before_sentences():
+    text = "First sentence. Second sentence.\n\nThird sentence."
+    assert TextSegmenter(35).split(text) == ["First sentence. Second sentence.", "Third sentence."]
+
+
+def test_packs_sentences_up_to_the_maximum_size():
+    text = "One. Two. Three. Four."
+    assert TextSegmenter(10).split(text) == ["One. Two.", "Three.", "Four."]
+
+
+def test_falls_back_to_clauses_and_words():
+    text = "a long clause here, another long clause"
+    segments = TextSegmenter(20).split(text)
+    assert segments == ["a long clause here,", "another long clause"]
+    
+    assert TextSegmenter(9).split("alpha beta gamma") == ["alpha", "beta", "gamma"]
+
+
+def test_cuts_only_words_longer_than_the_maximum_size():
+    assert TextSegmenter(4).split("abcdefghij ab") == ["abcd", "efgh", "ij", "ab"]
+
+
+def test_segments_fit_the_measure():
+    measure = lambda text: len(text.encode("utf-8"))
+    # "ünïcödé" is 11 bytes, so it is cut between characters
+    segments = TextSegmenter(10, measure=measure).split("héllo wörld ünïcödé")
+    assert segments == ["héllo", "wörld", "ünïcöd", "é"]
+    assert all(measure(segment) <= 10 for segment in segments)
+
+
+def test_keeps_closing_quotes_with_their_sentence():
+    assert TextSegmenter.split_sentences('He said "Stop." Then left.') == ['He said "Stop."', "Then left."]
+
+
+def test_splits_cjk_sentences_without_spaces():
+    assert TextSegmenter.split_sentences("你好。再见！") == ["你好。", "再见！"]
+
+
+def test_split_message_returns_the_sentences_of_all_paragraphs():
+    text = "Hello there. How are you?\n\nGoodbye!"
+    assert TextSegmenter.split_message(text) == ["Hello there.", "How are you?", "Goodbye!"]
+
+
+def test_rejects_a_maximum_size_below_one():
+    with pytest.raises(ValueError):
+        TextSegmenter(0)